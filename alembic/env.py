@@ -0,0 +1,61 @@
+"""
+Alembic environment
+
+The database URL is built from the same settings as app/db/mysql.py and the
+target metadata is the ORM Base, so `alembic revision --autogenerate` diffs
+against the models. The base schema is bootstrapped by sql/create.sql;
+migrations carry the changes made after it.
+"""
+from logging.config import fileConfig
+
+from sqlalchemy import create_engine, pool
+
+from alembic import context
+
+from app.core.settings import settings
+from app.db.models import Base
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+DATABASE_URL = (
+    f"mysql+mysqlconnector://"
+    f"{settings.MYSQL_USER}:"
+    f"{settings.MYSQL_PASSWORD}"
+    f"@{settings.MYSQL_HOST}"
+    f"/{settings.MYSQL_DATABASE}"
+)
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL to stdout without connecting."""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run the migrations against the configured database."""
+    connectable = create_engine(DATABASE_URL, poolclass=pool.NullPool)
+
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,41 @@
+"""FULLTEXT index on notes(title, content)
+
+Backs the natural and boolean search modes (MATCH ... AGAINST). MySQL only;
+other databases keep the substring search and get no index.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = "ft_notes_title_content"
+
+
+def _exists() -> bool:
+    """Whether the index is there; unknown (False) when only emitting SQL."""
+    if context.is_offline_mode():
+        return False
+    return INDEX in {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("notes")}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().dialect.name == "mysql" and not _exists():
+        op.create_index(INDEX, "notes", ["title", "content"], mysql_prefix="FULLTEXT")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name == "mysql" and (context.is_offline_mode() or _exists()):
+        op.drop_index(INDEX, table_name="notes")
@@ -0,0 +1,41 @@
+"""Index on notes.updated_at
+
+The in-process search index picks up notes written by other workers with
+updated_at >= watermark every NOTE_INDEX_SYNC_SECONDS.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = "ix_notes_updated_at"
+
+
+def _exists() -> bool:
+    """Whether the index is there; unknown (False) when only emitting SQL."""
+    if context.is_offline_mode():
+        return False
+    return INDEX in {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("notes")}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _exists():
+        op.create_index(INDEX, "notes", ["updated_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if context.is_offline_mode() or _exists():
+        op.drop_index(INDEX, table_name="notes")
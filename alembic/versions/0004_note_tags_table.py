@@ -0,0 +1,93 @@
+"""note_tags table
+
+One row per tag of notes.tags, indexed by tag and by (user_id, tag), for the
+tag filter of the note listings and the tag facet counts. Backfilled from the
+JSON column; the API keeps it in sync afterwards.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = "note_tags"
+
+# Same normalisation as NoteManager._sync_tags: trimmed, cut to 50
+# characters, and the first of the tags equal but for case
+BACKFILL_MYSQL = """
+INSERT IGNORE INTO note_tags (note_id, tag, user_id)
+SELECT t.note_id, t.tag, t.user_id
+FROM (
+    SELECT n.id AS note_id, n.user_id, LEFT(TRIM(j.tag), 50) AS tag,
+           ROW_NUMBER() OVER (PARTITION BY n.id, LOWER(LEFT(TRIM(j.tag), 50))
+                              ORDER BY j.position) AS nth
+    FROM notes n
+    JOIN JSON_TABLE(n.tags, '$[*]' COLUMNS (position FOR ORDINALITY,
+                                            tag VARCHAR(1024) PATH '$')) j
+) t
+WHERE t.nth = 1 AND t.tag IS NOT NULL AND t.tag <> ''
+"""
+
+
+def _exists() -> bool:
+    """Whether the table is there; unknown (False) when only emitting SQL."""
+    if context.is_offline_mode():
+        return False
+    return sa.inspect(op.get_bind()).has_table(TABLE)
+
+
+def _backfill() -> None:
+    """Copy notes.tags into note_tags, one row per tag of a note (case-insensitive)."""
+    if op.get_context().dialect.name == "mysql":
+        op.execute(BACKFILL_MYSQL)
+        return
+    if context.is_offline_mode():
+        return
+    bind = op.get_bind()
+    notes = sa.table("notes", sa.column("id"), sa.column("user_id"), sa.column("tags", sa.JSON))
+    note_tags = sa.table(TABLE, sa.column("note_id"), sa.column("tag"), sa.column("user_id"))
+    present = {tuple(row) for row in bind.execute(sa.select(note_tags.c.note_id,
+                                                            note_tags.c.tag))}
+    rows = []
+    for note_id, user_id, tags in bind.execute(sa.select(notes.c.id, notes.c.user_id,
+                                                         notes.c.tags)):
+        distinct = {}
+        for tag in (str(tag).strip()[:50] for tag in tags or []):
+            if tag:
+                distinct.setdefault(tag.casefold(), tag)
+        rows.extend({"note_id": note_id, "tag": tag, "user_id": user_id}
+                    for tag in distinct.values() if (note_id, tag) not in present)
+    if rows:
+        op.bulk_insert(note_tags, rows)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _exists():
+        op.create_table(
+            TABLE,
+            sa.Column("note_id", sa.Integer(),
+                      sa.ForeignKey("notes.id", name="fk_note_tags_note", ondelete="CASCADE"),
+                      primary_key=True),
+            sa.Column("tag", sa.String(50), primary_key=True),
+            sa.Column("user_id", sa.String(36), nullable=False),
+        )
+        op.create_index("ix_note_tags_tag", TABLE, ["tag"])
+        op.create_index("ix_note_tags_user_id_tag", TABLE, ["user_id", "tag"])
+    _backfill()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if context.is_offline_mode() or _exists():
+        op.drop_table(TABLE)
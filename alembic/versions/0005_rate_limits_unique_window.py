@@ -0,0 +1,84 @@
+"""Unique (identifier, timestamp) key on rate_limits
+
+Write-behind rate limit flushes upsert their per-window increments on this
+key (INSERT ... ON DUPLICATE KEY UPDATE), so concurrent workers add up into
+one row instead of inserting duplicates. Existing duplicates are merged
+first, their requests summed into the oldest row.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = "rate_limits"
+CONSTRAINT = "uq_rate_limits_identifier_timestamp"
+
+MERGE_MYSQL = """
+UPDATE rate_limits r
+JOIN (SELECT MIN(id) AS id, SUM(requests) AS requests
+      FROM rate_limits
+      GROUP BY identifier, timestamp
+      HAVING COUNT(*) > 1) d ON r.id = d.id
+SET r.requests = d.requests
+"""
+
+DELETE_MYSQL = """
+DELETE r FROM rate_limits r
+JOIN rate_limits keep
+  ON keep.identifier = r.identifier AND keep.timestamp = r.timestamp AND keep.id < r.id
+"""
+
+MERGE = """
+UPDATE rate_limits
+SET requests = (SELECT SUM(d.requests) FROM rate_limits d
+                WHERE d.identifier = rate_limits.identifier
+                  AND d.timestamp = rate_limits.timestamp)
+WHERE id IN (SELECT MIN(id) FROM rate_limits
+             GROUP BY identifier, timestamp HAVING COUNT(*) > 1)
+"""
+
+DELETE = """
+DELETE FROM rate_limits
+WHERE id NOT IN (SELECT MIN(id) FROM rate_limits GROUP BY identifier, timestamp)
+"""
+
+
+def _exists() -> bool:
+    """Whether the key is there; unknown (False) when only emitting SQL."""
+    if context.is_offline_mode():
+        return False
+    inspector = sa.inspect(op.get_bind())
+    keys = inspector.get_unique_constraints(TABLE) + inspector.get_indexes(TABLE)
+    return CONSTRAINT in {key["name"] for key in keys}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if _exists():
+        return
+    if op.get_context().dialect.name == "mysql":
+        op.execute(MERGE_MYSQL)
+        op.execute(DELETE_MYSQL)
+    else:
+        op.execute(MERGE)
+        op.execute(DELETE)
+    with op.batch_alter_table(TABLE) as batch:
+        batch.create_unique_constraint(CONSTRAINT, ["identifier", "timestamp"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if context.is_offline_mode() or _exists():
+        with op.batch_alter_table(TABLE) as batch:
+            batch.drop_constraint(CONSTRAINT, type_="unique")
@@ -0,0 +1,42 @@
+"""Index on revoked_tokens.revoked_at
+
+The revocation set loads the tokens revoked since its last sync with
+revoked_at >= watermark every REVOCATION_SYNC_SECONDS.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = "ix_revoked_tokens_revoked_at"
+
+
+def _exists() -> bool:
+    """Whether the index is there; unknown (False) when only emitting SQL."""
+    if context.is_offline_mode():
+        return False
+    indexes = sa.inspect(op.get_bind()).get_indexes("revoked_tokens")
+    return INDEX in {index["name"] for index in indexes}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _exists():
+        op.create_index(INDEX, "revoked_tokens", ["revoked_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if context.is_offline_mode() or _exists():
+        op.drop_index(INDEX, table_name="revoked_tokens")
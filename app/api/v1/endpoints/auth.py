@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, Form, BackgroundTasks
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
-from app.db.models import User
+from app.core.auth.principal import Principal
 from app.db.mysql import get_db, get_current_user
 from app.repositories.auth.login.repository import LoginManager
 from app.repositories.auth.reset.repository import PasswordManager
@@ -94,7 +94,7 @@ def swagger_login(
 
 @router.post("/auth/refresh-token", response_model=TokenResponse,
              responses={**CommonResponses.INTERNAL_SERVER_ERROR, **CommonResponses.UNAUTHORIZED})
-async def refresh_token(current_user: User = Depends(get_current_user),
+async def refresh_token(current_user: Principal = Depends(get_current_user),
                         db: Session = Depends(get_db)):
     """
     Handles the endpoint for refreshing a user authentication token.
@@ -104,7 +104,7 @@ async def refresh_token(current_user: User = Depends(get_current_user),
     The method returns a response model for the token upon success.
 
     Parameters:
-        current_user: User object injected by dependency.
+        current_user: Principal object injected by dependency.
         Represents the currently
                       authenticated user.
         db: Session object injected by dependency.
@@ -125,7 +125,7 @@ async def refresh_token(current_user: User = Depends(get_current_user),
              responses={**CommonResponses.UNAUTHORIZED})
 def logout(
         token: str = Depends(oauth2_scheme),
-        current_user: User = Depends(get_current_user),  # pylint: disable=unused-argument
+        current_user: Principal = Depends(get_current_user),  # pylint: disable=unused-argument
         db: Session = Depends(get_db)
 ):
     """
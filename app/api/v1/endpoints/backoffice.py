@@ -1,12 +1,15 @@
 """
 BackOffice Endpoint — Admin-only routes
 """
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
-from app.db.models.user.model import User
+from app.core.auth.principal import Principal
 from app.db.mysql import get_db, get_current_user
 from app.repositories.backoffice.repository import BackofficeManager
+from app.schemas.notes.list.request import FIELDS_PATTERN
 from app.schemas.common.responses import CommonResponses
 
 router = APIRouter()
@@ -18,7 +21,7 @@ router = APIRouter()
 def get_all_users(
         page: int = Query(1, ge=1),
         page_size: int = Query(10, ge=1, le=100),
-        current_user: User = Depends(get_current_user),
+        current_user: Principal = Depends(get_current_user),
         db: Session = Depends(get_db)
 ):
     """
@@ -35,14 +38,18 @@ def get_all_users(
 def get_all_notes(
         page: int = Query(1, ge=1),
         page_size: int = Query(10, ge=1, le=100),
-        current_user: User = Depends(get_current_user),
+        fields: Optional[str] = Query(None, max_length=200, pattern=FIELDS_PATTERN),
+        excerpt_length: Optional[int] = Query(None, ge=1, le=1000),
+        current_user: Principal = Depends(get_current_user),
         db: Session = Depends(get_db)
 ):
     """
     Get paginated list of all notes (admin only).
+    fields and excerpt_length work as on /notes/list/*.
     """
     return BackofficeManager(db).get_all_notes(
-        current_user, page=page, page_size=page_size
+        current_user, page=page, page_size=page_size,
+        fields=fields, excerpt_length=excerpt_length
     )
 
 
@@ -52,7 +59,7 @@ def get_all_notes(
 def get_audit_logs(
         page: int = Query(1, ge=1),
         page_size: int = Query(10, ge=1, le=100),
-        current_user: User = Depends(get_current_user),
+        current_user: Principal = Depends(get_current_user),
         db: Session = Depends(get_db)
 ):
     """
@@ -6,6 +6,7 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
+from app.core.auth.passwords import password_hasher
 from app.db.mysql import get_db
 
 router = APIRouter()
@@ -16,10 +17,13 @@ async def healthcheck(db: Session = Depends(get_db)):
     """
     Returns the operational status of the service and its database connection.
     Responds with 200 when healthy, 503 when the database is unreachable.
+    Also reports the password hashing pool's load (running / waiting calls).
     """
     try:
         db.execute(text("SELECT 1"))
-        return JSONResponse(content={"status": "healthy", "database": "connected"})
+        return JSONResponse(content={"status": "healthy",
+                                     "database": "connected",
+                                     "password_hashing": password_hasher.stats()})
     except Exception:  # pylint: disable=broad-except
         return JSONResponse(
             status_code=503,
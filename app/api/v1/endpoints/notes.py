@@ -3,19 +3,20 @@ Note Endpoint
 """
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
-from app.db.models.user.model import User
+from app.core.auth.principal import Principal
 from app.db.mysql import get_db, get_current_user
 from app.repositories.note.cache.repository import CacheRepository
 from app.repositories.note.repository import NoteManager
 from app.schemas.base import PaginatedResponse
 from app.schemas.common.responses import CommonResponses
-from app.schemas.notes.list.request import NoteQueryParams
+from app.schemas.notes.list.request import NoteQueryParams, NoteSearchParams
 from app.schemas.notes.request import (NoteOut, NoteCreate,
-                                       NoteDelete, NoteUpdate)
+                                       NoteDelete, NoteListItem, NoteSearchOut,
+                                       NoteSuggestion, NoteUpdate, TagFacet)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='api/v1/token')
 
@@ -23,41 +24,53 @@ router = APIRouter()
 
 
 @router.get("/list/public",
-            response_model=PaginatedResponse[NoteOut],
+            response_model=PaginatedResponse[NoteListItem],
+            response_model_exclude_unset=True,
             responses={**CommonResponses.UNAUTHORIZED,
                        **CommonResponses.INTERNAL_SERVER_ERROR})
 def get_public_notes(
         params: Annotated[NoteQueryParams, Depends()],
-        current_user: User = Depends(get_current_user),
+        current_user: Principal = Depends(get_current_user),
         db: Session = Depends(get_db)
 ):
     """
     Get pagination notes
-    :param params: NoteQueryParams (page, page_size, sort_order, query)
+    :param params: NoteQueryParams (page or cursor, page_size, sort_order, query,
+                   fields, excerpt_length)
     :param current_user:
     :param db:
     :return:
     """
-    return NoteManager(db).perform_note_action("get_explore_notes",
-                                               current_user=current_user,
-                                               page=params.page,
-                                               sort_order=params.sort_order,
-                                               query=params.query,
-                                               page_size=params.page_size)
+    cache_repo = CacheRepository(db)
+    return cache_repo.get_public_notes(current_user=current_user,
+                                       page=params.page,
+                                       search_query=params.query,
+                                       page_size=params.page_size,
+                                       sort_by=params.sort_by,
+                                       sort_order=params.sort_order,
+                                       cursor=params.cursor,
+                                       include_total=params.include_total,
+                                       search_mode=params.search_mode,
+                                       tag=params.tag,
+                                       fields=params.fields,
+                                       excerpt_length=params.excerpt_length,
+                                       )
 
 
 @router.get("/list/private",
-            response_model=PaginatedResponse[NoteOut],
+            response_model=PaginatedResponse[NoteListItem],
+            response_model_exclude_unset=True,
             responses={**CommonResponses.UNAUTHORIZED,
                        **CommonResponses.INTERNAL_SERVER_ERROR})
 def get_paginated_and_filtered_notes(
         params: Annotated[NoteQueryParams, Depends()],
-        current_user: User = Depends(get_current_user),
+        current_user: Principal = Depends(get_current_user),
         db: Session = Depends(get_db)
 ):
     """
     Get pagination notes
-    :param params: NoteQueryParams (page, page_size, sort_order, query)
+    :param params: NoteQueryParams (page or cursor, page_size, sort_order, query,
+                   fields, excerpt_length)
     :param current_user:
     :param db:
     :return:
@@ -69,9 +82,79 @@ def get_paginated_and_filtered_notes(
                                          page_size=params.page_size,
                                          sort_by=params.sort_by,
                                          sort_order=params.sort_order,
+                                         cursor=params.cursor,
+                                         include_total=params.include_total,
+                                         search_mode=params.search_mode,
+                                         tag=params.tag,
+                                         fields=params.fields,
+                                         excerpt_length=params.excerpt_length,
                                          )
 
 
+@router.get("/search",
+            response_model=PaginatedResponse[NoteSearchOut],
+            responses={**CommonResponses.UNAUTHORIZED,
+                       **CommonResponses.INTERNAL_SERVER_ERROR})
+def search_notes(params: Annotated[NoteSearchParams, Depends()],
+                 current_user: Principal = Depends(get_current_user),
+                 db: Session = Depends(get_db)):
+    """
+    Search the current user's notes
+    :param params: NoteSearchParams (query, search_mode, page or cursor, page_size,
+                   full_content)
+    :param current_user:
+    :param db:
+    :return: PaginatedResponse[NoteSearchOut], snippets unless full_content
+    """
+    return NoteManager(db).perform_note_action("search_notes",
+                                               current_user=current_user,
+                                               query=params.query,
+                                               search_mode=params.search_mode,
+                                               page=params.page,
+                                               page_size=params.page_size,
+                                               cursor=params.cursor,
+                                               full_content=params.full_content)
+
+
+@router.get("/tags",
+            response_model=list[TagFacet],
+            responses={**CommonResponses.UNAUTHORIZED,
+                       **CommonResponses.INTERNAL_SERVER_ERROR})
+def get_tag_facets(current_user: Principal = Depends(get_current_user),
+                   db: Session = Depends(get_db)):
+    """
+    Tag facet counts of the current user's notes, most used first
+    (registered before /{note_id}, which would otherwise match "tags")
+    :param current_user:
+    :param db:
+    :return: list[TagFacet]
+    """
+    return CacheRepository(db).get_tag_facets(current_user=current_user)
+
+
+@router.get("/suggest",
+            response_model=list[NoteSuggestion],
+            responses={**CommonResponses.UNAUTHORIZED,
+                       **CommonResponses.INTERNAL_SERVER_ERROR})
+def suggest(prefix: str = Query(min_length=1, max_length=100),
+            limit: int = Query(10, ge=1, le=50),
+            current_user: Principal = Depends(get_current_user),
+            db: Session = Depends(get_db)):
+    """
+    Autocomplete: titles and tags of the current user's notes with a word
+    starting with prefix, served from memory instead of the listing query
+    :param prefix:
+    :param limit:
+    :param current_user:
+    :param db:
+    :return: list[NoteSuggestion]
+    """
+    return NoteManager(db).perform_note_action("suggest",
+                                               current_user=current_user,
+                                               prefix=prefix,
+                                               limit=limit)
+
+
 @router.get("/{note_id}",
             response_model=NoteOut,
             responses={
@@ -100,7 +183,7 @@ def get_paginated_and_filtered_notes(
             })
 def get_note(note_id: int,
              db: Session = Depends(get_db),
-             current_user: User = Depends(get_current_user)):
+             current_user: Principal = Depends(get_current_user)):
     """
     Get Note
     :param note_id:
@@ -120,7 +203,7 @@ def get_note(note_id: int,
                         **CommonResponses.INTERNAL_SERVER_ERROR})
 def add_note(note: NoteCreate,
              db: Session = Depends(get_db),
-             current_user: User = Depends(get_current_user)):
+             current_user: Principal = Depends(get_current_user)):
     """
     Create a new note
     :param note:
@@ -139,7 +222,7 @@ def add_note(note: NoteCreate,
             responses={**CommonResponses.UNAUTHORIZED,
                        **CommonResponses.INTERNAL_SERVER_ERROR})
 def update_note(note_id: int, note: NoteUpdate, db: Session = Depends(get_db),
-                current_user: User = Depends(get_current_user)):
+                current_user: Principal = Depends(get_current_user)):
     """
     Update a note
     :param note_id:
@@ -161,7 +244,7 @@ def update_note(note_id: int, note: NoteUpdate, db: Session = Depends(get_db),
                           **CommonResponses.INTERNAL_SERVER_ERROR})
 def delete_note(note_id: int,
                 db: Session = Depends(get_db),
-                current_user: User = Depends(get_current_user)):
+                current_user: Principal = Depends(get_current_user)):
     """
     Delete a note
     :param note_id:
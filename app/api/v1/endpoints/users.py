@@ -6,7 +6,7 @@ from typing import List
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from app.db.models import User
+from app.core.auth.principal import Principal
 from app.db.mysql import get_db, get_current_user
 from app.repositories.user.repository import UserManager
 from app.schemas.authorization.request import TokenResponse
@@ -17,7 +17,8 @@ router = APIRouter()
 
 
 @router.get("/", response_model=UserOut, responses=CommonResponses.UNAUTHORIZED)
-async def get_user(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def get_user(current_user: Principal = Depends(get_current_user),
+                   db: Session = Depends(get_db)):
     """
     Get current user
     :param current_user:
@@ -28,7 +29,7 @@ async def get_user(current_user: User = Depends(get_current_user), db: Session =
 
 
 @router.get("/list", response_model=List[UserOut], responses=CommonResponses.UNAUTHORIZED)
-async def get_users_list(current_user: User = Depends(get_current_user),
+async def get_users_list(current_user: Principal = Depends(get_current_user),
                          db: Session = Depends(get_db)):
     """
     Get current user
@@ -61,7 +62,7 @@ async def register_user(user: UserRequestAdd, db: Session = Depends(get_db)):
             responses=CommonResponses.UNAUTHORIZED)
 async def update_user(user_update: UserBase,
                       db: Session = Depends(get_db),
-                      current_user: User = Depends(get_current_user), ):
+                      current_user: Principal = Depends(get_current_user), ):
     """
     Update user information
     :param user_update:
@@ -78,7 +79,7 @@ async def update_user(user_update: UserBase,
                response_model=UserDelete,
                responses=CommonResponses.UNAUTHORIZED)
 async def delete_user(db: Session = Depends(get_db),
-                      current_user: User = Depends(get_current_user)):
+                      current_user: Principal = Depends(get_current_user)):
     """
     Delete user account
     :param db:
@@ -0,0 +1,3 @@
+"""
+Authentication helpers shared by the middleware and the auth dependencies.
+"""
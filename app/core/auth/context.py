@@ -0,0 +1,60 @@
+"""
+  Per-request authentication context
+
+  The bearer token of a request is verified at most once. The outcome
+  (claims or the JWT error) is memoised in the ASGI scope state, which is
+  what request.state exposes, so RateLimitMiddleware and get_current_user
+  share a single HMAC check and JSON parse. Tokens verified by an earlier
+  request are served from the token cache without decoding at all.
+"""
+from typing import Optional
+
+import jwt
+from starlette.datastructures import Headers
+from starlette.types import Scope
+
+from app.core.auth.token_cache import token_cache
+from app.core.security import decode_token_claims
+
+_STATE_KEY = "auth_context"
+
+
+def bearer_token(headers: Headers) -> Optional[str]:
+    """
+    Extract the bearer token from the Authorization header
+    :param headers:
+    :return: token or None
+    """
+    auth_header = headers.get("Authorization")
+    if auth_header and auth_header.startswith("Bearer "):
+        return auth_header.split(" ")[1]
+    return None
+
+
+def get_token_claims(scope: Scope, token: str) -> dict:
+    """
+    Verified claims of the token, decoded once per request
+    :param scope: ASGI scope of the current request
+    :param token: raw bearer token
+    :return: claims dict
+    :raises jwt.PyJWTError: when the token is expired or invalid
+    """
+    state = scope.setdefault("state", {})
+    cached = state.get(_STATE_KEY)
+    if cached is None or cached[0] != token:
+        entry = token_cache.get(token)
+        if entry is not None:
+            cached = (token, entry.claims, None)
+        else:
+            try:
+                claims = decode_token_claims(token)
+                token_cache.store(token, claims)
+                cached = (token, claims, None)
+            except jwt.PyJWTError as e:
+                cached = (token, None, e)
+        state[_STATE_KEY] = cached
+
+    _, claims, error = cached
+    if error is not None:
+        raise error
+    return claims
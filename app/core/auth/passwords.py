@@ -0,0 +1,130 @@
+"""
+  Password hashing service
+
+  bcrypt is deliberately slow (hundreds of milliseconds per call), so
+  hashing and verification run on a small process pool instead of the
+  calling thread or the event loop. At most PASSWORD_HASH_MAX_CONCURRENCY
+  calls are in flight; further callers wait for a slot, and stats() reports
+  how many are running and waiting so login bursts are visible.
+
+  The pool runs bcrypt.hashpw / bcrypt.checkpw directly, so worker processes
+  only import bcrypt. PASSWORD_HASH_WORKERS=0 hashes in the calling thread.
+"""
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Callable, Optional
+
+import bcrypt
+
+from app.core.settings import settings
+
+
+class PasswordHasher:
+    """
+    bcrypt hashing and verification on a bounded process pool.
+    """
+
+    def __init__(self, workers: int, max_concurrency: int, rounds: int = 12):
+        self.workers = workers
+        self.max_concurrency = max_concurrency
+        self.rounds = rounds
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._running = 0
+        self._waiting = 0
+        self._peak_waiting = 0
+        self._completed = 0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=get_context("spawn"))
+            return self._executor
+
+    def _run(self, fn: Callable, *args):
+        with self._lock:
+            self._waiting += 1
+            self._peak_waiting = max(self._peak_waiting, self._waiting)
+        with self._slots:
+            with self._lock:
+                self._waiting -= 1
+                self._running += 1
+            try:
+                if self.workers <= 0:
+                    return fn(*args)
+                try:
+                    return self._pool().submit(fn, *args).result()
+                except BrokenProcessPool:
+                    self.shutdown()
+                    raise
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+
+    def hash_sync(self, plain_password: str) -> str:
+        """
+        Hash a password, blocking the calling thread
+        :param plain_password:
+        :return: bcrypt hash
+        """
+        salt = bcrypt.gensalt(self.rounds)
+        return self._run(bcrypt.hashpw, plain_password.encode(), salt).decode()
+
+    def verify_sync(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Check a password against its hash, blocking the calling thread
+        :param plain_password:
+        :param hashed_password:
+        :return: bool
+        """
+        return self._run(bcrypt.checkpw, plain_password.encode(), hashed_password.encode())
+
+    async def hash(self, plain_password: str) -> str:
+        """
+        Hash a password without blocking the event loop
+        :param plain_password:
+        :return: bcrypt hash
+        """
+        return await asyncio.to_thread(self.hash_sync, plain_password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Check a password without blocking the event loop
+        :param plain_password:
+        :param hashed_password:
+        :return: bool
+        """
+        return await asyncio.to_thread(self.verify_sync, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        """
+        Pool size, concurrency cap and queue depth
+        :return: dict
+        """
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_concurrency": self.max_concurrency,
+                "running": self._running,
+                "waiting": self._waiting,
+                "peak_waiting": self._peak_waiting,
+                "completed": self._completed,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; the pool is recreated on next use"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS,
+                                 settings.PASSWORD_HASH_MAX_CONCURRENCY,
+                                 settings.BCRYPT_ROUNDS)
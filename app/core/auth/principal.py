@@ -0,0 +1,32 @@
+"""
+  Authenticated principal
+
+  What get_current_user hands to endpoints and managers: the handful of
+  user columns authorization needs, immutable and without ORM state, so it
+  can be cached and shared between requests and never lazy-loads notes or
+  audit rows. Code that has to change the user loads the ORM row explicitly
+  with CommonService.load_user.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """
+    Identity and role of the authenticated user.
+    """
+    id: str
+    username: str
+    email: str
+    role: str
+    picture_url: Optional[str] = None
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        """
+        Build a principal from a User model or a row with the same columns
+        :param user:
+        :return: Principal
+        """
+        return cls(user.id, user.username, user.email, user.role, user.picture_url)
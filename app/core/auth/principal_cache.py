@@ -0,0 +1,51 @@
+"""
+  Resolved user cache
+
+  get_current_user keeps the Principal of each authenticated user, keyed by
+  user id, for PRINCIPAL_CACHE_TTL seconds (LRU bounded by
+  PRINCIPAL_CACHE_MAXSIZE), so read-heavy endpoints skip the users SELECT.
+  Every code path that changes or deletes a user calls invalidate(), which
+  makes the next request reload the row.
+"""
+from typing import Optional
+
+from app.core.auth.principal import Principal
+from app.core.cache import TTLCache
+from app.core.settings import settings
+
+
+class PrincipalCache:
+    """
+    TTL cache of principals keyed by user id.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize, ttl)
+
+    def get(self, user_id: str) -> Optional[Principal]:
+        """
+        Cached principal of the user
+        :param user_id:
+        :return: Principal or None
+        """
+        return self._cache.get(str(user_id))
+
+    def store(self, principal: Principal) -> Principal:
+        """
+        Cache a freshly loaded principal
+        :param principal:
+        :return: the stored principal
+        """
+        self._cache.set(str(principal.id), principal)
+        return principal
+
+    def invalidate(self, user_id: str) -> None:
+        """Forget the user (call after every update or delete)"""
+        self._cache.pop(str(user_id))
+
+    def clear(self) -> None:
+        """Forget every user"""
+        self._cache.clear()
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_MAXSIZE, settings.PRINCIPAL_CACHE_TTL)
@@ -0,0 +1,99 @@
+"""
+  In-process revoked token set
+
+  Keeps jti -> expires_at for every live revocation so get_current_user can
+  reject logged-out tokens without a query. The set is loaded from
+  revoked_tokens on first use, updated immediately by logout on this node,
+  and picks up revocations made by other nodes every REVOCATION_SYNC_SECONDS
+  with an incremental query on the revoked_at watermark. Entries past their
+  expires_at are dropped, the token is rejected by its exp claim anyway.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.db.models.auth.model import RevokedToken
+
+
+class RevocationSet:
+    """
+    Revoked jti set with watermark based incremental sync.
+    """
+
+    def __init__(self, sync_interval: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self.sync_interval = sync_interval
+        self._clock = clock
+        self._revoked: dict[str, datetime] = {}
+        self._watermark: Optional[datetime] = None
+        self._next_sync = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def is_revoked(self, db: Session, jti: str) -> bool:
+        """
+        Whether the jti has been revoked, syncing first when due
+        :param db: session used for the (rare) sync query
+        :param jti:
+        :return: bool
+        """
+        if self._clock() >= self._next_sync:
+            self.sync(db)
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > datetime.now()
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        """
+        Record a revocation made on this node
+        :param jti:
+        :param expires_at: exp of the revoked token
+        """
+        with self._lock:
+            self._revoked[jti] = expires_at
+
+    def sync(self, db: Session) -> int:
+        """
+        Load revocations newer than the watermark and prune expired ones.
+        The first call loads every live row. The watermark is re-read with an
+        overlap of one sync interval so rows committed late by other nodes
+        (or stamped by a skewed clock) are not missed.
+        :param db:
+        :return: number of rows read
+        """
+        now = datetime.now()
+        query = db.query(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at)
+        if self._watermark is None:
+            query = query.filter(RevokedToken.expires_at > now)
+        else:
+            query = query.filter(
+                RevokedToken.revoked_at >= self._watermark - timedelta(seconds=self.sync_interval)
+            )
+        rows = query.all()
+
+        with self._lock:
+            for jti, expires_at, revoked_at in rows:
+                self._revoked[jti] = expires_at
+                if self._watermark is None or revoked_at > self._watermark:
+                    self._watermark = revoked_at
+            if self._watermark is None:
+                self._watermark = now
+            for jti in [j for j, expires_at in self._revoked.items() if expires_at <= now]:
+                del self._revoked[jti]
+            self._next_sync = self._clock() + self.sync_interval
+        return len(rows)
+
+    def clear(self) -> None:
+        """Forget everything; the next check reloads from the table"""
+        with self._lock:
+            self._revoked.clear()
+            self._watermark = None
+            self._next_sync = 0.0
+
+
+revocation_set = RevocationSet(settings.REVOCATION_SYNC_SECONDS)
@@ -0,0 +1,69 @@
+"""
+  Verified token cache
+
+  Maps the SHA-256 digest of a bearer token to its verified claims, so a
+  token is decoded once rather than on every request. Entries live for
+  TOKEN_CACHE_TTL seconds but never past the token's own exp claim, and
+  logout evicts them immediately. The user behind a token is cached
+  separately, by user id, in app.core.auth.principal_cache.
+"""
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.cache import TTLCache
+from app.core.settings import settings
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    """
+    Verified claims of a token.
+    """
+    claims: dict
+
+
+def token_digest(token: str) -> bytes:
+    """Cache key for a raw token (the token itself is never stored)"""
+    return hashlib.sha256(token.encode()).digest()
+
+
+class TokenCache:
+    """
+    TTL cache of verified tokens keyed by token digest.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize, ttl)
+
+    def get(self, token: str) -> Optional[CachedToken]:
+        """
+        Cached entry for the token
+        :param token:
+        :return: CachedToken or None
+        """
+        return self._cache.get(token_digest(token))
+
+    def store(self, token: str, claims: dict) -> None:
+        """
+        Cache verified claims, capped at the token's exp
+        :param token:
+        :param claims: verified claims
+        """
+        ttl = self._cache.ttl
+        exp = claims.get("exp")
+        if exp is not None:
+            ttl = min(ttl, exp - time.time())
+        self._cache.set(token_digest(token), CachedToken(claims), ttl)
+
+    def evict(self, token: str) -> None:
+        """Forget the token (e.g. on logout)"""
+        self._cache.pop(token_digest(token))
+
+    def clear(self) -> None:
+        """Forget every token"""
+        self._cache.clear()
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_MAXSIZE, settings.TOKEN_CACHE_TTL)
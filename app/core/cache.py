@@ -1,10 +1,22 @@
 """
-    Cache decorator for caching data
+    Cache decorator for caching data, the in-process TTLCache and the
+    pluggable cache backends (memory, Redis, tiered) used for note listings
 """
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import lru_cache
-from typing import Any
+from typing import Any, Callable, Hashable, Optional
 
 from app.core import settings
+from app.repositories.logger.repository import LoggerService
+
+logger = LoggerService().logger
+
+_MISSING = object()
 
 
 @lru_cache(maxsize=settings.CACHE_CONFIG["MAXSIZE"])
@@ -14,3 +26,492 @@ def cache_data(key: str) -> Any:
     When the cache is full, Least Recently Used items are removed first
     """
     return key
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU mapping whose entries expire after a TTL.
+
+    Every entry carries its own deadline, so callers may store values that
+    must not outlive something else (e.g. a token's exp claim).
+    """
+
+    def __init__(self, maxsize: int, ttl: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the live value for key, refreshing its LRU position
+        :param key:
+        :param default: returned on miss or expiry
+        :return: cached value or default
+        """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            deadline, value = entry
+            if deadline <= self._clock():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store value for ttl seconds (the cache default when omitted)
+        :param key:
+        :param value:
+        :param ttl: per-entry lifetime in seconds
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (self._clock() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value (expired or not)"""
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[1]
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self._data.clear()
+
+
+class CacheBackend(ABC):
+    """
+    Key/value store for cached results, plus integer counters.
+
+    Keys are strings and values must be JSON serialisable, so the same
+    callers work against the in-process store and against Redis. get()
+    returns None on a miss; counters never go down, and with Redis they
+    start at 0 and never expire.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        """Cached value or None"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Cache value for ttl seconds (the backend default when omitted)"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove key"""
+
+    @abstractmethod
+    def counter(self, key: str) -> int:
+        """Current value of a counter"""
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        """Increment a counter and return its new value"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every value and counter"""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Per-process backend on top of TTLCache. Fast, but every worker and
+    instance holds its own copy.
+
+    Counters are LRU bounded to maxsize like the values. Each increment hands
+    out a number larger than any before, and a counter read while unknown
+    (new or evicted) starts at the last number handed out: no counter ever
+    goes back to a value it had before an increment.
+    """
+
+    def __init__(self, maxsize: int, ttl: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self._values = TTLCache(maxsize, ttl, clock)
+        self._counters: OrderedDict[str, int] = OrderedDict()
+        self._issued = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, key: str) -> Any:
+        return self._values.get(key)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._values.set(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        self._values.pop(key)
+
+    def counter(self, key: str) -> int:
+        with self._lock:
+            value = self._counters.get(key)
+            return self._remember(key, self._issued if value is None else value)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._issued += 1
+            return self._remember(key, self._issued)
+
+    def _remember(self, key: str, value: int) -> int:
+        self._counters[key] = value
+        self._counters.move_to_end(key)
+        while len(self._counters) > self._values.maxsize:
+            self._counters.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        self._values.clear()
+        with self._lock:
+            self._counters.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend shared by every worker and instance, speaking the Redis protocol
+    through a redis-py compatible client. Values are stored as JSON under
+    prefix. Connection errors are logged and treated as cache misses, so an
+    unavailable Redis degrades to uncached reads rather than failed requests.
+    """
+
+    def __init__(self, client, ttl: float, prefix: str = "notes_be:"):
+        # pylint: disable=import-outside-toplevel  # redis is an optional dependency
+        from redis.exceptions import RedisError
+
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self._errors = RedisError
+
+    @classmethod
+    def from_url(cls, url: str, ttl: float, prefix: str = "notes_be:") -> "RedisCacheBackend":
+        """
+        Connect lazily to the Redis server at url
+        :param url: e.g. redis://localhost:6379/0
+        :param ttl: default lifetime of values in seconds
+        :param prefix: namespace of every key
+        :return: RedisCacheBackend
+        """
+        try:
+            import redis  # pylint: disable=import-outside-toplevel
+        except ImportError as e:
+            raise ImportError("CACHE_BACKEND=redis needs the 'redis' extra: "
+                              "pip install albz-notes-be[redis]") from e
+        return cls(redis.Redis.from_url(url), ttl, prefix)
+
+    def get(self, key: str) -> Any:
+        try:
+            raw = self.client.get(self.prefix + key)
+        except self._errors as e:
+            logger.warning("Cache get failed for %s: %s", key, e)
+            return None
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        try:
+            self.client.set(self.prefix + key, json.dumps(value), px=int(ttl * 1000))
+        except self._errors as e:
+            logger.warning("Cache set failed for %s: %s", key, e)
+
+    def delete(self, key: str) -> None:
+        try:
+            self.client.delete(self.prefix + key)
+        except self._errors as e:
+            logger.warning("Cache delete failed for %s: %s", key, e)
+
+    def counter(self, key: str) -> int:
+        try:
+            raw = self.client.get(self.prefix + key)
+        except self._errors as e:
+            logger.warning("Cache counter read failed for %s: %s", key, e)
+            return -1
+        return int(raw or 0)
+
+    def incr(self, key: str) -> int:
+        try:
+            return int(self.client.incr(self.prefix + key))
+        except self._errors as e:
+            logger.error("Cache counter increment failed for %s: %s", key, e)
+            return -1
+
+    def clear(self) -> None:
+        try:
+            keys = list(self.client.scan_iter(match=self.prefix + "*"))
+            if keys:
+                self.client.delete(*keys)
+        except self._errors as e:
+            logger.warning("Cache clear failed: %s", e)
+
+
+class TieredCacheBackend(CacheBackend):
+    """
+    A small per-worker L1 (MemoryCacheBackend) in front of a shared L2.
+
+    Values are read from L1 first and written to both tiers. Counters are
+    always read from L2, so every instance agrees on them; with
+    GenerationalCache this means an invalidation is visible everywhere at
+    once even though L1 copies of old entries linger until they expire.
+    """
+
+    def __init__(self, l1: CacheBackend, l2: CacheBackend):
+        self.l1 = l1
+        self.l2 = l2
+
+    def get(self, key: str) -> Any:
+        value = self.l1.get(key)
+        if value is None:
+            value = self.l2.get(key)
+            if value is not None:
+                self.l1.set(key, value)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self.l2.set(key, value, ttl)
+        self.l1.set(key, value)
+
+    def delete(self, key: str) -> None:
+        self.l2.delete(key)
+        self.l1.delete(key)
+
+    def counter(self, key: str) -> int:
+        return self.l2.counter(key)
+
+    def incr(self, key: str) -> int:
+        return self.l2.incr(key)
+
+    def clear(self) -> None:
+        self.l2.clear()
+        self.l1.clear()
+
+
+def create_cache_backend(name: Optional[str] = None) -> CacheBackend:
+    """
+    Build the cache backend selected by CACHE_BACKEND
+    :param name: memory, redis or tiered (defaults to the setting)
+    :return: CacheBackend
+    """
+    name = (name or settings.CACHE_BACKEND).lower()
+    ttl = settings.CACHE_CONFIG["TTL"]
+    match name:
+        case "memory":
+            return MemoryCacheBackend(settings.CACHE_CONFIG["MAXSIZE"], ttl)
+        case "redis":
+            return RedisCacheBackend.from_url(settings.REDIS_URL, ttl)
+        case "tiered":
+            return TieredCacheBackend(
+                MemoryCacheBackend(settings.CACHE_L1_MAXSIZE, settings.CACHE_L1_TTL),
+                RedisCacheBackend.from_url(settings.REDIS_URL, ttl),
+            )
+        case _:
+            raise ValueError(f"Unknown cache backend: {name}")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls per key: the first caller runs the function,
+    callers arriving while it runs wait for and share its outcome.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether a call for key is running"""
+        with self._lock:
+            return key in self._calls
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn unless a call for key is already running, then share its result
+        :param key:
+        :param fn:
+        :return: result of fn (exceptions are re-raised in every caller)
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class GenerationalCache:
+    """
+    Cache whose entries belong to a scope (e.g. one user's notes).
+
+    Every scope has a generation counter, kept in the backend, that is part
+    of the entry key, so invalidate(scope) is O(1): it bumps the counter and
+    the old entries are never read again, ageing out through TTL and (in
+    memory) LRU eviction. With a shared backend the counters are shared too,
+    so an invalidation on one instance applies to all of them.
+
+    Entries are fresh for ttl seconds and then stale for stale_ttl more:
+    get_or_compute serves a stale entry immediately and refreshes it in the
+    background. Misses and refreshes are single-flight per key, so an
+    expiring hot key is recomputed once, not once per concurrent request.
+    Stale entries never survive invalidate().
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str, ttl: float,
+                 stale_ttl: float = 0, clock: Callable[[], float] = time.time):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        self._flights = SingleFlight()
+        self._refresher: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _entry_key(self, scope: str, generation: int, key: Hashable) -> str:
+        return f"{self.namespace}:{scope}:{generation}:{json.dumps(key)}"
+
+    def _generation_key(self, scope: str) -> str:
+        return f"{self.namespace}:gen:{scope}"
+
+    def _lookup(self, scope: str, key: Hashable) -> tuple[int, Optional[list]]:
+        generation = self.generation(scope)
+        if generation < 0:
+            return generation, None
+        return generation, self.backend.get(self._entry_key(scope, generation, key))
+
+    def _store(self, scope: str, key: Hashable, generation: int, value: Any) -> None:
+        if generation >= 0 and value is not None:
+            self.backend.set(self._entry_key(scope, generation, key),
+                             [value, self._clock() + self.ttl],
+                             self.ttl + self.stale_ttl)
+
+    def generation(self, scope: str) -> int:
+        """Current generation of the scope (-1 when the backend is unreachable)"""
+        return self.backend.counter(self._generation_key(scope))
+
+    def get(self, scope: str, key: Hashable, default: Any = None) -> Any:
+        """
+        Fresh value cached for key in the current generation of scope
+        :param scope:
+        :param key: JSON serialisable
+        :param default: returned on miss
+        :return: cached value or default
+        """
+        _, entry = self._lookup(scope, key)
+        if entry is None or entry[1] <= self._clock():
+            return default
+        return entry[0]
+
+    def set(self, scope: str, key: Hashable, value: Any,
+            generation: Optional[int] = None) -> None:
+        """
+        Cache value for key in a generation of scope
+        :param scope:
+        :param key: JSON serialisable
+        :param value: JSON serialisable, None is not cached
+        :param generation: generation read before computing value; when the
+            scope was invalidated meanwhile the value is never served
+        """
+        if generation is None:
+            generation = self.generation(scope)
+        self._store(scope, key, generation, value)
+
+    def get_or_compute(self, scope: str, key: Hashable,
+                       compute: Callable[[], Any],
+                       refresh: Optional[Callable[[], Any]] = None) -> tuple[Any, bool]:
+        """
+        Cached value for key, computing it once across concurrent callers
+        :param scope:
+        :param key: JSON serialisable
+        :param compute: runs in the calling thread on a miss
+        :param refresh: runs in a background thread to renew a stale entry
+            (must not use request scoped resources); defaults to compute
+        :return: (value, whether it came from the cache)
+        """
+        generation, entry = self._lookup(scope, key)
+        entry_key = self._entry_key(scope, generation, key)
+        if entry is not None:
+            if entry[1] <= self._clock() and not self._flights.in_flight(entry_key):
+                self._background(entry_key, scope, key, generation, refresh or compute)
+            return entry[0], True
+
+        def load():
+            value = compute()
+            self._store(scope, key, generation, value)
+            return value
+        if generation < 0:
+            return compute(), False
+        return self._flights.do(entry_key, load), False
+
+    def _background(self, entry_key: str, scope: str, key: Hashable,
+                    generation: int, refresh: Callable[[], Any]) -> None:
+        def run():
+            try:
+                self._flights.do(entry_key,
+                                 lambda: self._store(scope, key, generation, refresh()))
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning("Background cache refresh of %s failed: %s", entry_key, e)
+
+        with self._lock:
+            if self._refresher is None:
+                self._refresher = ThreadPoolExecutor(max_workers=2,
+                                                     thread_name_prefix="cache-refresh")
+            self._refresher.submit(run)
+
+    def invalidate(self, scope: str) -> None:
+        """Make every entry of the scope unreachable"""
+        self.backend.incr(self._generation_key(scope))
+
+    def clear(self) -> None:
+        """Drop every entry and counter"""
+        self.backend.clear()
+
+
+PUBLIC_NOTES = "public"
+
+note_cache = GenerationalCache(create_cache_backend(), "notes",
+                               ttl=settings.CACHE_CONFIG["TTL"],
+                               stale_ttl=settings.CACHE_CONFIG["STALE_TTL"])
+
+
+def user_notes(user_id) -> str:
+    """Cache scope of one user's private note listings"""
+    return f"user:{user_id}"
+
+
+def invalidate_notes(user_id, public: bool = False) -> None:
+    """
+    Drop cached note listings of a user, and the public feed when it may
+    contain the change too
+    :param user_id:
+    :param public: also invalidate the public feed
+    """
+    note_cache.invalidate(user_notes(user_id))
+    if public:
+        note_cache.invalidate(PUBLIC_NOTES)
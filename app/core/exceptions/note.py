@@ -48,6 +48,26 @@ class NoteErrorHandler:
             detail=f"An error occurred while paginating the notes list: {str(error)}"
         )
 
+    @classmethod
+    def raise_invalid_cursor(cls):
+        """
+        Raise invalid pagination cursor error
+        """
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid or expired pagination cursor"
+        )
+
+    @classmethod
+    def raise_invalid_query(cls, error):
+        """
+        Raise invalid search query error
+        """
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid search query: {str(error)}"
+        )
+
     @classmethod
     def raise_general_error(cls, param):
         """
@@ -0,0 +1,54 @@
+"""
+Rate limiter backends for RateLimitMiddleware.
+"""
+from datetime import timedelta
+
+from app.core.middleware.limiter.base import RateLimitBackend, RateLimitResult
+from app.core.middleware.limiter.database import (DatabaseRateLimitBackend,
+                                                  WriteBehindRateLimitBackend)
+from app.core.middleware.limiter.memory import MemoryRateLimitBackend
+from app.core.middleware.limiter.shared import SharedMemoryRateLimitBackend
+from app.core.settings import settings
+
+
+def create_rate_limit_backend(name: str = None, db_session=None) -> RateLimitBackend:
+    """
+    Build the rate limiter backend selected by RATE_LIMIT_BACKEND
+    :param name: backend name ("memory", "shared", "database" or "write_behind")
+    :param db_session: session factory, required by the database backend
+    :return: RateLimitBackend
+    """
+    name = (name or settings.RATE_LIMIT_BACKEND).lower()
+    limit = int(settings.RATE_LIMIT)
+    window_seconds = int(settings.RATE_LIMIT_WINDOW) * 60
+    retention = timedelta(hours=settings.RATE_LIMIT_RETENTION_HOURS)
+
+    match name:
+        case "memory":
+            return MemoryRateLimitBackend(limit, window_seconds,
+                                          max_identifiers=settings.RATE_LIMIT_MAX_IDENTIFIERS)
+        case "shared":
+            return SharedMemoryRateLimitBackend(limit, window_seconds,
+                                                path=settings.RATE_LIMIT_SHM_PATH or None,
+                                                slots=settings.RATE_LIMIT_SHM_SLOTS)
+        case "database":
+            return DatabaseRateLimitBackend(limit, window_seconds, db_session,
+                                            retention=retention)
+        case "write_behind":
+            return WriteBehindRateLimitBackend(limit, window_seconds, db_session,
+                                               flush_interval=settings.RATE_LIMIT_FLUSH_INTERVAL,
+                                               max_drift=settings.RATE_LIMIT_MAX_DRIFT,
+                                               retention=retention,
+                                               max_identifiers=settings.RATE_LIMIT_MAX_IDENTIFIERS)
+    raise ValueError(f"Unknown rate limit backend: {name}")
+
+
+__all__ = (
+    "RateLimitBackend",
+    "RateLimitResult",
+    "MemoryRateLimitBackend",
+    "SharedMemoryRateLimitBackend",
+    "DatabaseRateLimitBackend",
+    "WriteBehindRateLimitBackend",
+    "create_rate_limit_backend",
+)
@@ -0,0 +1,87 @@
+"""
+  Rate limiter backend interface
+
+  A backend owns the counters for every identifier and answers a single
+  question per request: may this identifier make one more call right now?
+"""
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """
+    Outcome of a single rate limit check.
+
+    Attributes:
+        allowed: Whether the request may proceed.
+        limit: Maximum number of requests per window.
+        remaining: Requests still available in the current window.
+        reset: Unix timestamp at which the current window ends.
+    """
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: int
+
+
+class RateLimitBackend(ABC):
+    """
+    Base class for rate limiter backends used by RateLimitMiddleware.
+    """
+
+    def __init__(self, limit: int, window_seconds: int):
+        self.limit = limit
+        self.window_seconds = window_seconds
+
+    @abstractmethod
+    def hit(self, identifier: str) -> RateLimitResult:
+        """
+        Register a request for the identifier and return the decision.
+        Rejected requests are not counted against the budget.
+        """
+
+    async def startup(self) -> None:
+        """Called once on application startup (lifespan)"""
+
+    async def shutdown(self) -> None:
+        """Called once on application shutdown (lifespan)"""
+
+
+def sliding_window(limit: int,
+                   window_seconds: int,
+                   now: float,
+                   window_index: int,
+                   current: int,
+                   previous: int) -> tuple[RateLimitResult, int, int, int]:
+    """
+    Sliding window counter check, O(1) per call.
+
+    The previous fixed window is weighted by how much of it still overlaps
+    the sliding window, which approximates a true sliding log without
+    keeping one timestamp per request.
+    :param limit: requests allowed per window
+    :param window_seconds: window length in seconds
+    :param now: current unix time
+    :param window_index: index of the window the counters belong to
+    :param current: requests counted in that window
+    :param previous: requests counted in the window before it
+    :return: (result, window_index, current, previous) with updated counters
+    """
+    index = int(now // window_seconds)
+    if index != window_index:
+        previous = current if index == window_index + 1 else 0
+        current = 0
+        window_index = index
+
+    elapsed = now - index * window_seconds
+    estimated = previous * (window_seconds - elapsed) / window_seconds + current
+    reset = (index + 1) * window_seconds
+
+    if estimated + 1 > limit:
+        return RateLimitResult(False, limit, 0, reset), window_index, current, previous
+
+    current += 1
+    remaining = max(0, math.floor(limit - estimated - 1))
+    return RateLimitResult(True, limit, remaining, reset), window_index, current, previous
@@ -0,0 +1,244 @@
+"""
+  MySQL backed rate limiters
+
+  - DatabaseRateLimitBackend keeps one row per identifier and window in the
+  rate_limits table. Every check costs a SELECT and a COMMIT.
+  - WriteBehindRateLimitBackend decides in memory and flushes aggregated
+  increments to rate_limits in periodic batches from a background task,
+  upserting on the unique (identifier, timestamp) key so workers add up
+  into the same window row.
+
+  Both sweep rows older than RATE_LIMIT_RETENTION_HOURS, at most once per
+  window, so the table no longer grows forever.
+"""
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable
+
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.core.middleware.limiter.base import RateLimitBackend, RateLimitResult
+from app.core.middleware.limiter.memory import MemoryRateLimitBackend
+from app.db.models.auth.model import RateLimit
+from app.repositories.logger.repository import LoggerService
+
+logger = LoggerService().logger
+
+
+def purge_expired_rate_limits(db, before: datetime) -> int:
+    """
+    Delete rate limit rows last touched before the given time
+    :param db: database session (not committed here)
+    :param before: retention cut-off
+    :return: number of deleted rows
+    """
+    return db.query(RateLimit).filter(
+        RateLimit.timestamp < before
+    ).delete(synchronize_session=False)
+
+
+def _get_or_create_rate_limit(identifier: str,
+                              now: datetime,
+                              window_start: datetime,
+                              db) -> RateLimit:
+    """Get or create the rate limit record"""
+    rate_limit = db.query(RateLimit).filter(
+        RateLimit.identifier == identifier,
+        RateLimit.timestamp > window_start
+    ).first()
+
+    if not rate_limit:
+        rate_limit = RateLimit(
+            identifier=identifier,
+            requests=1,
+            timestamp=now
+        )
+        db.add(rate_limit)
+    else:
+        rate_limit.requests += 1
+        rate_limit.timestamp = now
+
+    return rate_limit
+
+
+def _upsert_increments(db, rows: list[dict]) -> None:
+    """
+    Add requests to the (identifier, timestamp) rows, creating missing ones:
+    INSERT ... ON DUPLICATE KEY UPDATE requests = requests + VALUES(requests)
+    on MySQL, ON CONFLICT DO UPDATE on SQLite
+    :param db: database session (not committed here)
+    :param rows: [{"identifier", "timestamp", "requests"}]
+    """
+    if db.get_bind().dialect.name == "mysql":
+        stmt = mysql.insert(RateLimit).values(rows)
+        stmt = stmt.on_duplicate_key_update(requests=RateLimit.requests + stmt.inserted.requests)
+    else:
+        stmt = sqlite.insert(RateLimit).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[RateLimit.identifier, RateLimit.timestamp],
+            set_={"requests": RateLimit.requests + stmt.excluded.requests})
+    db.execute(stmt)
+
+
+class DatabaseRateLimitBackend(RateLimitBackend):
+    """
+    Rate limiter storing its counters in the rate_limits table.
+    """
+
+    def __init__(self, limit: int, window_seconds: int, db_session,
+                 retention: timedelta = timedelta(hours=24)):
+        super().__init__(limit, window_seconds)
+        self.db_session = db_session
+        self.retention = retention
+        self._next_sweep = datetime.min
+
+    def hit(self, identifier: str) -> RateLimitResult:
+        try:
+            return self._hit(identifier)
+        except IntegrityError:
+            # Another worker created the row for this second first
+            return self._hit(identifier)
+
+    def _hit(self, identifier: str) -> RateLimitResult:
+        db = self.db_session()
+        try:
+            now = datetime.now()
+            window_start = now - timedelta(seconds=self.window_seconds)
+            rate_limit = _get_or_create_rate_limit(identifier, now, window_start, db)
+            reset = int(window_start.timestamp())
+
+            if rate_limit.requests > self.limit:
+                return RateLimitResult(False, self.limit, 0, reset)
+
+            if now >= self._next_sweep:
+                self._next_sweep = now + timedelta(seconds=self.window_seconds)
+                purge_expired_rate_limits(db, now - self.retention)
+            db.commit()
+            return RateLimitResult(True, self.limit, self.limit - rate_limit.requests, reset)
+        finally:
+            db.close()
+
+
+class WriteBehindRateLimitBackend(RateLimitBackend):
+    """
+    Rate limiter that decides from in-memory sliding window counters and
+    persists aggregated per-window increments to rate_limits in batches.
+
+    A flush happens every flush_interval seconds, or sooner once max_drift
+    increments are waiting, so at most max_drift requests per worker are
+    missing from the table at any time. Failed flushes are re-queued.
+    """
+
+    def __init__(self,
+                 limit: int,
+                 window_seconds: int,
+                 db_session,
+                 flush_interval: float = 5.0,
+                 max_drift: int = 500,
+                 retention: timedelta = timedelta(hours=24),
+                 max_identifiers: int = 10000,
+                 clock: Callable[[], float] = time.time):
+        super().__init__(limit, window_seconds)
+        self.db_session = db_session
+        self.flush_interval = flush_interval
+        self.max_drift = max_drift
+        self.retention = retention
+        self._clock = clock
+        self._counters = MemoryRateLimitBackend(limit, window_seconds,
+                                                max_identifiers=max_identifiers,
+                                                clock=clock)
+        self._pending: defaultdict[tuple[str, int], int] = defaultdict(int)
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._next_sweep = 0.0
+        self._flush_needed: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        """Increments counted in memory but not yet written to the table"""
+        return self._pending_total
+
+    def hit(self, identifier: str) -> RateLimitResult:
+        result = self._counters.hit(identifier)
+        if result.allowed:
+            window_start = int(self._clock() // self.window_seconds) * self.window_seconds
+            with self._lock:
+                self._pending[(identifier, window_start)] += 1
+                self._pending_total += 1
+                drifted = self._pending_total >= self.max_drift
+            if drifted and self._flush_needed is not None:
+                self._flush_needed.set()
+        return result
+
+    def flush(self) -> int:
+        """
+        Write every pending increment with one upsert and one COMMIT.
+        Rows are keyed by (identifier, window start).
+        :return: number of increments written
+        """
+        with self._flush_lock:
+            return self._flush()
+
+    def _flush(self) -> int:
+        with self._lock:
+            batch, self._pending = self._pending, defaultdict(int)
+            self._pending_total = 0
+        if not batch:
+            return 0
+
+        db = self.db_session()
+        try:
+            _upsert_increments(db, [{"identifier": identifier,
+                                     "timestamp": datetime.fromtimestamp(start),
+                                     "requests": count}
+                                    for (identifier, start), count in batch.items()])
+
+            now = self._clock()
+            if now >= self._next_sweep:
+                self._next_sweep = now + self.window_seconds
+                purge_expired_rate_limits(db, datetime.fromtimestamp(now) - self.retention)
+            db.commit()
+            return sum(batch.values())
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error("Rate limit flush failed, re-queueing %s rows: %s", len(batch), e)
+            with self._lock:
+                for key, count in batch.items():
+                    self._pending[key] += count
+                    self._pending_total += count
+            return 0
+        finally:
+            db.close()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_needed.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_needed.clear()
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:  # pylint: disable=broad-except
+                # A dead task would let the counts pile up in memory
+                logger.error("Rate limit flush task error, retrying next interval: %s", e)
+
+    async def startup(self) -> None:
+        self._flush_needed = asyncio.Event()
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.flush)
@@ -0,0 +1,69 @@
+"""
+  In-process sliding window rate limiter
+
+  Counters live in a bounded OrderedDict kept in least-recently-seen order,
+  so idle identifiers drift to the front and are dropped first.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from app.core.middleware.limiter.base import RateLimitBackend, RateLimitResult, sliding_window
+
+# Idle entries inspected (and possibly dropped) on every hit
+_EXPIRE_BATCH = 2
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Sliding window counter held in process memory.
+    Each identifier costs one small list: [window_index, current, previous].
+    """
+
+    def __init__(self,
+                 limit: int,
+                 window_seconds: int,
+                 max_identifiers: int = 10000,
+                 clock: Callable[[], float] = time.time):
+        super().__init__(limit, window_seconds)
+        self.max_identifiers = max_identifiers
+        self._clock = clock
+        self._counters: OrderedDict[str, list] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def hit(self, identifier: str) -> RateLimitResult:
+        now = self._clock()
+        with self._lock:
+            entry = self._counters.get(identifier)
+            if entry is None:
+                entry = [int(now // self.window_seconds), 0, 0]
+                self._counters[identifier] = entry
+            else:
+                self._counters.move_to_end(identifier)
+
+            result, entry[0], entry[1], entry[2] = sliding_window(
+                self.limit, self.window_seconds, now, entry[0], entry[1], entry[2]
+            )
+            self._expire(now)
+        return result
+
+    def _expire(self, now: float) -> None:
+        """
+        Drop identifiers that have not been seen for two full windows
+        (their counters no longer matter) and enforce the size bound.
+        """
+        stale_before = int(now // self.window_seconds) - 1
+        for _ in range(_EXPIRE_BATCH):
+            if not self._counters:
+                break
+            oldest = next(iter(self._counters.values()))
+            if oldest[0] >= stale_before:
+                break
+            self._counters.popitem(last=False)
+
+        while len(self._counters) > self.max_identifiers:
+            self._counters.popitem(last=False)
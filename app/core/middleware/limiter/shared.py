@@ -0,0 +1,159 @@
+"""
+  Shared-memory rate limiter
+
+  Counters live in a fixed-size hashed slot table inside an mmap'ed file
+  (under /dev/shm by default), so every uvicorn worker on the host reads
+  and updates the same budget per identifier without touching MySQL.
+
+  File layout:
+  - header: magic (4 bytes), version (u32), slot count (u64)
+  - slots: key hash (u64), window index (i64), current (u32), previous (u32)
+
+  Updates are serialised with flock() across processes and a thread lock
+  inside each process. The file is opened lazily, once per process, and
+  closed on application shutdown. Lookups probe a bounded number of slots; when the
+  whole probe range is taken by live identifiers, the one with the oldest
+  window is recycled, so the table stays fixed-size and fails open.
+"""
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Callable
+
+from app.core.middleware.limiter.base import RateLimitBackend, RateLimitResult, sliding_window
+
+_MAGIC = b"NBRL"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIQ")
+_SLOT = struct.Struct("<QqII")
+_MAX_PROBES = 16
+
+
+def default_shm_path() -> str:
+    """Prefer tmpfs-backed /dev/shm, fall back to the temp directory"""
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "notes_be_rate_limit")
+
+
+def _key_hash(identifier: str) -> int:
+    """64-bit non-zero hash of the identifier (0 marks an empty slot)"""
+    digest = hashlib.blake2b(identifier.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+class SharedMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Sliding window counter stored in a memory-mapped slot table shared by
+    every process that opens the same path.
+    """
+
+    def __init__(self,
+                 limit: int,
+                 window_seconds: int,
+                 path: str = None,
+                 slots: int = 65536,
+                 clock: Callable[[], float] = time.time):
+        super().__init__(limit, window_seconds)
+        self.path = path or default_shm_path()
+        self.slots = slots
+        self._clock = clock
+        self._thread_lock = threading.Lock()
+        self._fd = None
+        self._map = None
+        self._pid = None
+
+    def _open(self) -> None:
+        """
+        Open and map the table for the calling process. The file is opened
+        here rather than at import so that forked workers (e.g. uvicorn
+        --preload) each get their own open file description, which flock()
+        needs to exclude them from one another.
+        """
+        size = _HEADER.size + self.slots * _SLOT.size
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size != size:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+            table = mmap.mmap(fd, size, mmap.MAP_SHARED)
+            magic, version, count = _HEADER.unpack_from(table, 0)
+            if (magic, version, count) != (_MAGIC, _VERSION, self.slots):
+                table[:] = bytes(size)
+                _HEADER.pack_into(table, 0, _MAGIC, _VERSION, self.slots)
+        except Exception:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+            raise
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        self._fd, self._map, self._pid = fd, table, os.getpid()
+
+    def _ensure_open(self) -> None:
+        """(Re)open the table when first used in this process"""
+        if self._pid == os.getpid():
+            return
+        if self._fd is not None:
+            # Inherited from the parent: drop our copies without touching
+            # the parent's lock, then open a description of our own
+            self._map.close()
+            os.close(self._fd)
+        self._fd = self._map = self._pid = None
+        self._open()
+
+    def close(self) -> None:
+        """Unmap the table and close the file (the file itself is kept)"""
+        with self._thread_lock:
+            if self._fd is None:
+                return
+            self._map.close()
+            os.close(self._fd)
+            self._fd = self._map = self._pid = None
+
+    async def shutdown(self) -> None:
+        self.close()
+
+    def hit(self, identifier: str) -> RateLimitResult:
+        key = _key_hash(identifier)
+        now = self._clock()
+        stale_before = int(now // self.window_seconds) - 1
+
+        with self._thread_lock:
+            self._ensure_open()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                offset, window_index, current, previous = self._find_slot(key, stale_before)
+                result, window_index, current, previous = sliding_window(
+                    self.limit, self.window_seconds, now, window_index, current, previous
+                )
+                _SLOT.pack_into(self._map, offset, key, window_index, current, previous)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return result
+
+    def _find_slot(self, key: int, stale_before: int) -> tuple[int, int, int, int]:
+        """
+        Probe the slots following the key's home slot.
+        :return: (offset, window_index, current, previous) of the slot to use,
+                 with zeroed counters when the slot is (re)claimed
+        """
+        home = key % self.slots
+        free = None
+        oldest = None
+        oldest_window = None
+
+        for probe in range(min(_MAX_PROBES, self.slots)):
+            offset = _HEADER.size + ((home + probe) % self.slots) * _SLOT.size
+            slot_key, window_index, current, previous = _SLOT.unpack_from(self._map, offset)
+            if slot_key == key:
+                return offset, window_index, current, previous
+            if free is None and (slot_key == 0 or window_index < stale_before):
+                free = offset
+            if oldest_window is None or window_index < oldest_window:
+                oldest, oldest_window = offset, window_index
+
+        return (free if free is not None else oldest), 0, 0, 0
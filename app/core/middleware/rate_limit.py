@@ -2,99 +2,122 @@
   Custom Rate Limit Middleware
   Provides the rate limiting functionality for API endpoints.
 
-  - Implemented as a Starlette BaseHTTPMiddleware
-  - Every request hits the middleware before reaching the router
+  - Implemented as a plain ASGI middleware (no BaseHTTPMiddleware body
+  streaming); headers are injected on the http.response.start message
+  - Every request hits the middleware before reaching the router, except
+  OPTIONS preflights and the paths listed in RATE_LIMIT_EXEMPT_PATHS
   - Identifier is either user:<username> (from JWT) or ip:<address> for
-  anonymous
-  - Counts are stored in a rate_limits table in MySQL with a time window
+  anonymous; the verified claims are kept on request.state and reused by
+  get_current_user (see app.core.auth.context)
+  - Counts are kept by a pluggable backend (see app.core.middleware.limiter),
+  in process memory by default, in shared memory, or in the rate_limits
+  table in MySQL; backends are started and stopped with the app lifespan
   - Returns HTTP 429 when exceeded, and adds X-RateLimit-Limit,
   X-RateLimit-Remaining, X-RateLimit-Reset headers to every response
 
 """
-from datetime import datetime, timedelta
+from typing import Iterable
 
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
+import jwt
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.responses import JSONResponse
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.core.security import decode_access_token
+from app.core.auth.context import bearer_token, get_token_claims
+from app.core.middleware.limiter import RateLimitBackend, create_rate_limit_backend
 from app.core.settings import settings
-from app.db.models.auth.model import RateLimit
 
 
-def _get_identifier(request: Request, ip: str) -> str:
-    """Extract identifier from request"""
-    auth_header = request.headers.get('Authorization')
-    if auth_header and auth_header.startswith('Bearer '):
+def _get_identifier(scope: Scope, ip: str) -> str:
+    """Extract identifier from request, reusing the request's auth context"""
+    token = bearer_token(Headers(scope=scope))
+    if token:
         try:
-            username = decode_access_token(auth_header.split(' ')[1])
+            username = get_token_claims(scope, token).get("sub")
             return f"user:{username}"
-        except HTTPException:
+        except jwt.PyJWTError:
             return f"ip:{ip}"
     return f"ip:{ip}"
 
 
-def _get_or_create_rate_limit(identifier: str,
-                              now: datetime,
-                              window_start: datetime,
-                              db) -> RateLimit:
-    """Get or create the rate limit record"""
-    rate_limit = db.query(RateLimit).filter(
-        RateLimit.identifier == identifier,
-        RateLimit.timestamp > window_start
-    ).first()
+def _exempt_paths_from_settings() -> tuple[str, ...]:
+    """Parse the comma separated RATE_LIMIT_EXEMPT_PATHS setting"""
+    return tuple(path.strip().rstrip("/")
+                 for path in settings.RATE_LIMIT_EXEMPT_PATHS.split(",")
+                 if path.strip())
 
-    if not rate_limit:
-        rate_limit = RateLimit(
-            identifier=identifier,
-            requests=1,
-            timestamp=now
-        )
-        db.add(rate_limit)
-    else:
-        rate_limit.requests += 1
-        rate_limit.timestamp = now
 
-    return rate_limit
-
-
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """
         Rate Limit Middleware
     """
 
-    def __init__(self, app: ASGIApp, db_session):
-        super().__init__(app)
-        self.rate_limit = int(settings.RATE_LIMIT)
-        self.window = int(settings.RATE_LIMIT_WINDOW)
-        self.db_session = db_session
-
-    async def dispatch(self, request: Request, call_next):
-        db = self.db_session()
-        try:
-            ip = request.client.host
-            identifier = _get_identifier(request, ip)
-
-            now = datetime.now()
-            window_start = now - timedelta(minutes=self.window)
-
-            rate_limit = _get_or_create_rate_limit(identifier, now, window_start, db)
-
-            if rate_limit.requests > self.rate_limit:
-                return JSONResponse(
-                    status_code=429,
-                    content={"detail": "Rate limit exceeded"}
-                )
-
-            db.commit()
-            response = await call_next(request)
-            response.headers["X-RateLimit-Limit"] = str(
-                self.rate_limit)
-            response.headers["X-RateLimit-Remaining"] = str(
-                self.rate_limit - rate_limit.requests)
-            response.headers["X-RateLimit-Reset"] = str(
-                int(window_start.timestamp()))
-            return response
-        finally:
-            db.close()
+    def __init__(self,
+                 app: ASGIApp,
+                 backend: RateLimitBackend = None,
+                 exempt_paths: Iterable[str] = None):
+        self.app = app
+        self.backend = backend if backend is not None else create_rate_limit_backend()
+        self.exempt_paths = (tuple(exempt_paths) if exempt_paths is not None
+                             else _exempt_paths_from_settings())
+
+    def _lifespan_receive(self, receive: Receive) -> Receive:
+        """
+        Start and stop the backend (e.g. its flush task) with the app
+        :param receive: lifespan receive channel
+        :return: wrapped receive channel
+        """
+        async def receive_with_backend() -> Message:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.backend.startup()
+            elif message["type"] == "lifespan.shutdown":
+                await self.backend.shutdown()
+            return message
+
+        return receive_with_backend
+
+    def is_exempt(self, scope: Scope) -> bool:
+        """
+        OPTIONS preflights and exempt path prefixes skip the limiter
+        :param scope: ASGI connection scope
+        :return: bool
+        """
+        if scope["method"] == "OPTIONS":
+            return True
+        path = scope["path"]
+        return any(path == prefix or path.startswith(prefix + "/")
+                   for prefix in self.exempt_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self.app(scope, self._lifespan_receive(receive), send)
+            return
+
+        if scope["type"] != "http" or self.is_exempt(scope):
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        ip = client[0] if client else "unknown"
+        identifier = _get_identifier(scope, ip)
+
+        result = self.backend.hit(identifier)
+
+        if not result.allowed:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Rate limit exceeded"}
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = str(result.limit)
+                headers["X-RateLimit-Remaining"] = str(result.remaining)
+                headers["X-RateLimit-Reset"] = str(result.reset)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -26,6 +26,16 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     return encoded_jwt
 
 
+def decode_token_claims(token: str) -> dict:
+    """
+    Verify a JWT and return all of its claims
+    :param token:
+    :return: claims dict
+    :raises jwt.PyJWTError: when the token is expired or invalid
+    """
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+
 def decode_access_token(token: str):
     """
     Decode a JWT access token
@@ -33,8 +43,7 @@ def decode_access_token(token: str):
     :return: jwt.decode() -> str
     """
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload.get("sub")
+        return decode_token_claims(token).get("sub")
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401,
                             detail="Token expired") from None
@@ -23,6 +23,14 @@ class Settings(BaseSettings):
     GOOGLE_SECRET_KEY: str = ""
     RATE_LIMIT: int = 1000
     RATE_LIMIT_WINDOW: int = 60
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_MAX_IDENTIFIERS: int = 10000
+    RATE_LIMIT_SHM_PATH: str = ""
+    RATE_LIMIT_SHM_SLOTS: int = 65536
+    RATE_LIMIT_FLUSH_INTERVAL: float = 5.0
+    RATE_LIMIT_MAX_DRIFT: int = 500
+    RATE_LIMIT_RETENTION_HOURS: int = 24
+    RATE_LIMIT_EXEMPT_PATHS: str = "/static,/healthcheck,/docs,/redoc,/openapi.json"
     MAIL_USERNAME: str = ""
     MAIL_PASSWORD: str = ""
     MAIL_FROM: str = ""
@@ -34,8 +42,26 @@ class Settings(BaseSettings):
     TOKEN_REFRESH_MINUTES: str = "60"
     TOKEN_REFRESH_EXPIRES_MINUTES: str = "1440"
     TOKEN_REFRESH_EXPIRES_SECONDS: str = ""
+    TOKEN_CACHE_TTL: int = 60
+    TOKEN_CACHE_MAXSIZE: int = 4096
+    REVOCATION_SYNC_SECONDS: int = 30
+    PRINCIPAL_CACHE_TTL: int = 60
+    PRINCIPAL_CACHE_MAXSIZE: int = 4096
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 4
+    BCRYPT_ROUNDS: int = 12
 
-    CACHE_CONFIG: ClassVar[dict] = {"MAXSIZE": 128, "TTL": 300}
+    CACHE_CONFIG: ClassVar[dict] = {"MAXSIZE": 128, "TTL": 300, "STALE_TTL": 60}
+    CACHE_BACKEND: str = "memory"
+    REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_L1_MAXSIZE: int = 256
+    CACHE_L1_TTL: float = 5.0
+    NOTE_INDEX_PATH: str = ""
+    NOTE_INDEX_SYNC_SECONDS: int = 30
+    NOTE_INDEX_PRUNE_SECONDS: int = 600
+    NOTE_TRIGRAM_INDEX: bool = True
+    NOTE_TRIGRAM_MAX_NOTES: int = 200000
+    NOTE_SEARCH_MAX_RESULTS: int = 500
 
     @model_validator(mode='after')
     def compute_token_seconds(self) -> 'Settings':
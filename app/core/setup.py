@@ -5,6 +5,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core import settings
+from app.core.middleware.limiter import create_rate_limit_backend
 from app.core.middleware.rate_limit import RateLimitMiddleware
 from app.db.mysql import SessionLocal
 
@@ -40,7 +41,7 @@ def create_app() -> FastAPI:
 
     app.add_middleware(
         RateLimitMiddleware,  # type: ignore
-        db_session=SessionLocal
+        backend=create_rate_limit_backend(settings.RATE_LIMIT_BACKEND, SessionLocal)
     )
 
     return app
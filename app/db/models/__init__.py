@@ -4,5 +4,5 @@ Export models for alembic
 from app.db.models.base import Base
 from app.db.models.audit.model import Audit
 from app.db.models.user.model import User
-from app.db.models.notes.model import Note
+from app.db.models.notes.model import Note, NoteTag
 from app.db.models.auth.model import RateLimit, RevokedToken
@@ -3,7 +3,7 @@ AuditLog Model
 """
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from app.db.models.base import Base
@@ -14,6 +14,11 @@ class Audit(Base):
     AuditLog Class
     """
     __tablename__ = "audit"
+    # Backoffice reads the log newest first, globally or for one user
+    __table_args__ = (
+        Index("ix_audit_timestamp", "timestamp"),
+        Index("ix_audit_user_id_timestamp", "user_id", "timestamp"),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(String(36), ForeignKey('users.id'), nullable=False)
@@ -3,16 +3,20 @@
 """
 from datetime import datetime
 
-from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy import Column, String, Integer, DateTime, UniqueConstraint
 
 from app.db.models.base import Base
 
 
 class RateLimit(Base):
     """
-    Rate Limit Model
+    Rate Limit Model: one row per identifier and window start
     """
     __tablename__ = "rate_limits"
+    __table_args__ = (
+        # Concurrent write-behind flushes upsert into the same window row
+        UniqueConstraint("identifier", "timestamp", name="uq_rate_limits_identifier_timestamp"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     identifier = Column(String(255), index=True)  # IP or user_id
@@ -30,4 +34,4 @@ class RevokedToken(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     jti = Column(String(36), unique=True, nullable=False, index=True)
     expires_at = Column(DateTime, nullable=False)
-    revoked_at = Column(DateTime, nullable=False, default=datetime.now)
+    revoked_at = Column(DateTime, nullable=False, default=datetime.now, index=True)
@@ -1,17 +1,33 @@
 """
-Notes model
+Notes model: Note and its NoteTag index rows
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean
+from sqlalchemy import (Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean,
+                        Index)
 from sqlalchemy.orm import relationship
 
 from app.db.models.base import Base
 
+TAG_MAX_LENGTH = 50
+
 
 class Note(Base):
     """
     Note Class
     """
     __tablename__ = 'notes'
+    # Listings filter on the owner or on is_public and sort on (created_at | updated_at, id),
+    # see app/repositories/note/cursor.py
+    __table_args__ = (
+        Index("ix_notes_user_id_created_at", "user_id", "created_at", "id"),
+        Index("ix_notes_user_id_updated_at", "user_id", "updated_at", "id"),
+        Index("ix_notes_is_public_created_at", "is_public", "created_at", "id"),
+        Index("ix_notes_is_public_updated_at", "is_public", "updated_at", "id"),
+        # Incremental sync of the in-process search index (search/bm25.py)
+        Index("ix_notes_updated_at", "updated_at"),
+        # MATCH ... AGAINST for the natural / boolean search modes (MySQL only)
+        Index("ft_notes_title_content", "title", "content",
+              mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(String(36), ForeignKey('users.id'), nullable=False)
@@ -24,6 +40,29 @@ class Note(Base):
     image_url = Column(String(255), nullable=True)
 
     user = relationship("User", back_populates="notes")
+    # Normalized copy of tags, see NoteTag
+    tag_rows = relationship("NoteTag", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Note {self.title}>"
+
+
+class NoteTag(Base):
+    """
+    One row per tag of a note, mirroring notes.tags so that tag filters and
+    facet counts read an index instead of scanning the JSON column.
+    user_id is the note owner, copied here so one user's tags are a range
+    of ix_note_tags_user_id_tag. NoteManager keeps the rows in sync.
+    """
+    __tablename__ = 'note_tags'
+    __table_args__ = (
+        Index("ix_note_tags_tag", "tag"),
+        Index("ix_note_tags_user_id_tag", "user_id", "tag"),
+    )
+
+    note_id = Column(Integer, ForeignKey('notes.id', ondelete="CASCADE"), primary_key=True)
+    tag = Column(String(TAG_MAX_LENGTH), primary_key=True)
+    user_id = Column(String(36), nullable=False)
+
+    def __repr__(self):
+        return f"<NoteTag {self.note_id} {self.tag}>"
@@ -4,10 +4,10 @@ Users Model
 import uuid
 from datetime import datetime
 
-import bcrypt
 from sqlalchemy import Column, String, DateTime
 from sqlalchemy.orm import relationship
 
+from app.core.auth.passwords import password_hasher
 from app.db.models.base import Base
 
 
@@ -31,19 +31,17 @@ class User(Base):
 
     def verify_password(self, plain_password: str) -> bool:
         """
-        Verify password
+        Verify password on the password hashing pool
         :param plain_password:
         :return: bool
         """
-        return bcrypt.checkpw(plain_password.encode(), self.hashed_password.encode())
+        return password_hasher.verify_sync(plain_password, self.hashed_password)
 
     def set_password(self, plain_password: str):
         """
-        Set password
+        Set password, hashed on the password hashing pool
         :param plain_password:
         :return: str
         """
-        salt = bcrypt.gensalt()
-        hashed_password = bcrypt.hashpw(plain_password.encode(), salt)
-        self.hashed_password = hashed_password.decode()
+        self.hashed_password = password_hasher.hash_sync(plain_password)
         return self.hashed_password
@@ -2,14 +2,17 @@
 Dependency Utils
 """
 import jwt
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy import create_engine
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker, Session
 
+from app.core.auth.context import get_token_claims
+from app.core.auth.principal import Principal
+from app.core.auth.principal_cache import principal_cache
+from app.core.auth.revocation import revocation_set
 from app.core.settings import settings
-from app.db.models.auth.model import RevokedToken
 from app.db.models.user.model import User
 from app.repositories.logger.repository import LoggerService
 
@@ -47,29 +50,42 @@ def get_db():
         db.close()
 
 
-def get_current_user(token: str = Depends(oauth2_scheme),
-                     db: Session = Depends(get_db)):
+def get_current_user(request: Request,
+                     token: str = Depends(oauth2_scheme),
+                     db: Session = Depends(get_db)) -> Principal:
     """
     Get Current User in Session
+    The token is verified once per request; claims already decoded by the
+    rate limiter are reused from request.state. Revocation is checked against
+    the in-process revocation set (see app.core.auth.revocation) and the user
+    comes from the principal cache (see app.core.auth.principal_cache), so
+    repeat calls issue no query at all. Only the principal's columns are
+    selected, no ORM User is built.
+    :param request:
     :param token:
     :param db:
-    :return: User
+    :return: Principal
     """
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = get_token_claims(request.scope, token)
         user_id: str = payload.get("sub")
         jti: str = payload.get("jti")
 
-        if jti and db.query(RevokedToken).filter(RevokedToken.jti == jti).first():
+        if jti and revocation_set.is_revoked(db, jti):
             raise HTTPException(status_code=401, detail="Token has been revoked")
 
-        user = db.query(User).filter(User.id == user_id).first()
+        principal = principal_cache.get(user_id)
+        if principal is not None:
+            return principal
 
-        if user is None:
+        row = db.query(User.id, User.username, User.email,
+                       User.role, User.picture_url).filter(User.id == user_id).first()
+
+        if row is None:
             raise HTTPException(status_code=401,
                                 detail="Invalid authentication credentials")
 
-        return user
+        return principal_cache.store(Principal.from_user(row))
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401,
                             detail="Token has expired") from None
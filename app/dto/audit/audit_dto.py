@@ -5,22 +5,38 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+from app.dto.user.user_dto import UserDTO
 
-@dataclass
+# Keys of an audit row read into its user
+USER_KEYS = ("username", "email", "role")
+
+
+@dataclass(slots=True)
 class AuditDTO:
     """
-    Represents a Data Transfer Object for an audit log entry.
+    Represents a Data Transfer Object for an audit log entry, built from a
+    row of selected columns (from_row) with its user as a UserDTO.
     """
     id: int
-    user_id: str
-    action: str
-    description: Optional[str]
-    timestamp: datetime
+    user_id: Optional[str] = None
+    action: Optional[str] = None
+    description: Optional[str] = None
+    timestamp: Optional[datetime] = None
+    user: Optional[UserDTO] = None
+
+    @classmethod
+    def from_row(cls, row) -> "AuditDTO":
+        """
+        Builds an AuditDTO from a result row of audit and user columns.
+        """
+        values = row._asdict()
+        values["user"] = UserDTO(**{key: values.pop(key) for key in USER_KEYS})
+        return cls(**values)
 
     @staticmethod
     def from_model(audit) -> dict:
         """
-        Convert an audit model instance into a dictionary representation.
+        Convert an audit model instance or AuditDTO into a dictionary representation.
         """
         return {
             "id": audit.id,
@@ -3,10 +3,45 @@
 """
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import Callable, List, Optional
 
+from app.dto.user.user_dto import UserDTO
 
-@dataclass
+SNIPPET_LENGTH = 160
+EXCERPT_LENGTH = 200
+# Keys of a note row read into its user (the author)
+USER_KEYS = ("username", "email", "role", "picture_url")
+
+
+def _user(note) -> dict:
+    return {
+        "username": note.user.username,
+        "email": note.user.email,
+        "role": note.user.role,
+        "picture_url": note.user.picture_url
+    }
+
+
+# Field name -> value of a note, in response order. from_model reads only the
+# requested ones, so columns a listing did not load are never touched.
+NOTE_FIELDS: dict[str, Callable] = {
+    "id": lambda note: note.id,
+    "title": lambda note: note.title,
+    "content": lambda note: note.content,
+    "excerpt": lambda note: note.excerpt,
+    "created_at": lambda note: note.created_at.isoformat(),
+    "updated_at": lambda note: note.updated_at.isoformat(),
+    "is_public": lambda note: note.is_public,
+    "tags": lambda note: note.tags if note.tags else [],
+    "image_url": lambda note: note.image_url,
+    "user": _user,
+    "author": lambda note: note.user.username,
+}
+DEFAULT_FIELDS = ("id", "title", "content", "created_at", "updated_at", "is_public",
+                  "tags", "image_url", "user")
+
+
+@dataclass(slots=True)
 class NoteDTO:
     """
     Represents a Data Transfer Object (DTO) for a note.
@@ -18,6 +53,9 @@ class NoteDTO:
     It also provides utilities to transform a note model into a dictionary
     representation for serialization purposes and to construct paginated
     responses of note data.
+    The listings build NoteDTOs straight from rows of selected columns
+    (from_row) instead of loading Note models; columns a sparse fieldset did
+    not select stay None, and the author is a UserDTO.
 
     Attributes:
         id (int): Unique identifier of the note.
@@ -29,22 +67,45 @@ class NoteDTO:
         is_public (bool): Indicates whether the note is publicly accessible.
         tags (List[str]): List of tags associated with the note.
         image_url (Optional[str]): URL of an image associated with the note.
+        excerpt (Optional[str]): Beginning of the content, when selected.
+        user (Optional[UserDTO]): The author, when selected.
 
     """
     id: int
-    user_id: int
-    title: str
-    content: str
-    created_at: datetime
-    updated_at: datetime
-    is_public: bool
-    tags: List[str]
-    image_url: Optional[str]
+    user_id: Optional[str] = None
+    title: Optional[str] = None
+    content: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    is_public: Optional[bool] = None
+    tags: Optional[List[str]] = None
+    image_url: Optional[str] = None
+    excerpt: Optional[str] = None
+    user: Optional[UserDTO] = None
+
+    @classmethod
+    def from_row(cls, row) -> "NoteDTO":
+        """
+        Builds a NoteDTO from a result row of note columns, plus the author's
+        columns (USER_KEYS) when selected.
+
+        Args:
+            row: A Row whose keys are NoteDTO or UserDTO attribute names.
+
+        Returns:
+            The NoteDTO.
+        """
+        values = row._asdict()
+        if "username" in values:
+            values["user"] = UserDTO(**{key: values.pop(key)
+                                        for key in USER_KEYS if key in values})
+        return cls(**values)
 
     @staticmethod
-    def from_model(note) -> dict:
+    def from_model(note, fields: Optional[tuple[str, ...]] = None,
+                   excerpt_length: int = EXCERPT_LENGTH) -> dict:
         """
-            Convert a note model instance into a dictionary representation.
+            Convert a note model instance or NoteDTO into a dictionary representation.
 
             This static method takes a Note object, extracts its fields, and returns
             a dictionary containing key attributes.
@@ -56,30 +117,92 @@ class NoteDTO:
                 note: An instance of a note model with attributes such as `id`,
                       `title`, `content`, `created_at`, `updated_at`, `is_public`,
                       `tags`, `image_url`, and `user`.
+                fields: Keys of NOTE_FIELDS to return, DEFAULT_FIELDS when None.
+                        `excerpt` reads the note's excerpt expression, loaded
+                        by the query with up to excerpt_length + 1 characters.
+                excerpt_length: Length the excerpt is cut to, with an ellipsis.
 
             Returns:
                 A dictionary containing keys `id`, `title`, `content`, `created_at`,
-                `updated_at`, `is_public`, `tags`, `image_url`, and `user`.
+                `updated_at`, `is_public`, `tags`, `image_url`, and `user`, or only
+                the requested fields.
                 The `user`
                 key maps to another dictionary with user's `username`, `email`, `role`,
                 and `picture_url`.
         """
-        return {
-            "id": note.id,
-            "title": note.title,
-            "content": note.content,
-            "created_at": note.created_at.isoformat(),
-            "updated_at": note.updated_at.isoformat(),
-            "is_public": note.is_public,
-            "tags": note.tags if note.tags else [],
-            "image_url": note.image_url,
-            "user": {
-                "username": note.user.username,
-                "email": note.user.email,
-                "role": note.user.role,
-                "picture_url": note.user.picture_url
-            }
-        }
+        item = {field: NOTE_FIELDS[field](note) for field in fields or DEFAULT_FIELDS}
+        if "excerpt" in item:
+            item["excerpt"] = NoteDTO.trim_excerpt(item["excerpt"], excerpt_length)
+        return item
+
+    @staticmethod
+    def resolve_fields(fields: Optional[str],
+                       excerpt_length: Optional[int] = None) -> Optional[tuple[str, ...]]:
+        """
+        Fields of a sparse fieldset request.
+
+        Args:
+            fields: Comma separated keys of NOTE_FIELDS, None for the defaults.
+            excerpt_length: When set, the excerpt field is added.
+
+        Returns:
+            The field names with id first, or None for DEFAULT_FIELDS.
+        """
+        if fields is None and excerpt_length is None:
+            return None
+        names = [name.strip() for name in fields.split(",")] if fields else list(DEFAULT_FIELDS)
+        if excerpt_length is not None:
+            names.append("excerpt")
+        unknown = set(names) - NOTE_FIELDS.keys()
+        if unknown:
+            raise ValueError(f"Unknown note fields: {', '.join(sorted(unknown))}")
+        return tuple(dict.fromkeys(["id", *names]))
+
+    @staticmethod
+    def trim_excerpt(text: Optional[str], length: int = EXCERPT_LENGTH) -> str:
+        """
+        First length characters of a note content, with an ellipsis when cut.
+
+        Args:
+            text: Beginning of the content, one character longer than length
+                  when there is more.
+            length: Maximum number of characters kept.
+
+        Returns:
+            The excerpt.
+        """
+        text = text or ""
+        if len(text) <= length:
+            return text
+        return text[:length].rstrip() + "…"
+
+    @staticmethod
+    def snippet(content: str, search_query: str, length: int = SNIPPET_LENGTH) -> str:
+        """
+        Excerpt of content around the first match of search_query, or of its
+        earliest matching word, or the beginning when nothing matches.
+
+        Args:
+            content: The full note content.
+            search_query: The free text that was searched for.
+            length: Maximum number of characters kept, ellipses excluded.
+
+        Returns:
+            The excerpt, with an ellipsis where content was cut.
+        """
+        content = content or ""
+        if len(content) <= length:
+            return content
+        lowered = content.lower()
+        phrase = lowered.find(search_query.lower()) if search_query.strip() else -1
+        words = [position for position in (lowered.find(word.lower())
+                                           for word in search_query.split()) if position >= 0]
+        match = phrase if phrase >= 0 else min(words, default=0)
+        start = max(0, match - length // 3)
+        end = min(len(content), start + length)
+        start = max(0, end - length)
+        return (("…" if start else "") + content[start:end].strip()
+                + ("…" if end < len(content) else ""))
 
     @staticmethod
     def paginated_response(notes,
@@ -88,7 +211,12 @@ class NoteDTO:
                            search_query: str,
                            total: int,
                            sort_by: str,
-                           sort_order: str) -> dict:
+                           sort_order: str,
+                           next_cursor: Optional[str] = None,
+                           total_is_estimate: bool = False,
+                           snippet_of: Optional[str] = None,
+                           fields: Optional[tuple[str, ...]] = None,
+                           excerpt_length: int = EXCERPT_LENGTH) -> dict:
         """
         Constructs a paginated response dictionary from the provided notes and pagination
         parameters. It includes metadata such as the current page, page size, total number
@@ -103,14 +231,25 @@ class NoteDTO:
             total: The total number of notes available.
             sort_by: A string indicating the attribute by which results are sorted.
             sort_order: A string indicating the order of sorting, such as 'asc' or 'desc'.
+            next_cursor: Opaque keyset cursor of the next page, None on the last page.
+            total_is_estimate: Whether total was served from the count cache rather
+                than counted for this request.
+            snippet_of: When given, each item carries a snippet of its content
+                around this text instead of the content itself.
+            fields: Keys of each item, see from_model.
+            excerpt_length: Length of the `excerpt` field, when requested.
 
         returns:
             A dictionary containing the paginated response, which includes the list of
             items, pagination metadata like current page, page size, total number of
             pages, and boolean indicators for the presence of next and previous pages.
         """
+        items = [NoteDTO.from_model(note, fields, excerpt_length) for note in notes]
+        if snippet_of is not None:
+            for item in items:
+                item["snippet"] = NoteDTO.snippet(item.pop("content"), snippet_of)
         return {
-            "items": [NoteDTO.from_model(note) for note in notes],
+            "items": items,
             "total": total,
             "page": page,
             "page_size": page_size,
@@ -119,5 +258,7 @@ class NoteDTO:
             "has_prev": page > 1,
             "search_query": search_query,
             "sort_by": sort_by,
-            "sort_order": sort_order
+            "sort_order": sort_order,
+            "next_cursor": next_cursor,
+            "total_is_estimate": total_is_estimate
         }
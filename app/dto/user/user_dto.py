@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class UserDTO:
     """
     Represents a Data Transfer Object (DTO) for user information.
@@ -17,7 +17,9 @@ class UserDTO:
     It contains user-related information such as user ID, username,
     email, role, picture URL, and timestamps for creation and last update.
     The
-    UserDTO can be populated from a user model using its static method.
+    UserDTO can be populated from a user model using its static method, or
+    built straight from a row of selected columns (from_row) by the read
+    paths, which skip the ORM; columns that were not selected stay None.
 
     Attributes:
         id: Unique identifier for the user.
@@ -44,13 +46,26 @@ class UserDTO:
         This includes converting
         datetime objects to ISO formatted strings.
     """
-    id: int
-    username: str
-    email: str
-    role: str
-    picture_url: Optional[str]
-    created_at: datetime
-    updated_at: datetime
+    id: Optional[str] = None
+    username: Optional[str] = None
+    email: Optional[str] = None
+    role: Optional[str] = None
+    picture_url: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_row(cls, row) -> "UserDTO":
+        """
+        Builds a UserDTO from a result row of user columns.
+
+        Args:
+            row: A Row whose keys are UserDTO attribute names.
+
+        Returns:
+            The UserDTO, with None for the columns that were not selected.
+        """
+        return cls(**row._asdict())
 
     @staticmethod
     def from_model(user) -> dict:
@@ -74,6 +74,14 @@ class CommonService:
                         (User.email == username))
                 .first())
 
+    def load_user(self, principal):
+        """
+        Load the ORM user behind a principal, for code paths that mutate it
+        :param principal:
+        :return: User object or None
+        """
+        return self.db.get(User, principal.id)
+
     def log_action(self, user_id, action, description):
         """
         Log action
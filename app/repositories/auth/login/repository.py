@@ -7,6 +7,8 @@ from typing import Optional
 import jwt
 from sqlalchemy.orm import Session
 
+from app.core.auth.revocation import revocation_set
+from app.core.auth.token_cache import token_cache
 from app.core.exceptions.auth import AuthErrorHandler
 from app.core.security import generate_user_token_and_return_user
 from app.core.settings import settings
@@ -68,7 +70,8 @@ class LoginManager:
 
     def logout(self, token: str) -> dict:
         """
-        Revoke a JWT by storing its jti in the blacklist.
+        Revoke a JWT by storing its jti in the blacklist and in the local
+        revocation set, and evicting it from the token cache.
         Also purges any already-expired rows to keep the table lean.
         :param token: raw Bearer token string
         :return: confirmation message
@@ -88,7 +91,9 @@ class LoginManager:
                     RevokedToken.expires_at < datetime.now()
                 ).delete()
                 self.db.commit()
+                revocation_set.add(jti, expires_at)
 
+            token_cache.evict(token)
             return {"message": "Logged out successfully"}
         except jwt.PyJWTError:
             return AuthErrorHandler.raise_invalid_token()
@@ -7,6 +7,9 @@ import requests
 from sqlalchemy.exc import DBAPIError, SQLAlchemyError
 
 from app.core import generate_user_token
+from app.core.auth.passwords import password_hasher
+from app.core.auth.principal_cache import principal_cache
+from app.core.cache import invalidate_notes
 from app.core.exceptions.auth import AuthErrorHandler
 from app.core.exceptions.generic import GlobalErrorHandler
 from app.db.models import User
@@ -79,6 +82,8 @@ def get_user_info(db, request):
     if not user.picture_url:
         user.picture_url = user_from_google['picurl']
         db.commit()
+        principal_cache.invalidate(user.id)
+        invalidate_notes(user.id, public=True)
         db.refresh(user)
 
     request = TokenRequest(username=user_from_google['name'])
@@ -117,7 +122,7 @@ async def add_user_to_db(db, request, background_tasks):
                 username=user_from_google['name'],
                 picture_url=user_from_google['picurl'],
             )
-            user.set_password(temp_password)
+            user.hashed_password = await password_hasher.hash(temp_password)
             db.add(user)
             db.commit()
             db.refresh(user)
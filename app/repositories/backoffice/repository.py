@@ -3,19 +3,27 @@ Backoffice Manager
 """
 from typing import Optional
 
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 
+from app.core.auth.principal import Principal
 from app.core.exceptions.user import UserErrorHandler
 from app.db.models import Note, User, Audit
-from app.dto.audit.audit_dto import AuditDTO
-from app.dto.note.note_dto import NoteDTO
+from app.dto.audit.audit_dto import USER_KEYS as AUDIT_USER_KEYS, AuditDTO
+from app.dto.note.note_dto import EXCERPT_LENGTH, NoteDTO
 from app.dto.user.user_dto import UserDTO
 from app.repositories.auth.common.services import CommonService
 from app.repositories.logger.repository import LoggerService
+from app.repositories.note.repository import note_columns
+from app.repositories.user.repository import USER_COLUMNS
 
 logger = LoggerService().logger
 
+# Columns read into AuditDTO, without loading the models
+AUDIT_COLUMNS = (Audit.id, Audit.user_id, Audit.action, Audit.description, Audit.timestamp,
+                 *(getattr(User, key) for key in AUDIT_USER_KEYS))
+
 
 class BackofficeManager:
     """
@@ -25,13 +33,13 @@ class BackofficeManager:
     def __init__(self, db: Session):
         self.db = db
 
-    def _check_admin(self, current_user: User) -> None:
+    def _check_admin(self, current_user: Principal) -> None:
         """Verify current user has ADMIN role."""
         if current_user.role != "ADMIN":
             UserErrorHandler.raise_unauthorized_user_action()
 
     def get_all_users(self,
-                      current_user: User,
+                      current_user: Principal,
                       page: int = 1,
                       page_size: int = 10) -> Optional[dict]:
         """Get paginated list of all users (admin only)."""
@@ -39,7 +47,8 @@ class BackofficeManager:
             self._check_admin(current_user)
             skip = (page - 1) * page_size
             total = self.db.query(User).count()
-            users = self.db.query(User).offset(skip).limit(page_size).all()
+            users = [UserDTO.from_row(row) for row in
+                     self.db.execute(select(*USER_COLUMNS).offset(skip).limit(page_size))]
 
             CommonService(self.db).log_action(
                 user_id=current_user.id,
@@ -48,7 +57,7 @@ class BackofficeManager:
             )
 
             return {
-                "items": [UserDTO.from_model(u) for u in users],
+                "items": users,
                 "total": total,
                 "page": page,
                 "page_size": page_size,
@@ -62,16 +71,22 @@ class BackofficeManager:
         return None
 
     def get_all_notes(self,
-                      current_user: User,
+                      current_user: Principal,
                       page: int = 1,
-                      page_size: int = 10) -> Optional[dict]:
-        """Get paginated list of all notes (admin only)."""
+                      page_size: int = 10,
+                      fields: Optional[str] = None,
+                      excerpt_length: Optional[int] = None) -> Optional[dict]:
+        """Get paginated list of all notes (admin only), optionally a sparse fieldset."""
         try:
             self._check_admin(current_user)
             skip = (page - 1) * page_size
-            query = self.db.query(Note).options(joinedload(Note.user))
-            total = query.count()
-            notes = query.offset(skip).limit(page_size).all()
+            selected = NoteDTO.resolve_fields(fields, excerpt_length)
+            excerpt_length = excerpt_length or EXCERPT_LENGTH
+            total = self.db.query(Note).count()
+            rows = self.db.execute(select(*note_columns(selected, excerpt_length))
+                                   .select_from(Note).join(User)
+                                   .offset(skip).limit(page_size))
+            notes = [NoteDTO.from_row(row) for row in rows]
 
             CommonService(self.db).log_action(
                 user_id=current_user.id,
@@ -80,7 +95,8 @@ class BackofficeManager:
             )
 
             return NoteDTO.paginated_response(
-                notes, page, page_size, "", total, "created_at", "desc"
+                notes, page, page_size, "", total, "created_at", "desc",
+                fields=selected, excerpt_length=excerpt_length
             )
         except SQLAlchemyError as e:
             logger.error("Database error in backoffice get_all_notes: %s", e)
@@ -88,17 +104,18 @@ class BackofficeManager:
         return None
 
     def get_audit_logs(self,
-                       current_user: User,
+                       current_user: Principal,
                        page: int = 1,
                        page_size: int = 10) -> Optional[dict]:
         """Get paginated list of audit logs (admin only)."""
         try:
             self._check_admin(current_user)
             skip = (page - 1) * page_size
-            query = self.db.query(Audit).options(joinedload(Audit.user))
-            total = query.count()
-            audits = (query.order_by(Audit.timestamp.desc())
-                      .offset(skip).limit(page_size).all())
+            total = self.db.query(Audit).count()
+            rows = self.db.execute(select(*AUDIT_COLUMNS).join(User, Audit.user)
+                                   .order_by(Audit.timestamp.desc())
+                                   .offset(skip).limit(page_size))
+            audits = [AuditDTO.from_row(row) for row in rows]
 
             CommonService(self.db).log_action(
                 user_id=current_user.id,
@@ -1,14 +1,16 @@
 """
  Cache Repository
 """
-from functools import lru_cache
-from typing import Any
+from typing import Any, Callable, Optional
 
-from app.core import settings
+from sqlalchemy.orm import Session
+
+from app.core.cache import PUBLIC_NOTES, note_cache, user_notes
 from app.repositories.audit.repository import log_audit_event
 from app.repositories.auth.common.services import CommonService
 from app.repositories.logger.repository import LoggerService
 from app.repositories.note.repository import NoteManager
+from app.repositories.note.search.modes import SUBSTRING
 
 logger = LoggerService().logger
 
@@ -19,26 +21,44 @@ class CacheRepository:
 
     The CacheRepository class serves as a bridge between the application's caching layer and
     the database layer. It provides methods for accessing public and paginated notes with caching
-    enabled, to enhance performance by reducing the need for repeated database queries. The class
-    uses the least recently used (LRU) caching strategy to manage cache size and maintains an
-    audit trail of actions performed by users interacting with the cached data.
+    enabled, to enhance performance by reducing the need for repeated database queries. Results
+    live in note_cache (app.core.cache): a TTL + LRU cache keyed by the listing parameters and
+    scoped per user (private listings) or to the public feed. NoteManager invalidates a scope
+    in O(1) whenever one of its notes changes. Concurrent misses on a key run the query once,
+    and entries past their TTL are served while a background refresh on a separate session
+    renews them without auditing: only the request itself is audited, and cache hits keep
+    an audit trail of the action.
     """
     def __init__(self, db):
         self.db = db
 
+    def _detached(self, fn: Callable[[Session], Any]) -> Callable[[], Any]:
+        """
+        Wrap fn(db) to run later on its own session, for background refreshes
+        that outlive the request session
+        """
+        def run():
+            with Session(bind=self.db.get_bind()) as db:
+                return fn(db)
+        return run
+
     def _log_action(self, user_id, action, description):
         logger.info("User %s %s %s", user_id, action, description)
         log_audit_event(self.db, user_id=user_id, action=action, description=description)
 
-    @lru_cache(maxsize=settings.CACHE_CONFIG["MAXSIZE"])
     def get_public_notes(self, current_user, page: int, page_size: int,
-                         search_query: str, sort_by: str, sort_order: str = 'desc') -> Any:
+                         search_query: str, sort_by: str, sort_order: str = 'desc',
+                         cursor: Optional[str] = None, include_total: bool = False,
+                         search_mode: str = SUBSTRING, tag: Optional[str] = None,
+                         fields: Optional[str] = None,
+                         excerpt_length: Optional[int] = None) -> Any:
         """
         Retrieves public notes from cache or database storage.
 
         This function leverages caching to retrieve public notes efficiently. It accepts
         parameters for pagination and searching, and returns a list of public notes.
-        It also logs the action of fetching data from the cache.
+        The feed is the same for every user, so it is cached once for all of them.
+        Cache hits are logged as fetches from the cache.
 
         Args:
             current_user (Any): The current logged-in user requiring access to public notes.
@@ -48,27 +68,46 @@ class CacheRepository:
             sort_by (str): The field by which the notes are sorted.
             sort_order (str, optional): Indicates the sorting direction, either 'asc'
                                         or 'desc'. Defaults to 'desc'.
+            cursor (str, optional): Keyset cursor of the page to read, overriding page.
+            include_total (bool, optional): Count the total exactly for this request.
+            search_mode (str, optional): substring, or natural / boolean full-text search.
+            tag (str, optional): Only notes carrying this tag.
+            fields (str, optional): Comma separated keys of each item.
+            excerpt_length (int, optional): Length of the excerpt field, when added.
 
         Returns:
             Any: A list of notes retrieved based on the specified parameters.
         """
-        CommonService(self.db).log_action(
-            user_id=current_user.id,
-            action='Fetch from cache',
-            description='Get Public Notes from Cache'
-        )
-        return NoteManager(self.db).get_explore_notes(
-            current_user, page, page_size, search_query, sort_by, sort_order
+        key = (page, page_size, search_query, sort_by, sort_order, cursor, include_total,
+               search_mode, tag, fields, excerpt_length)
+        result, cached = note_cache.get_or_compute(
+            PUBLIC_NOTES, key,
+            lambda: NoteManager(self.db).get_explore_notes(
+                current_user, page, page_size, search_query, sort_by, sort_order, cursor,
+                include_total, search_mode, tag, fields, excerpt_length),
+            self._detached(lambda db: NoteManager(db).get_explore_notes(
+                current_user, page, page_size, search_query, sort_by, sort_order, cursor,
+                include_total, search_mode, tag, fields, excerpt_length, audit=False)),
         )
+        if cached:
+            CommonService(self.db).log_action(
+                user_id=current_user.id,
+                action='Fetch from cache',
+                description='Get Public Notes from Cache'
+            )
+        return result
 
-    @lru_cache(maxsize=settings.CACHE_CONFIG["MAXSIZE"])
     def get_note_paginated(self, current_user, page: int, page_size: int,
-                           search_query: str, sort_by: str, sort_order: str = 'desc') -> Any:
+                           search_query: str, sort_by: str, sort_order: str = 'desc',
+                           cursor: Optional[str] = None, include_total: bool = False,
+                           search_mode: str = SUBSTRING, tag: Optional[str] = None,
+                           fields: Optional[str] = None,
+                           excerpt_length: Optional[int] = None) -> Any:
         """
         A method to retrieve paginated notes, utilizing caching for enhanced
         performance to prevent repetitive database queries. It accepts
         various parameters to customize pagination, filtering, and sorting.
-        Logs the action of fetching notes using a common service.
+        Results are cached per user; cache hits are logged using a common service.
 
         Parameters:
             current_user
@@ -85,16 +124,65 @@ class CacheRepository:
             sort_order: str
                 Sort order for the notes. Possible values are 'asc' for ascending
                 and 'desc' for descending. Defaults to 'desc'.
+            cursor: Optional[str]
+                Keyset cursor of the page to read, overriding page.
+            include_total: bool
+                Count the total exactly for this request.
+            search_mode: str
+                substring, or natural / boolean full-text search.
+            tag: Optional[str]
+                Only notes carrying this tag.
+            fields: Optional[str]
+                Comma separated keys of each item.
+            excerpt_length: Optional[int]
+                Length of the excerpt field, when added.
 
         Returns:
             Any
                 The paginated list of notes along with relevant metadata.
         """
-        CommonService(self.db).log_action(
-            user_id=current_user.id,
-            action='Fetch from cache',
-            description='Get Notes from Cache'
+        key = (page, page_size, search_query, sort_by, sort_order, cursor, include_total,
+               search_mode, tag, fields, excerpt_length)
+        result, cached = note_cache.get_or_compute(
+            user_notes(current_user.id), key,
+            lambda: NoteManager(self.db).get_note_paginated(
+                current_user, page, page_size, search_query, sort_by, sort_order, cursor,
+                include_total, search_mode, tag, fields, excerpt_length),
+            self._detached(lambda db: NoteManager(db).get_note_paginated(
+                current_user, page, page_size, search_query, sort_by, sort_order, cursor,
+                include_total, search_mode, tag, fields, excerpt_length, audit=False)),
         )
-        return NoteManager(self.db).get_note_paginated(
-            current_user, page, page_size, search_query, sort_by, sort_order
+        if cached:
+            CommonService(self.db).log_action(
+                user_id=current_user.id,
+                action='Fetch from cache',
+                description='Get Notes from Cache'
+            )
+        return result
+
+    def get_tag_facets(self, current_user) -> Any:
+        """
+        Tag facet counts of the current user's notes, cached in the user's
+        scope like the private listing, so any write to the user's notes
+        renews them.
+
+        Args:
+            current_user (Any): The current logged-in user.
+
+        Returns:
+            Any: [{"tag": str, "count": int}], most used tag first.
+        """
+        key = ("tag_facets",)
+        result, cached = note_cache.get_or_compute(
+            user_notes(current_user.id), key,
+            lambda: NoteManager(self.db).get_tag_facets(current_user),
+            self._detached(lambda db: NoteManager(db).get_tag_facets(current_user,
+                                                                      audit=False)),
         )
+        if cached:
+            CommonService(self.db).log_action(
+                user_id=current_user.id,
+                action='Fetch from cache',
+                description='Get Tag Facets from Cache'
+            )
+        return result
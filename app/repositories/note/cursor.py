@@ -0,0 +1,128 @@
+"""
+Keyset cursors for note listings
+
+A cursor is an opaque, URL-safe token holding the sort key of the last note
+of a page: the value of the sort column (created_at or updated_at) and the
+note id as tie-breaker. The next page is read with a range condition on
+(sort column, id) instead of OFFSET, so deep pages cost the same as the
+first one. The sort column and order are part of the cursor and must match
+the request. Capped listings (search) also keep the number of notes already
+returned, to stop at the cap.
+
+updated_at is nullable; NULLs sort first ascending and last descending
+(MySQL and SQLite agree), and the keyset conditions follow that order.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.db.models import Note
+
+
+def keyset_order(sort_by: str, sort_order: str) -> tuple:
+    """
+    ORDER BY clauses for a listing: the sort column, then id as tie-breaker
+    :param sort_by: created_at or updated_at
+    :param sort_order: asc or desc
+    :return: order_by clauses
+    """
+    sort_column = getattr(Note, sort_by)
+    if sort_order == "desc":
+        return sort_column.desc(), Note.id.desc()
+    return sort_column.asc(), Note.id.asc()
+
+
+def encode_cursor(note, sort_by: str, sort_order: str, seen: Optional[int] = None) -> str:
+    """
+    Cursor pointing just after the given note
+    :param note: last note of the page
+    :param sort_by:
+    :param sort_order:
+    :param seen: notes returned so far, for capped listings
+    :return: opaque cursor
+    """
+    value = getattr(note, sort_by)
+    payload = {
+        "s": sort_by,
+        "o": sort_order,
+        "v": value.isoformat() if value is not None else None,
+        "id": note.id,
+    }
+    if seen is not None:
+        payload["n"] = seen
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str) -> tuple[Optional[datetime], int]:
+    """
+    Sort key stored in a cursor
+    :param cursor: opaque cursor from a previous page
+    :param sort_by: sort column of the current request
+    :param sort_order: sort order of the current request
+    :return: (sort column value, note id)
+    :raises ValueError: on a malformed cursor or one issued for another sort
+    """
+    payload = _payload(cursor)
+    try:
+        value = payload["v"]
+        position = (datetime.fromisoformat(value) if value is not None else None,
+                    int(payload["id"]))
+    except (KeyError, TypeError) as e:
+        raise ValueError("Malformed cursor") from e
+    if payload.get("s") != sort_by or payload.get("o") != sort_order:
+        raise ValueError("Cursor was issued for a different sort")
+    return position
+
+
+def cursor_seen(cursor: str) -> int:
+    """
+    Number of notes returned before the page a cursor points to
+    :param cursor: opaque cursor from a previous page
+    :return: count, 0 when the cursor does not keep it
+    :raises ValueError: on a malformed cursor
+    """
+    try:
+        return int(_payload(cursor).get("n", 0))
+    except (TypeError, ValueError) as e:
+        raise ValueError("Malformed cursor") from e
+
+
+def _payload(cursor: str) -> dict:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError("Malformed cursor") from e
+    if not isinstance(payload, dict):
+        raise ValueError("Malformed cursor")
+    return payload
+
+
+def keyset_after(sort_by: str, sort_order: str,
+                 value: Optional[datetime], note_id: int) -> ColumnElement:
+    """
+    Condition selecting the notes that follow (value, note_id) in the order
+    given by keyset_order
+    :param sort_by:
+    :param sort_order:
+    :param value: sort column value of the last note seen
+    :param note_id: id of the last note seen
+    :return: filter clause
+    """
+    column = getattr(Note, sort_by)
+    if sort_order == "desc":
+        if value is None:
+            return and_(column.is_(None), Note.id < note_id)
+        after = or_(column < value, and_(column == value, Note.id < note_id))
+        if Note.__table__.c[sort_by].nullable:
+            # NULLs sort last descending, so they all follow any dated note
+            after = or_(after, column.is_(None))
+        return after
+    if value is None:
+        return or_(and_(column.is_(None), Note.id > note_id), column.isnot(None))
+    return or_(column > value, and_(column == value, Note.id > note_id))
@@ -4,20 +4,62 @@ Note Action DB
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Select, false, func, select, true
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy.sql.elements import or_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement, and_, or_
 
+from app.core.auth.principal import Principal
+from app.core.settings import settings
+from app.core.cache import PUBLIC_NOTES, invalidate_notes, note_cache, user_notes
 from app.core.exceptions.auth import AuthErrorHandler
 from app.core.exceptions.note import NoteErrorHandler
-from app.db.models import Note, User
-from app.dto.note.note_dto import NoteDTO
+from app.db.models import Note, NoteTag, User
+from app.db.models.notes.model import TAG_MAX_LENGTH
+from app.dto.note.note_dto import DEFAULT_FIELDS, EXCERPT_LENGTH, USER_KEYS, NoteDTO
 from app.repositories.auth.common.services import CommonService
 from app.repositories.logger.repository import LoggerService
+from app.repositories.note.cursor import (cursor_seen, decode_cursor, encode_cursor,
+                                          keyset_after, keyset_order)
+from app.repositories.note.search.bm25 import note_index
+from app.repositories.note.search.fulltext import fulltext_match
+from app.repositories.note.search.modes import BM25, SUBSTRING, resolve_search_mode
+from app.repositories.note.search.query import NoteQuery, parse_query
+from app.repositories.note.search.suggest import suggest_index
+from app.repositories.note.search.trigram import trigram_index
 from app.schemas.notes.request import NoteCreate, NoteUpdate
 
 logger = LoggerService().logger
 
+# Columns a sparse fieldset may ask for, besides id and the sort keys
+_NOTE_COLUMNS = ("title", "content", "is_public", "tags", "image_url")
+# Ranked bm25 ids re-checked against the table per query, below SQLite's
+# bind parameter limit
+_RANKED_BATCH = 500
+
+
+def note_columns(fields: Optional[tuple[str, ...]],
+                 excerpt_length: int = EXCERPT_LENGTH) -> list:
+    """
+    Columns a note listing selects for NoteDTO.from_row: every column and
+    the author by default, else the requested columns plus id and the sort
+    keys (content is not read), the author's columns for user, its username
+    for author, and an excerpt cut by the database. The query joins users.
+    :param fields: NoteDTO.resolve_fields result
+    :param excerpt_length:
+    :return: columns for Query.with_entities
+    """
+    fields = fields or DEFAULT_FIELDS
+    columns = [Note.id, Note.created_at, Note.updated_at,
+               *(getattr(Note, field) for field in _NOTE_COLUMNS if field in fields)]
+    if "user" in fields:
+        columns.extend(getattr(User, key) for key in USER_KEYS)
+    elif "author" in fields:
+        columns.append(User.username)
+    if "excerpt" in fields:
+        columns.append(func.substr(Note.content, 1, excerpt_length + 1).label("excerpt"))
+    return columns
+
 
 class NoteManager:
     """
@@ -28,56 +70,153 @@ class NoteManager:
         self.db = db
 
     def handling_paginated_request(self,
-                                   current_user: User,
+                                   current_user: Principal,
                                    page: int,
                                    page_size: int,
                                    query,
                                    search_query: str,
                                    skip: int,
                                    sort_by: str,
-                                   sort_order: str) -> Optional[dict]:
+                                   sort_order: str,
+                                   cursor: Optional[str] = None,
+                                   count_scope: Optional[str] = None,
+                                   include_total: bool = False,
+                                   search_mode: str = SUBSTRING,
+                                   tag: Optional[str] = None,
+                                   max_results: Optional[int] = None,
+                                   snippets: bool = False,
+                                   fields: Optional[str] = None,
+                                   excerpt_length: Optional[int] = None,
+                                   audit: bool = True) -> Optional[dict]:
         """
         Handling pagination request
+        Pages are addressed by page number (OFFSET) or, when a cursor from a
+        previous page is given, by keyset on (sort column, id). Every page
+        returns the cursor of the next one.
+        A natural or boolean search_mode on MySQL matches with the FULLTEXT
+        index, bm25 with the in-process note index; both order by relevance
+        instead of sort_by and are addressed by page number only. bm25 re-checks
+        against the table only the ranked ids a page reaches, the rest are
+        counted as an estimate.
+        The total is counted once per search and cache generation of
+        count_scope and then reused by every page (total_is_estimate is set);
+        include_total=True, or no count_scope, always runs an exact COUNT.
+        A tag keeps only the notes carrying it, looked up in note_tags, and so
+        do the operators of a structured search_query (search/query.py); the
+        rest of the query is the free text.
+        With max_results no page reaches past that many notes and the total is
+        capped to it; snippets returns an excerpt around the match instead of
+        the whole content. fields (comma separated) and excerpt_length select
+        the keys of each item; only their columns are read, into NoteDTOs.
+        audit=False skips the audit row, for reads no request asked for
+        (background cache refreshes).
         """
         try:
-            if search_query := search_query.strip():
-                search = f"%{search_query}%"
+            relevance = ranked = ranked_total = None
+            selected = NoteDTO.resolve_fields(fields, excerpt_length)
+            excerpt_length = excerpt_length or EXCERPT_LENGTH
+            start, limit = skip, page_size
+            if max_results is not None:
+                if cursor:
+                    try:
+                        start = cursor_seen(cursor)
+                    except ValueError:
+                        NoteErrorHandler.raise_invalid_cursor()
+                limit = max(0, min(page_size, max_results - start))
+            search_mode = resolve_search_mode(self.db, search_mode)
+            search_query = search_query.strip()
+            parsed = self._parse(search_query)
+            filters = self._query_filters(current_user, count_scope, parsed)
+            if tag:
+                filters.append(
+                    Note.id.in_(self._tagged(current_user, count_scope, NoteTag.tag == tag))
+                )
+            query = query.filter(*filters)
+            if (text := parsed.text) and search_mode == BM25:
+                # Page over the ranked notes still in the table that the
+                # filters keep: the index may hold notes deleted elsewhere
+                ranked, ranked_total = self._kept_ranked_ids(
+                    query, self._ranked_ids(current_user, count_scope, text), skip + limit + 1)
+                query = query.filter(Note.id.in_(ranked[skip:skip + limit + 1]))
+            elif text and search_mode != SUBSTRING:
+                relevance = fulltext_match(text, search_mode)
+                query = query.filter(relevance)
+            elif text:
+                search = f"%{text}%"
                 query = query.filter(
                     or_(
-                        Note.title.ilike(search),
-                        Note.content.ilike(search),
-                        Note.tags.contains(search),
+                        self._text_match(current_user, count_scope, text),
+                        Note.id.in_(self._tagged(current_user, count_scope,
+                                                 NoteTag.tag.ilike(search))),
                         User.username.ilike(search),
                         User.email.ilike(search)
                     )
                 )
-            sort_column = getattr(Note, sort_by)
-            query = query.order_by(sort_column.desc()
-                                   if sort_order == "desc"
-                                   else sort_column.asc())
-
-            total = query.count()
-            notes = query.offset(skip).limit(page_size).all()
+            if ranked_total is not None:
+                total, total_is_estimate = ranked_total
+            elif include_total or count_scope is None:
+                total, total_is_estimate = query.count(), False
+            else:
+                total, total_is_estimate = self._cached_count(count_scope, search_mode,
+                                                              search_query, tag, query)
+            if max_results is not None:
+                total = min(total, max_results)
+
+            if cursor and (relevance is not None or ranked is not None):
+                NoteErrorHandler.raise_invalid_cursor()
+            if relevance is not None:
+                query = query.order_by(relevance.desc(), Note.id.desc()).offset(skip)
+            elif cursor:
+                try:
+                    position = decode_cursor(cursor, sort_by, sort_order)
+                except ValueError:
+                    NoteErrorHandler.raise_invalid_cursor()
+                query = query.order_by(*keyset_order(sort_by, sort_order)) \
+                    .filter(keyset_after(sort_by, sort_order, *position))
+            elif ranked is None:
+                query = query.order_by(*keyset_order(sort_by, sort_order)).offset(skip)
+            # Plain rows into slotted NoteDTOs: no Note instances nor identity map
+            rows = query.with_entities(*note_columns(selected, excerpt_length)) \
+                .limit(limit + 1).all() if limit else []
+            notes = [NoteDTO.from_row(row) for row in rows]
+            if ranked is not None:
+                notes = self._in_rank_order(notes, ranked)
+            has_next = len(notes) > limit and (max_results is None
+                                               or start + limit < max_results)
+            notes = notes[:limit]
+            next_cursor = None
+            if has_next and relevance is None and ranked is None:
+                next_cursor = encode_cursor(notes[-1], sort_by, sort_order,
+                                            None if max_results is None else start + limit)
 
             log_description = (f"User get pagination notes with search: "
                                f"{search_query}") if search_query \
                 else "User get pagination notes"
 
-            CommonService(self.db).log_action(
-                user_id=current_user.id,
-                action="Get notes",
-                description=log_description
-            )
+            if audit:
+                CommonService(self.db).log_action(
+                    user_id=current_user.id,
+                    action="Get notes",
+                    description=log_description
+                )
 
-            return NoteDTO.paginated_response(
+            response = NoteDTO.paginated_response(
                 notes,
                 page,
                 page_size,
                 search_query,
                 total,
                 sort_by,
-                sort_order
+                sort_order,
+                next_cursor,
+                total_is_estimate,
+                snippet_of=parsed.text if snippets else None,
+                fields=selected,
+                excerpt_length=excerpt_length
             )
+            # Exact in every mode: one extra row was read past the page
+            response["has_next"] = has_next
+            return response
         except SQLAlchemyError as e:
             logger.error("Database error while logging action: %s", e)
             NoteErrorHandler.raise_pagination_error(e)
@@ -89,13 +228,163 @@ class NoteManager:
             NoteErrorHandler.raise_pagination_error(e)
         return None
 
+    @staticmethod
+    def _index_scope(current_user: Principal, scope: Optional[str]) -> dict:
+        """
+        Search index filter for a listing scope
+        :param scope: PUBLIC_NOTES for the public feed, else the user's notes
+        """
+        if scope == PUBLIC_NOTES:
+            return {"public": True}
+        return {"owner_id": str(current_user.id)}
+
+    @staticmethod
+    def _tagged(current_user: Principal, scope: Optional[str], condition) -> Select:
+        """
+        Ids of the notes of a listing scope with a tag matching condition, from
+        note_tags: ix_note_tags_user_id_tag for a user's notes, ix_note_tags_tag
+        for the public feed
+        """
+        tagged = select(NoteTag.note_id).where(condition)
+        if scope != PUBLIC_NOTES:
+            tagged = tagged.where(NoteTag.user_id == str(current_user.id))
+        return tagged
+
+    @staticmethod
+    def _sync_tags(note_obj: Note) -> None:
+        """
+        Mirror note_obj.tags into its note_tags rows, keeping the rows of the
+        tags it still has. Tags differing only in case share a row, as they
+        would under the MySQL collation.
+        """
+        tags = {}
+        for tag in (str(tag).strip()[:TAG_MAX_LENGTH] for tag in note_obj.tags or []):
+            if tag:
+                tags.setdefault(tag.casefold(), tag)
+        kept = []
+        for row in note_obj.tag_rows:
+            if (tag := tags.pop(row.tag.casefold(), None)) is not None:
+                row.tag = tag
+                kept.append(row)
+        note_obj.tag_rows = kept + [NoteTag(tag=tag, user_id=note_obj.user_id)
+                                    for tag in tags.values()]
+
+    def _ranked_ids(self, current_user: Principal, scope: Optional[str],
+                    search_query: str) -> list[int]:
+        """
+        Ids of the notes of a listing scope matching search_query, best BM25
+        score first
+        """
+        note_index.ensure_ready(self.db)
+        matches = note_index.search(search_query, **self._index_scope(current_user, scope))
+        return [note_id for note_id, _ in matches]
+
+    @staticmethod
+    def _parse(search_query: str) -> NoteQuery:
+        """
+        Structured search query, a 400 when an operator value is invalid
+        """
+        try:
+            return parse_query(search_query)
+        except ValueError as e:
+            NoteErrorHandler.raise_invalid_query(e)
+        return NoteQuery()
+
+    def _query_filters(self, current_user: Principal, scope: Optional[str],
+                       parsed: NoteQuery) -> list[ColumnElement]:
+        """
+        Predicates of the operators of a search query, each on one indexed
+        column: note_tags for tag:, users.username for author:, the listing
+        indexes for is: / before: / after:, and a trigram narrowed ILIKE on
+        the title alone for title:
+        """
+        filters = [Note.id.in_(self._tagged(current_user, scope, NoteTag.tag == tag))
+                   for tag in parsed.tags]
+        filters += [self._text_match(current_user, scope, title, Note.title)
+                    for title in parsed.titles]
+        filters += [Note.user_id.in_(select(User.id).where(User.username == author))
+                    for author in parsed.authors]
+        if parsed.is_public is not None:
+            filters.append(Note.is_public == (true() if parsed.is_public else false()))
+        if parsed.before is not None:
+            filters.append(Note.created_at < parsed.before)
+        if parsed.after is not None:
+            filters.append(Note.created_at >= parsed.after)
+        return filters
+
+    def _text_match(self, current_user: Principal, scope: Optional[str],
+                    search_query: str, *columns) -> ColumnElement:
+        """
+        Title or content (or the given columns) ILIKE '%search_query%',
+        checked only on the trigram index candidates (and notes written since
+        its last sync) when the query can be narrowed
+        """
+        search = f"%{search_query}%"
+        match = or_(*(column.ilike(search) for column in columns or (Note.title, Note.content)))
+        if not trigram_index.enabled:
+            return match
+        trigram_index.ensure_ready(self.db)
+        candidates = trigram_index.candidates(search_query,
+                                              **self._index_scope(current_user, scope))
+        if candidates is None:
+            return match
+        return and_(or_(Note.id.in_(candidates),
+                        Note.updated_at >= trigram_index.unsynced_since()), match)
+
+    @staticmethod
+    def _kept_ranked_ids(query, ranked: list[int],
+                         needed: int) -> tuple[list[int], tuple[int, bool]]:
+        """
+        The first needed ranked ids that query keeps, in rank order, checked
+        _RANKED_BATCH ids at a time and only as far as needed reaches
+        :return: (kept ids, (total, whether it is an estimate)): ids past the
+                 last batch are not checked and count as kept
+        """
+        kept, checked = [], 0
+        while len(kept) < needed and checked < len(ranked):
+            batch = ranked[checked:checked + _RANKED_BATCH]
+            found = {note_id for (note_id,) in
+                     query.filter(Note.id.in_(batch)).with_entities(Note.id)}
+            kept.extend(note_id for note_id in batch if note_id in found)
+            checked += len(batch)
+        return kept, (len(kept) + len(ranked) - checked, checked < len(ranked))
+
+    @staticmethod
+    def _in_rank_order(notes: list, ranked: list[int]) -> list:
+        position = {note_id: rank for rank, note_id in enumerate(ranked)}
+        return sorted(notes, key=lambda note: position[note.id])
+
+    @staticmethod
+    def _cached_count(scope: str, search_mode: str, search_query: str,
+                      tag: Optional[str], query) -> tuple[int, bool]:
+        """
+        Number of notes matching a listing, counted once per cache generation
+        of scope (every write to the scope starts a new one)
+        :return: (total, whether it was served from the cache)
+        """
+        key = ("count", search_mode, search_query, tag)
+        generation = note_cache.generation(scope)
+        total = note_cache.get(scope, key)
+        if total is not None:
+            return total, True
+        total = query.count()
+        note_cache.set(scope, key, total, generation)
+        return total, False
+
     def get_explore_notes(self,
-                          current_user: User,
+                          current_user: Principal,
                           page: int = 1,
                           page_size: int = 10,
                           search_query: str = "",
                           sort_by: str = "created_at",
-                          sort_order: str = "desc"
+                          sort_order: str = "desc",
+                          cursor: Optional[str] = None,
+                          include_total: bool = False,
+                          search_mode: str = SUBSTRING,
+                          tag: Optional[str] = None,
+                          fields: Optional[str] = None,
+                          excerpt_length: Optional[int] = None,
+                          audit: bool = True
                           ) -> Optional[dict]:
         """
          Get public notes for logged user
@@ -105,7 +394,8 @@ class NoteManager:
             query = (self.db.query(Note).join(User,
                                               Note.user_id == User.id,
                                               isouter=True)
-                     .filter(Note.is_public.is_(True)))
+                     # "= true" rather than "IS TRUE" so MySQL seeks ix_notes_is_public_*
+                     .filter(Note.is_public == true()))
 
             return self.handling_paginated_request(current_user,
                                                    page,
@@ -113,7 +403,15 @@ class NoteManager:
                                                    query,
                                                    search_query,
                                                    skip, sort_by,
-                                                   sort_order)
+                                                   sort_order,
+                                                   cursor,
+                                                   PUBLIC_NOTES,
+                                                   include_total,
+                                                   search_mode,
+                                                   tag,
+                                                   fields=fields,
+                                                   excerpt_length=excerpt_length,
+                                                   audit=audit)
         except SQLAlchemyError as e:
             logger.error("Database error while get public note paginated: %s", e)
             NoteErrorHandler.raise_pagination_error(e)
@@ -125,12 +423,19 @@ class NoteManager:
             NoteErrorHandler.raise_pagination_error(e)
         return None
 
-    def get_note_paginated(self, current_user: User,
+    def get_note_paginated(self, current_user: Principal,
                            page: int = 1,
                            page_size: int = 10,
                            search_query: str = "",
                            sort_by: str = "created_at",
-                           sort_order: str = "desc"
+                           sort_order: str = "desc",
+                           cursor: Optional[str] = None,
+                           include_total: bool = False,
+                           search_mode: str = SUBSTRING,
+                           tag: Optional[str] = None,
+                           fields: Optional[str] = None,
+                           excerpt_length: Optional[int] = None,
+                           audit: bool = True
                            ) -> Optional[dict]:
         """
          Get pagination notes for specific user
@@ -139,7 +444,6 @@ class NoteManager:
             skip = (page - 1) * page_size
             query = (self.db.query(Note)
                      .join(User)
-                     .options(joinedload(Note.user))
                      .filter(Note.user_id == current_user.id))
 
             return self.handling_paginated_request(current_user,
@@ -149,7 +453,15 @@ class NoteManager:
                                                    search_query,
                                                    skip,
                                                    sort_by,
-                                                   sort_order)
+                                                   sort_order,
+                                                   cursor,
+                                                   user_notes(current_user.id),
+                                                   include_total,
+                                                   search_mode,
+                                                   tag,
+                                                   fields=fields,
+                                                   excerpt_length=excerpt_length,
+                                                   audit=audit)
         except SQLAlchemyError as e:
             logger.error("Database error while get note paginated: %s", e)
             NoteErrorHandler.raise_pagination_error(e)
@@ -161,7 +473,7 @@ class NoteManager:
             NoteErrorHandler.raise_pagination_error(e)
         return None
 
-    def get_note(self, note_id: int, current_user: User) -> Optional[dict]:
+    def get_note(self, note_id: int, current_user: Principal) -> Optional[dict]:
         """Get note by ID"""
         try:
             note_obj = (self.db.query(Note)
@@ -182,29 +494,86 @@ class NoteManager:
             NoteErrorHandler.raise_pagination_error(e)
         return None
 
-    def search_notes(self, current_user: User, query: str) -> Optional[list[dict]]:
-        """Search notes by query"""
+    def get_tag_facets(self, current_user: Principal,
+                       audit: bool = True) -> Optional[list[dict]]:
+        """
+        Number of the user's notes carrying each tag, most used first
+        Counted on ix_note_tags_user_id_tag alone, notes are not read.
+        audit=False skips the audit row (background cache refreshes).
+        """
         try:
-            base_query = self.db.query(Note).join(User).filter(Note.user_id == current_user.id)
-
-            if query:
-                search = f"%{query}%"
-                base_query = base_query.filter(
-                    or_(
-                        Note.title.ilike(search),
-                        Note.content.ilike(search),
-                        User.username.ilike(search)
-                    )
+            count = func.count().label("count")  # pylint: disable=not-callable
+            rows = (self.db.query(NoteTag.tag, count)
+                    .filter(NoteTag.user_id == current_user.id)
+                    .group_by(NoteTag.tag)
+                    .order_by(count.desc(), NoteTag.tag)
+                    .all())
+
+            if audit:
+                CommonService(self.db).log_action(
+                    user_id=current_user.id,
+                    action="Get tag facets",
+                    description="User get tag facets"
                 )
+            return [{"tag": tag, "count": total} for tag, total in rows]
+        except SQLAlchemyError as e:
+            logger.error("Database error while counting tags: %s", e)
+            NoteErrorHandler.raise_general_error(e)
+        except ValueError as e:
+            logger.error("Invalid value error while counting tags: %s", e)
+            NoteErrorHandler.raise_general_error(e)
+        except IOError as e:
+            logger.error("I/O error while counting tags: %s", e)
+            NoteErrorHandler.raise_general_error(e)
+        return None
 
-            CommonService(self.db).log_action(
-                user_id=current_user.id,
-                action="Search Notes",
-                description="User searched notes successfully"
-            )
+    def suggest(self, current_user: Principal, prefix: str,
+                limit: int = 10) -> Optional[list[dict]]:
+        """
+        Completions of prefix among the user's note titles and tags, from the
+        in-memory suggest index. Not audited: it runs on every keystroke.
+        """
+        try:
+            suggest_index.ensure_ready(self.db)
+            return suggest_index.suggest(str(current_user.id), prefix, limit)
+        except SQLAlchemyError as e:
+            logger.error("Database error while loading suggestions: %s", e)
+            NoteErrorHandler.raise_general_error(e)
+        return None
 
-            notes = base_query.all()
-            return [NoteDTO.from_model(note) for note in notes]
+    def search_notes(self, current_user: Principal,
+                     query: str,
+                     search_mode: str = SUBSTRING,
+                     page: int = 1,
+                     page_size: int = 10,
+                     cursor: Optional[str] = None,
+                     full_content: bool = False) -> Optional[dict]:
+        """
+        Search the user's notes, a page at a time
+        Same query language, ranking and response as the private listing,
+        most recently updated first in substring mode. No page reaches past
+        NOTE_SEARCH_MAX_RESULTS notes, and items carry a snippet around the
+        match instead of the content unless full_content is set.
+        """
+        try:
+            skip = (page - 1) * page_size
+            base_query = (self.db.query(Note)
+                          .join(User)
+                          .filter(Note.user_id == current_user.id))
+
+            return self.handling_paginated_request(current_user,
+                                                   page,
+                                                   page_size,
+                                                   base_query,
+                                                   query or "",
+                                                   skip,
+                                                   "updated_at",
+                                                   "desc",
+                                                   cursor,
+                                                   user_notes(current_user.id),
+                                                   search_mode=search_mode,
+                                                   max_results=settings.NOTE_SEARCH_MAX_RESULTS,
+                                                   snippets=not full_content)
         except SQLAlchemyError as e:
             logger.error("Database error while searching notes action: %s", e)
             NoteErrorHandler.raise_note_not_found()
@@ -216,7 +585,7 @@ class NoteManager:
             NoteErrorHandler.raise_note_not_found()
         return None
 
-    def add_note(self, note: NoteCreate, current_user: User) -> Optional[dict]:
+    def add_note(self, note: NoteCreate, current_user: Principal) -> Optional[dict]:
         """Add new note"""
         try:
             new_note = Note(
@@ -229,6 +598,7 @@ class NoteManager:
                 updated_at=datetime.now(),
                 user_id=current_user.id
             )
+            self._sync_tags(new_note)
 
             CommonService(self.db).log_action(
                 user_id=current_user.id,
@@ -238,6 +608,10 @@ class NoteManager:
             self.db.add(new_note)
             self.db.commit()
             self.db.refresh(new_note)
+            invalidate_notes(current_user.id, public=bool(new_note.is_public))
+            note_index.add(new_note)
+            trigram_index.add(new_note)
+            suggest_index.add(new_note)
 
             return NoteDTO.from_model(new_note)
         except SQLAlchemyError as e:
@@ -249,7 +623,8 @@ class NoteManager:
             NoteErrorHandler.raise_note_creation_error(str(e))
         return None
 
-    def update_note(self, note_id: int, note: NoteUpdate, current_user: User) -> Optional[dict]:
+    def update_note(self, note_id: int, note: NoteUpdate,
+                    current_user: Principal) -> Optional[dict]:
         """Update existing note"""
         try:
             note_obj = (self.db.query(Note)
@@ -258,6 +633,7 @@ class NoteManager:
                 NoteErrorHandler.raise_note_not_found()
             if note_obj.user_id != current_user.id:
                 AuthErrorHandler.raise_unauthorized()
+            was_public = bool(note_obj.is_public)
 
             update_fields = {
                 'title': note.title,
@@ -270,6 +646,8 @@ class NoteManager:
             for field, value in update_fields.items():
                 if value is not None:
                     setattr(note_obj, field, value)
+            if note.tags is not None:
+                self._sync_tags(note_obj)
 
             note_obj.updated_at = datetime.now()
 
@@ -281,6 +659,10 @@ class NoteManager:
 
             self.db.commit()
             self.db.refresh(note_obj)
+            invalidate_notes(current_user.id, public=was_public or bool(note_obj.is_public))
+            note_index.add(note_obj)
+            trigram_index.add(note_obj)
+            suggest_index.add(note_obj)
             return NoteDTO.from_model(note_obj)
         except SQLAlchemyError as e:
             logger.error("Database error while adding notes: %s", e)
@@ -293,7 +675,7 @@ class NoteManager:
             NoteErrorHandler.raise_note_update_error(e)
         return None
 
-    def delete_note(self, note_id: int, current_user: User) -> Optional[dict]:
+    def delete_note(self, note_id: int, current_user: Principal) -> Optional[dict]:
         """Delete note"""
         try:
             note_obj = (self.db.query(Note)
@@ -303,6 +685,8 @@ class NoteManager:
             if note_obj.user_id != current_user.id:
                 AuthErrorHandler.raise_unauthorized()
 
+            was_public = bool(note_obj.is_public)
+
             CommonService(self.db).log_action(
                 user_id=current_user.id,
                 action="Delete Note",
@@ -310,6 +694,10 @@ class NoteManager:
             )
             self.db.delete(note_obj)
             self.db.commit()
+            invalidate_notes(current_user.id, public=was_public)
+            note_index.remove(note_id)
+            trigram_index.remove(note_id)
+            suggest_index.remove(note_id)
             return {"result": f"Note {note_id} has been deleted",
                     "id_note": note_id}
         except SQLAlchemyError as e:
@@ -340,7 +728,15 @@ class NoteManager:
         """
         try:
             actions = {
-                "search_notes": lambda: self.search_notes(current_user, kwargs.get("query")),
+                "search_notes": lambda: self.search_notes(
+                    current_user,
+                    kwargs.get("query"),
+                    kwargs.get("search_mode", SUBSTRING),
+                    kwargs.get("page", 1),
+                    kwargs.get("page_size", 10),
+                    kwargs.get("cursor"),
+                    kwargs.get("full_content", False),
+                ),
                 "get_note_paginated": lambda: self.get_note_paginated(
                     current_user,
                     kwargs.get("page", 1),
@@ -348,6 +744,12 @@ class NoteManager:
                     kwargs.get("query", ""),
                     kwargs.get("sort_by", "created_at"),
                     kwargs.get("sort_order", "desc"),
+                    kwargs.get("cursor"),
+                    kwargs.get("include_total", False),
+                    kwargs.get("search_mode", SUBSTRING),
+                    kwargs.get("tag"),
+                    kwargs.get("fields"),
+                    kwargs.get("excerpt_length"),
                 ),
                 "get_explore_notes": lambda: self.get_explore_notes(
                     current_user,
@@ -356,7 +758,16 @@ class NoteManager:
                     kwargs.get("query", ""),
                     kwargs.get("sort_by", "created_at"),
                     kwargs.get("sort_order", "desc"),
+                    kwargs.get("cursor"),
+                    kwargs.get("include_total", False),
+                    kwargs.get("search_mode", SUBSTRING),
+                    kwargs.get("tag"),
+                    kwargs.get("fields"),
+                    kwargs.get("excerpt_length"),
                 ),
+                "get_tag_facets": lambda: self.get_tag_facets(current_user),
+                "suggest": lambda: self.suggest(current_user, kwargs.get("prefix", ""),
+                                                kwargs.get("limit", 10)),
                 "add_note": lambda: self.add_note(note, current_user),
                 "get_note_by_id": lambda: self.get_note(note_id, current_user),
                 "update_note": lambda: self.update_note(note_id, note, current_user),
@@ -0,0 +1,336 @@
+"""
+In-process BM25 note search
+
+An inverted index (term -> postings of note id and term frequency) over the
+title, content and tags of every note, for deployments where MySQL FULLTEXT
+is not available. Matches are scored with Okapi BM25 and restricted to one
+owner's notes or to public ones.
+
+The index is the last on-disk segment (segment.py, read through mmap) plus
+an in-memory delta: notes written since the segment are indexed in the
+delta and hide their segment copy. NoteManager feeds add/update/delete into
+it after each commit; writes made by other workers are picked up every
+NOTE_INDEX_SYNC_SECONDS from notes.updated_at, like the revocation set does
+for revoked_tokens. Deletions on other workers are dropped when a segment is
+opened and then every NOTE_INDEX_PRUNE_SECONDS, like the SyncedIndex ones;
+until then callers re-check the returned ids against the database.
+
+With NOTE_INDEX_PATH set the first worker builds the segment from the notes
+table and the others, or the next start, open it instead of rebuilding.
+When the delta grows past COMPACT_AFTER notes it is merged into a new
+segment, without the notes dropped since.
+
+The table is read without holding the index lock, so searches on a loaded
+index do not wait for a sync. Until the first load completes, requests wait
+for it: there is no fallback ranking.
+"""
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.db.models import Note
+from app.repositories.logger.repository import LoggerService
+from app.repositories.note.search.segment import IndexedDoc, Segment, write_segment
+from app.repositories.note.search.synced import deleted_note_ids
+
+logger = LoggerService().logger
+
+K1 = 1.2
+B = 0.75
+MAX_TOKEN_LENGTH = 64
+COMPACT_AFTER = 1000
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Lower-cased word tokens of a text
+    :param text:
+    :return: tokens, in order
+    """
+    return [token for token in _TOKEN.findall(text.lower()) if len(token) <= MAX_TOKEN_LENGTH]
+
+
+def note_tokens(note) -> list[str]:
+    """
+    Tokens indexed for a note: title, content and tags
+    :param note: Note or any object with the same attributes
+    :return: tokens
+    """
+    tags = " ".join(str(tag) for tag in note.tags or [])
+    return tokenize(f"{note.title} {note.content} {tags}")
+
+
+class NoteSearchIndex:
+    """
+    BM25 ranked inverted index over notes, segment + in-memory delta.
+    """
+
+    def __init__(self, path: str = "", sync_interval: float = 30,
+                 clock: Callable[[], float] = time.monotonic,
+                 prune_interval: float = 600):
+        self.path = path
+        self.sync_interval = sync_interval
+        self._clock = clock
+        self.prune_interval = prune_interval
+        self._lock = threading.RLock()
+        self._segment: Optional[Segment] = None
+        self._live: dict[int, IndexedDoc] = {}
+        self._terms: dict[int, Counter] = {}
+        self._postings: dict[str, dict[int, int]] = defaultdict(dict)
+        self._hidden: set[int] = set()
+        self._total_length = 0
+        self._watermark: Optional[datetime] = None
+        self._next_sync = 0.0
+        self._next_prune = 0.0
+        # Held by the request loading the index; the others wait for it
+        self._build_lock = threading.Lock()
+        self.ready = False
+
+    def _reset(self) -> None:
+        """Empty the delta and forget the segment stats; the mapping is left to the caller"""
+        self._live = {}
+        self._terms = {}
+        self._postings = defaultdict(dict)
+        self._hidden = set()
+        self._total_length = 0
+        self._watermark = None
+        self._next_sync = 0.0
+        self._next_prune = 0.0
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def add(self, note) -> None:
+        """
+        Index a note written on this worker, replacing any previous version.
+        Ignored until the index is loaded, the load reads it from the table.
+        :param note: Note
+        """
+        with self._lock:
+            if not self.ready:
+                return
+            self._add(note)
+            if self.path and len(self._terms) >= COMPACT_AFTER:
+                self.compact()
+
+    def remove(self, note_id: int) -> None:
+        """
+        Drop a note deleted on this worker
+        :param note_id:
+        """
+        with self._lock:
+            if self.ready:
+                self._drop(note_id)
+
+    def _add(self, note) -> None:
+        tokens = note_tokens(note)
+        frequencies = Counter(tokens)
+        self._drop(note.id)
+        self._live[note.id] = IndexedDoc(len(tokens), str(note.user_id), bool(note.is_public))
+        self._terms[note.id] = frequencies
+        self._total_length += len(tokens)
+        for term, tf in frequencies.items():
+            self._postings[term][note.id] = tf
+
+    def _drop(self, note_id: int) -> None:
+        doc = self._live.pop(note_id, None)
+        if doc is None:
+            return
+        self._total_length -= doc.length
+        if note_id in self._terms:
+            for term in self._terms.pop(note_id):
+                postings = self._postings[term]
+                del postings[note_id]
+                if not postings:
+                    del self._postings[term]
+        if self._segment is not None and note_id in self._segment.docs:
+            self._hidden.add(note_id)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def ensure_ready(self, db: Session) -> None:
+        """
+        Load or build the index on first use, then sync when due
+        :param db:
+        """
+        if not self.ready:
+            with self._build_lock:
+                if not self.ready:
+                    self._load(db)
+        elif self._clock() >= self._next_sync:
+            self.sync(db)
+
+    def _load(self, db: Session) -> None:
+        self.clear()
+        if self.path:
+            try:
+                self._open(Segment(self.path))
+                self.sync(db)
+                # The segment may hold notes deleted since it was written
+                self._prune(db, list(self._live))
+                logger.info("Note index: opened %s (%d notes)", self.path, len(self))
+                with self._lock:
+                    self._next_prune = self._clock() + self.prune_interval
+                    self.ready = True
+                return
+            except (OSError, ValueError) as e:
+                logger.info("Note index: rebuilding, cannot open %s: %s", self.path, e)
+        self.rebuild(db)
+
+    def _open(self, segment: Segment) -> None:
+        self._segment = segment
+        self._live = dict(segment.docs)
+        self._total_length = segment.total_length
+        self._watermark = segment.watermark
+
+    def rebuild(self, db: Session) -> None:
+        """
+        Index every note from the database and, with a path, write the segment
+        :param db:
+        """
+        self.clear()
+        # Not ready: local writes are ignored and searches wait for the load,
+        # so the rows are indexed without holding the lock
+        for note in db.query(Note).yield_per(1000):
+            self._add(note)
+            self._advance(note.updated_at)
+        with self._lock:
+            self._next_sync = self._clock() + self.sync_interval
+            self._next_prune = self._clock() + self.prune_interval
+            self.ready = True
+            if self.path:
+                self.compact()
+        logger.info("Note index: built from database (%d notes)", len(self))
+
+    def sync(self, db: Session) -> int:
+        """
+        Re-index notes updated since the watermark (with an overlap of one
+        sync interval, for late commits on other workers); every write sets
+        updated_at. Every prune interval also drop the notes deleted elsewhere
+        :param db:
+        :return: number of notes read
+        """
+        query = db.query(Note)
+        if self._watermark is not None:
+            query = query.filter(
+                Note.updated_at >= self._watermark - timedelta(seconds=self.sync_interval)
+            )
+        notes = query.all()
+        indexed = None
+        with self._lock:
+            for note in notes:
+                self._add(note)
+                self._advance(note.updated_at)
+            self._next_sync = self._clock() + self.sync_interval
+            if self.ready and self._clock() >= self._next_prune:
+                self._next_prune = self._clock() + self.prune_interval
+                indexed = list(self._live)
+        if indexed is not None:
+            self._prune(db, indexed)
+        return len(notes)
+
+    def _prune(self, db: Session, indexed: list[int]) -> None:
+        # Looked up without the lock; a dropped segment note stays hidden
+        # until the next compaction writes the segment without it
+        deleted = deleted_note_ids(db, indexed)
+        with self._lock:
+            for note_id in deleted:
+                self._drop(note_id)
+
+    def _advance(self, updated_at: Optional[datetime]) -> None:
+        # Only rows read from the table move the watermark: a local write is
+        # newer than other workers' writes the next sync still has to read
+        if updated_at and (self._watermark is None or updated_at > self._watermark):
+            self._watermark = updated_at
+
+    def compact(self) -> None:
+        """Merge segment and delta into a new segment and reopen it"""
+        with self._lock:
+            write_segment(self.path, self._live, self._merged_postings(), self._watermark)
+            previous, next_sync = self._segment, self._next_sync
+            self._reset()
+            self._open(Segment(self.path))
+            self._next_sync = next_sync
+            self.ready = True
+            if previous is not None:
+                previous.close()
+
+    def _merged_postings(self):
+        merged: dict[str, list[tuple[int, int]]] = {}
+        if self._segment is not None:
+            for term, postings in self._segment.items():
+                live = [(note_id, tf) for note_id, tf in postings if note_id not in self._hidden]
+                if live:
+                    merged[term] = live
+        for term, postings in self._postings.items():
+            merged.setdefault(term, []).extend(postings.items())
+        return merged.items()
+
+    def clear(self) -> None:
+        """Forget everything; the next ensure_ready loads again"""
+        with self._lock:
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+            self._reset()
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _term_postings(self, term: str) -> list[tuple[int, int]]:
+        postings = [(note_id, tf) for note_id, tf in self._segment.postings(term)
+                    if note_id not in self._hidden] if self._segment else []
+        postings.extend(self._postings.get(term, {}).items())
+        return postings
+
+    def search(self, query: str, owner_id: Optional[str] = None,
+               public: bool = False) -> list[tuple[int, float]]:
+        """
+        Rank the notes matching any query term
+        :param query: free text
+        :param owner_id: only notes of this user
+        :param public: only public notes
+        :return: [(note id, score)], best first
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            count = len(self)
+            if not terms or not count:
+                return []
+            average_length = self._total_length / count or 1
+            live = self._live
+            scores: dict[int, float] = defaultdict(float)
+            for term in terms:
+                postings = self._term_postings(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for note_id, tf in postings:
+                    doc = live[note_id]
+                    if (owner_id is not None and doc.owner_id != owner_id) \
+                            or (public and not doc.is_public):
+                        continue
+                    norm = K1 * (1 - B + B * doc.length / average_length)
+                    scores[note_id] += idf * tf * (K1 + 1) / (tf + norm)
+        return sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+
+
+note_index = NoteSearchIndex(settings.NOTE_INDEX_PATH, settings.NOTE_INDEX_SYNC_SECONDS,
+                             prune_interval=settings.NOTE_INDEX_PRUNE_SECONDS)
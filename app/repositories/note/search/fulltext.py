@@ -0,0 +1,32 @@
+"""
+Full-text note search
+
+MySQL serves MATCH ... AGAINST from the FULLTEXT index on notes(title, content)
+instead of scanning every row the way ILIKE '%q%' does. "natural" runs a
+natural-language search, "boolean" accepts the boolean operators (+word,
+-word, "phrase", prefix*). Both rank the matches by relevance.
+
+The FULLTEXT index matches whole words of title and content only; usernames,
+emails, tags and substrings inside words still need the "substring" mode,
+which is also what both modes fall back to on databases without MATCH
+(SQLite in the tests).
+"""
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.db.models import Note
+from app.repositories.note.search.modes import BOOLEAN
+
+
+def fulltext_match(search_query: str, search_mode: str) -> ColumnElement:
+    """
+    MATCH (title, content) AGAINST (search_query); usable both as filter and
+    as relevance score to order by
+    :param search_query:
+    :param search_mode: natural or boolean
+    :return: match expression
+    """
+    expression = match(Note.title, Note.content, against=search_query)
+    if search_mode == BOOLEAN:
+        return expression.in_boolean_mode()
+    return expression.in_natural_language_mode()
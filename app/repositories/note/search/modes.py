@@ -0,0 +1,28 @@
+"""
+Note search modes
+
+substring  ILIKE '%q%' over title, content, tags and author (any database)
+natural    MySQL FULLTEXT, natural-language mode (fulltext.py)
+boolean    MySQL FULLTEXT, boolean mode (fulltext.py)
+bm25       in-process inverted index ranked with BM25 (bm25.py, any database)
+"""
+from sqlalchemy.orm import Session
+
+SUBSTRING = "substring"
+NATURAL = "natural"
+BOOLEAN = "boolean"
+BM25 = "bm25"
+SEARCH_MODES = (SUBSTRING, NATURAL, BOOLEAN, BM25)
+RANKED_MODES = (NATURAL, BOOLEAN, BM25)
+
+
+def resolve_search_mode(db: Session, search_mode: str) -> str:
+    """
+    Search mode actually usable on the session's database
+    :param db:
+    :param search_mode: requested mode
+    :return: search_mode, or substring for a FULLTEXT mode without MySQL
+    """
+    if search_mode in (NATURAL, BOOLEAN) and db.get_bind().dialect.name != "mysql":
+        return SUBSTRING
+    return search_mode
@@ -0,0 +1,86 @@
+"""
+Structured search queries
+
+A search may mix free text with operators that each target one column:
+
+    tag:work title:"q3 plan" author:bob is:public before:2026-01-01 budget
+
+    tag:<tag>           notes carrying the tag (note_tags)
+    title:<text>        title contains text (not content, tags or author)
+    author:<username>   notes of that user (exact username)
+    is:public           public notes, is:private the others
+    before:<date>       created before that day (YYYY-MM-DD)
+    after:<date>        created on or after that day
+
+Values with spaces are quoted. The remaining words are the free text, matched
+by the listing's search_mode as before; unknown operators (e.g. "http:") are
+free text too, and a query without operators is searched exactly as typed.
+NoteManager compiles the operators to predicates on indexed columns, so a
+precise query does not OR an ILIKE over five columns.
+"""
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Optional
+
+OPERATORS = ("tag", "title", "author", "is", "before", "after")
+
+_TOKEN = re.compile(r'(?:(\w+):)?(?:"([^"]*)"?|(\S+))')
+
+
+@dataclass(frozen=True, slots=True)
+class NoteQuery:
+    """
+    A parsed search query: free text plus operator values
+    """
+    text: str = ""
+    tags: tuple[str, ...] = ()
+    titles: tuple[str, ...] = ()
+    authors: tuple[str, ...] = ()
+    is_public: Optional[bool] = None
+    before: Optional[datetime] = None
+    after: Optional[datetime] = None
+
+
+def _day(operator: str, value: str) -> datetime:
+    try:
+        return datetime.combine(date.fromisoformat(value), datetime.min.time())
+    except ValueError:
+        raise ValueError(f"{operator}: expects a date as YYYY-MM-DD, got {value!r}") from None
+
+
+def parse_query(query: str) -> NoteQuery:
+    """
+    Split a search query into free text and operators
+    :param query: raw search string
+    :return: NoteQuery
+    :raises ValueError: on an operator with an invalid value
+    """
+    structured = False
+    words: list[str] = []
+    values: dict[str, list[str]] = {"tag": [], "title": [], "author": []}
+    options: dict = {}
+    for match in _TOKEN.finditer(query or ""):
+        operator, quoted, bare = match.groups()
+        value = (quoted if quoted is not None else bare).strip()
+        operator = (operator or "").lower()
+        structured = structured or operator in OPERATORS
+        if operator in values:
+            if value:
+                values[operator].append(value)
+        elif operator == "is":
+            if value.lower() not in ("public", "private"):
+                raise ValueError(f"is: expects public or private, got {value!r}")
+            options["is_public"] = value.lower() == "public"
+        elif operator in ("before", "after"):
+            options[operator] = _day(operator, value)
+        elif value:
+            words.append(f"{match.group(1)}:{value}" if operator else value)
+    if not structured:
+        # Plain text is searched as typed, quotes and spacing included
+        return NoteQuery(text=(query or "").strip())
+    return NoteQuery(text=" ".join(words),
+                     tags=tuple(values["tag"]),
+                     titles=tuple(values["title"]),
+                     authors=tuple(values["author"]),
+                     **options)
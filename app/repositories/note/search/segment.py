@@ -0,0 +1,186 @@
+"""
+On-disk index segments
+
+A segment is an immutable snapshot of the inverted index in one file, read
+through mmap so a worker can start serving searches without re-reading every
+note: only the document table is decoded at open, terms are looked up by
+binary search over the sorted term table and postings are read on demand.
+
+Layout (little-endian):
+
+    header    magic, doc count, term count, total length, watermark
+    docs      doc count x (note id, length, owner slot, is_public)
+    owners    owner count, then (byte length, utf-8) per owner id
+    term idx  term count x offset of the term entry
+    terms     per term, sorted: byte length, utf-8, postings offset, df
+    postings  per term: df x (doc slot, term frequency)
+
+Segments are written to a temporary file and renamed over the old one, so a
+reader never sees a partial file.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+
+MAGIC = b"NBM25v01"
+_HEADER = struct.Struct("<8sIIQd")
+_DOC = struct.Struct("<qIIB")
+_COUNT = struct.Struct("<I")
+_LENGTH = struct.Struct("<H")
+_OFFSET = struct.Struct("<Q")
+_TERM = struct.Struct("<QI")
+_POSTING = struct.Struct("<II")
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedDoc:
+    """
+    Per-note data the ranking and the scope check need
+    """
+    length: int
+    owner_id: str
+    is_public: bool
+
+
+def write_segment(path: str,
+                  docs: dict[int, IndexedDoc],
+                  postings: Iterable[tuple[str, list[tuple[int, int]]]],
+                  watermark: Optional[datetime]) -> None:
+    """
+    Write a segment atomically
+    :param path: target file
+    :param docs: note id -> IndexedDoc
+    :param postings: (term, [(note id, tf)]), each term once
+    :param watermark: newest note change the segment includes
+    """
+    slots = {note_id: slot for slot, note_id in enumerate(docs)}
+    owners = list(dict.fromkeys(doc.owner_id for doc in docs.values()))
+    owner_slots = {owner: slot for slot, owner in enumerate(owners)}
+
+    term_blob, posting_blob, offsets = bytearray(), bytearray(), []
+    for term, entries in sorted(postings, key=lambda item: item[0]):
+        encoded = term.encode()
+        offsets.append(len(term_blob))
+        term_blob += _LENGTH.pack(len(encoded)) + encoded
+        term_blob += _TERM.pack(len(posting_blob), len(entries))
+        for note_id, tf in entries:
+            posting_blob += _POSTING.pack(slots[note_id], tf)
+
+    owner_blob = bytearray(_COUNT.pack(len(owners)))
+    for owner in owners:
+        encoded = owner.encode()
+        owner_blob += _LENGTH.pack(len(encoded)) + encoded
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(docs), len(offsets),
+                             sum(doc.length for doc in docs.values()),
+                             watermark.timestamp() if watermark else 0.0))
+        for note_id, doc in docs.items():
+            f.write(_DOC.pack(note_id, doc.length, owner_slots[doc.owner_id], doc.is_public))
+        f.write(owner_blob)
+        for offset in offsets:
+            f.write(_OFFSET.pack(offset))
+        f.write(term_blob)
+        f.write(posting_blob)
+    os.replace(tmp_path, path)
+
+
+class Segment:
+    """
+    Read-only view of a segment file.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, doc_count, self.term_count, self.total_length, watermark = \
+            _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a note index segment")
+        self.watermark = datetime.fromtimestamp(watermark) if watermark else None
+
+        position = _HEADER.size
+        raw_docs = list(_DOC.iter_unpack(self._map[position:position + doc_count * _DOC.size]))
+        position += doc_count * _DOC.size
+
+        (owner_count,) = _COUNT.unpack_from(self._map, position)
+        position += _COUNT.size
+        owners = []
+        for _ in range(owner_count):
+            (length,) = _LENGTH.unpack_from(self._map, position)
+            position += _LENGTH.size
+            owners.append(self._map[position:position + length].decode())
+            position += length
+
+        self._ids = [note_id for note_id, _, _, _ in raw_docs]
+        self.docs = {note_id: IndexedDoc(length, owners[owner], bool(public))
+                     for note_id, length, owner, public in raw_docs}
+        self._term_index = position
+        self._terms = position + self.term_count * _OFFSET.size
+        self._postings = self._terms + self._term_blob_size()
+
+    def _term_blob_size(self) -> int:
+        if not self.term_count:
+            return 0
+        position = self._term_at(self.term_count - 1)
+        (length,) = _LENGTH.unpack_from(self._map, position)
+        return position - self._terms + _LENGTH.size + length + _TERM.size
+
+    def _term_at(self, slot: int) -> int:
+        (offset,) = _OFFSET.unpack_from(self._map, self._term_index + slot * _OFFSET.size)
+        return self._terms + offset
+
+    def _read_term(self, slot: int) -> tuple[bytes, int, int]:
+        position = self._term_at(slot)
+        (length,) = _LENGTH.unpack_from(self._map, position)
+        position += _LENGTH.size
+        term = self._map[position:position + length]
+        offset, df = _TERM.unpack_from(self._map, position + length)
+        return term, offset, df
+
+    def _read_postings(self, offset: int, df: int) -> list[tuple[int, int]]:
+        start = self._postings + offset
+        values = array("I", self._map[start:start + df * _POSTING.size])
+        if sys.byteorder == "big":
+            values.byteswap()
+        return list(zip(map(self._ids.__getitem__, values[0::2]), values[1::2]))
+
+    def postings(self, term: str) -> list[tuple[int, int]]:
+        """
+        Postings of a term, found by binary search over the term table
+        :param term:
+        :return: [(note id, tf)], empty when the term is unknown
+        """
+        target = term.encode()
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            current, offset, df = self._read_term(middle)
+            if current == target:
+                return self._read_postings(offset, df)
+            if current < target:
+                low = middle + 1
+            else:
+                high = middle
+        return []
+
+    def items(self) -> Iterator[tuple[str, list[tuple[int, int]]]]:
+        """
+        Every term with its postings, in term order
+        :return: iterator of (term, [(note id, tf)])
+        """
+        for slot in range(self.term_count):
+            term, offset, df = self._read_term(slot)
+            yield term.decode(), self._read_postings(offset, df)
+
+    def close(self) -> None:
+        """Release the mapping"""
+        self._map.close()
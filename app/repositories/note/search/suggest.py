@@ -0,0 +1,141 @@
+"""
+Prefix suggestions over note titles and tags
+
+Autocomplete used to run the full listing (ILIKE + COUNT) on each keystroke.
+This index keeps, per user, a sorted array of (key, kind, text) entries: the
+key is the normalized title or tag (see trigram.normalize), plus the rest of
+the title from each later word, so "plan" completes "Sprint plan". The
+entries starting with a prefix are a contiguous run found by bisect, and
+only the first SCAN_LIMIT of them are ranked.
+
+Titles and tags shared by several notes are one entry, counted per note;
+the most used ones are suggested first. Like the trigram index it is a
+SyncedIndex, synced from notes.updated_at every NOTE_INDEX_SYNC_SECONDS;
+notes deleted on other workers lose their suggestions at the next prune,
+every NOTE_INDEX_PRUNE_SECONDS.
+"""
+import re
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Callable
+
+from app.core.settings import settings
+from app.db.models import Note
+from app.repositories.note.search.synced import SyncedIndex
+from app.repositories.note.search.trigram import normalize
+
+TITLE = "title"
+TAG = "tag"
+SCAN_LIMIT = 256
+
+_WORD = re.compile(r"\w+")
+
+
+def suggestion_keys(text: str) -> set[str]:
+    """
+    Keys a title or tag is found under: its normalized text from each word on
+    :param text:
+    :return: set of keys
+    """
+    normalized = normalize(text)
+    return {normalized[word.start():] for word in _WORD.finditer(normalized)}
+
+
+def note_terms(note) -> tuple[tuple[str, str], ...]:
+    """
+    Suggestions a note contributes: its title and tags
+    :param note: Note or any object with the same attributes
+    :return: distinct (kind, text) pairs
+    """
+    terms = {(TITLE, (note.title or "").strip())}
+    terms.update((TAG, str(tag).strip()) for tag in note.tags or [])
+    return tuple(term for term in terms if term[1])
+
+
+class SuggestIndex(SyncedIndex):
+    """
+    Per-user sorted arrays of title and tag keys, for prefix completion.
+    """
+    name = "Suggest index"
+    columns = (Note.id, Note.user_id, Note.title, Note.tags, Note.updated_at)
+
+    def __init__(self, sync_interval: float = 30,
+                 clock: Callable[[], float] = time.monotonic,
+                 prune_interval: float = 600):
+        self._keys: dict[str, list[tuple[str, str, str]]] = {}
+        self._counts: dict[str, Counter] = {}
+        self._notes: dict[int, tuple[str, tuple[tuple[str, str], ...]]] = {}
+        super().__init__(sync_interval, clock, prune_interval)
+
+    def __len__(self) -> int:
+        return len(self._notes)
+
+    def _ids(self):
+        return self._notes.keys()
+
+    def _add(self, note) -> None:
+        self._drop(note.id)
+        owner, terms = str(note.user_id), note_terms(note)
+        self._notes[note.id] = (owner, terms)
+        counts = self._counts.setdefault(owner, Counter())
+        keys = self._keys.setdefault(owner, [])
+        for kind, text in terms:
+            counts[kind, text] += 1
+            if counts[kind, text] > 1:
+                continue
+            for key in suggestion_keys(text):
+                # The first build appends and sorts once in _built
+                if self.ready:
+                    insort(keys, (key, kind, text))
+                else:
+                    keys.append((key, kind, text))
+
+    def _drop(self, note_id: int) -> None:
+        owner, terms = self._notes.pop(note_id, (None, ()))
+        for kind, text in terms:
+            counts = self._counts[owner]
+            counts[kind, text] -= 1
+            if counts[kind, text]:
+                continue
+            del counts[kind, text]
+            keys = self._keys[owner]
+            for key in suggestion_keys(text):
+                del keys[bisect_left(keys, (key, kind, text))]
+
+    def _reset(self) -> None:
+        self._keys = {}
+        self._counts = {}
+        self._notes = {}
+
+    def _built(self) -> None:
+        for keys in self._keys.values():
+            keys.sort()
+
+    def suggest(self, owner_id: str, prefix: str, limit: int = 10) -> list[dict]:
+        """
+        Titles and tags of a user's notes with a word starting with prefix
+        :param owner_id:
+        :param prefix: typed text, compared case- and accent-insensitively
+        :param limit: number of suggestions
+        :return: [{"text", "kind"}], most used first, then alphabetically
+        """
+        prefix = normalize(prefix).lstrip()
+        if not prefix:
+            return []
+        with self._lock:
+            keys = self._keys.get(owner_id, [])
+            counts = self._counts.get(owner_id, Counter())
+            found: dict[tuple[str, str], int] = {}
+            start = bisect_left(keys, (prefix,))
+            for key, kind, text in keys[start:start + SCAN_LIMIT]:
+                if not key.startswith(prefix):
+                    break
+                found[kind, text] = counts[kind, text]
+        ranked = sorted(found.items(),
+                        key=lambda item: (-item[1], item[0][1].casefold(), item[0][0]))
+        return [{"text": text, "kind": kind} for (kind, text), _ in ranked[:limit]]
+
+
+suggest_index = SuggestIndex(settings.NOTE_INDEX_SYNC_SECONDS,
+                             prune_interval=settings.NOTE_INDEX_PRUNE_SECONDS)
@@ -0,0 +1,200 @@
+"""
+Base class of the in-memory note indexes (trigram, suggest)
+
+Each index is built from the notes table on first use, follows the writes
+NoteManager makes on this worker and picks up other workers' writes from
+notes.updated_at every sync interval, like the revocation set does for
+revoked_tokens. Notes deleted on other workers do not change updated_at:
+every prune interval a sync also drops the indexed ids missing from the
+table, looked up in batches without holding the index lock. Subclasses say
+how a note is indexed and forgotten.
+
+Only one request builds an index; until it is ready the others go on
+without it (add and remove are no-ops, callers fall back to the query).
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.models import Note
+from app.repositories.logger.repository import LoggerService
+
+logger = LoggerService().logger
+
+PRUNE_BATCH = 500
+
+
+def deleted_note_ids(db: Session, ids: Iterable[int]) -> list[int]:
+    """
+    Indexed ids no longer in the notes table, looked up PRUNE_BATCH ids at a
+    time on the primary key. Ids above the largest one in the table may be
+    notes written on this worker after the session's snapshot and are kept.
+    :param db:
+    :param ids: indexed note ids
+    :return: ids of the notes deleted
+    """
+    newest = db.query(func.max(Note.id)).scalar() or 0
+    ids = sorted(note_id for note_id in ids if note_id <= newest)
+    deleted = []
+    for start in range(0, len(ids), PRUNE_BATCH):
+        batch = ids[start:start + PRUNE_BATCH]
+        found = {note_id for (note_id,) in db.query(Note.id).filter(Note.id.in_(batch))}
+        deleted.extend(note_id for note_id in batch if note_id not in found)
+    return deleted
+
+
+class SyncedIndex(ABC):
+    """
+    In-memory index over the notes table, synced from notes.updated_at.
+    Subclasses implement __len__, _ids, _add, _drop and _reset, and may
+    narrow the columns read.
+    """
+    name = "Note index"
+    columns: tuple = (Note,)
+
+    def __init__(self, sync_interval: float = 30,
+                 clock: Callable[[], float] = time.monotonic,
+                 prune_interval: float = 600):
+        self.sync_interval = sync_interval
+        self.prune_interval = prune_interval
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._watermark: Optional[datetime] = None
+        self._next_sync = 0.0
+        self._next_prune = 0.0
+        self.ready = False
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of indexed notes"""
+
+    @abstractmethod
+    def _ids(self) -> Iterable[int]:
+        """Ids of the indexed notes"""
+
+    @abstractmethod
+    def _add(self, note) -> None:
+        """Index a note, replacing any previous version"""
+
+    @abstractmethod
+    def _drop(self, note_id: int) -> None:
+        """Forget a note, if indexed"""
+
+    @abstractmethod
+    def _reset(self) -> None:
+        """Empty the index structures"""
+
+    def _built(self) -> None:
+        """Called once the first sync has read every note"""
+
+    def add(self, note) -> None:
+        """
+        Index a note written on this worker, replacing any previous version.
+        Ignored until the index is loaded, the load reads it from the table.
+        :param note: Note
+        """
+        if not self.ready:
+            return
+        with self._lock:
+            if self.ready:
+                self._add(note)
+
+    def remove(self, note_id: int) -> None:
+        """
+        Drop a note deleted on this worker
+        :param note_id:
+        """
+        if not self.ready:
+            return
+        with self._lock:
+            if self.ready:
+                self._drop(note_id)
+
+    def ensure_ready(self, db: Session) -> None:
+        """
+        Build the index on first use, then sync when due. While another
+        request builds it, return at once: the index is not ready yet.
+        :param db:
+        """
+        if self.ready:
+            if self._clock() >= self._next_sync:
+                self.sync(db)
+            return
+        # Not a with block: the requests that lose the race must not wait
+        if not self._build_lock.acquire(blocking=False):  # pylint: disable=consider-using-with
+            return
+        try:
+            with self._lock:
+                if not self.ready:
+                    self.clear()
+                    self.sync(db)
+                    self._built()
+                    self._next_prune = self._clock() + self.prune_interval
+                    self.ready = True
+                    logger.info("%s: built from database (%d notes)", self.name, len(self))
+        finally:
+            self._build_lock.release()
+
+    def sync(self, db: Session) -> int:
+        """
+        Index notes updated since the watermark (every note on the first
+        call), with an overlap of one sync interval for late commits, and
+        every prune interval drop the indexed notes no longer in the table
+        :param db:
+        :return: number of notes read
+        """
+        query = db.query(*self.columns)
+        if self._watermark is not None:
+            query = query.filter(
+                Note.updated_at >= self._watermark - timedelta(seconds=self.sync_interval)
+            )
+        count = 0
+        indexed = None
+        with self._lock:
+            for note in query.yield_per(1000):
+                self._add(note)
+                self._advance(note.updated_at)
+                count += 1
+            self._next_sync = self._clock() + self.sync_interval
+            if self.ready and self._clock() >= self._next_prune:
+                self._next_prune = self._clock() + self.prune_interval
+                indexed = list(self._ids())
+        if indexed is not None:
+            # Looked up without the lock: suggestions and lookups go on
+            deleted = deleted_note_ids(db, indexed)
+            with self._lock:
+                for note_id in deleted:
+                    self._drop(note_id)
+        return count
+
+    def _advance(self, updated_at: Optional[datetime]) -> None:
+        # Only rows read from the table move the watermark: a local write is
+        # newer than other workers' writes the next sync still has to read
+        if updated_at and (self._watermark is None or updated_at > self._watermark):
+            self._watermark = updated_at
+
+    def unsynced_since(self) -> datetime:
+        """
+        Notes updated at or after this time may be missing from the index
+        :return: watermark minus the sync overlap
+        """
+        with self._lock:
+            if self._watermark is None:
+                return datetime.min
+            return self._watermark - timedelta(seconds=self.sync_interval)
+
+    def clear(self) -> None:
+        """Forget everything; the next ensure_ready rebuilds"""
+        with self._lock:
+            self._reset()
+            self._watermark = None
+            self._next_sync = 0.0
+            self._next_prune = 0.0
+            self.ready = False
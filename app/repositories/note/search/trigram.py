@@ -0,0 +1,146 @@
+"""
+Trigram index for substring search
+
+ILIKE '%q%' cannot use a B-tree index, so the substring search reads the
+title and content of every note in scope. This index maps each trigram
+(three consecutive characters) of a note's title and content to the notes
+containing it. Any note matching '%q%' contains every trigram of q, so the
+intersection of their sets is a superset of the matches: the SQL query keeps
+the exact ILIKE check and only runs it on those candidates, returning the
+same rows as before.
+
+Text is case-folded and stripped of accents before splitting, which is at
+least as loose as the MySQL *_ci collations, so narrowing never drops a row
+the collation would match. Queries shorter than three characters, or using
+the LIKE wildcards % and _, are not narrowed.
+
+The index lives in memory and is kept like the other SyncedIndex ones: built
+from the notes table on first use, following NoteManager writes and syncing
+other workers' writes from notes.updated_at every NOTE_INDEX_SYNC_SECONDS.
+Until then those notes may be missing, so callers also check every note
+updated since unsynced_since().
+
+Memory is the postings plus the normalized title and content of each note,
+from which a note's trigrams are derived again when it is dropped.
+NOTE_TRIGRAM_INDEX turns the index off; past NOTE_TRIGRAM_MAX_NOTES notes it
+frees itself and turns off, and substring searches scan as before.
+"""
+import time
+import unicodedata
+from typing import Callable, Optional
+
+from app.core.settings import settings
+from app.repositories.logger.repository import LoggerService
+from app.repositories.note.search.synced import SyncedIndex
+
+logger = LoggerService().logger
+
+MAX_CANDIDATES = 2000
+
+
+def normalize(text: str) -> str:
+    """
+    Case-fold and strip accents
+    :param text:
+    :return: normalized text
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def trigrams(text: str) -> set[str]:
+    """
+    Trigrams of the normalized text
+    :param text:
+    :return: set of three character strings
+    """
+    return _trigrams(normalize(text))
+
+
+def _trigrams(normalized: str) -> set[str]:
+    return {normalized[i:i + 3] for i in range(len(normalized) - 2)}
+
+
+class TrigramIndex(SyncedIndex):
+    """
+    Trigram -> note ids, narrowing substring searches to candidate notes.
+    """
+    name = "Trigram index"
+
+    def __init__(self, sync_interval: float = 30,
+                 clock: Callable[[], float] = time.monotonic,
+                 enabled: bool = True, max_notes: int = 0,
+                 prune_interval: float = 600):
+        self.enabled = enabled
+        self.max_notes = max_notes
+        self._notes: dict[str, set[int]] = {}
+        # note id -> (owner id, is public, normalized title and content)
+        self._docs: dict[int, tuple[str, bool, str]] = {}
+        super().__init__(sync_interval, clock, prune_interval)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _ids(self):
+        return self._docs.keys()
+
+    def _add(self, note) -> None:
+        if not self.enabled:
+            return
+        self._drop(note.id)
+        if self.max_notes and len(self._docs) >= self.max_notes:
+            logger.warning("%s: over %d notes, turned off", self.name, self.max_notes)
+            self.enabled = False
+            self._reset()
+            return
+        # Title and content are joined: grams across the join only add candidates
+        text = f"{normalize(note.title or '')}\n{normalize(note.content or '')}"
+        self._docs[note.id] = (str(note.user_id), bool(note.is_public), text)
+        for gram in _trigrams(text):
+            self._notes.setdefault(gram, set()).add(note.id)
+
+    def _drop(self, note_id: int) -> None:
+        doc = self._docs.pop(note_id, None)
+        if doc is None:
+            return
+        for gram in _trigrams(doc[2]):
+            notes = self._notes[gram]
+            notes.discard(note_id)
+            if not notes:
+                del self._notes[gram]
+
+    def _reset(self) -> None:
+        self._notes = {}
+        self._docs = {}
+
+    def candidates(self, search_query: str, owner_id: Optional[str] = None,
+                   public: bool = False) -> Optional[set[int]]:
+        """
+        Notes that may contain search_query in title or content
+        :param search_query: raw substring, as given to ILIKE
+        :param owner_id: only notes of this user
+        :param public: only public notes
+        :return: candidate ids, or None when the query cannot be narrowed
+        """
+        if "%" in search_query or "_" in search_query or "\\" in search_query:
+            return None
+        grams = trigrams(search_query)
+        if not grams or not self.ready:
+            return None
+        with self._lock:
+            if not self.ready or not self.enabled:
+                return None
+            postings = sorted((self._notes.get(gram, set()) for gram in grams), key=len)
+            found = set(postings[0]).intersection(*postings[1:])
+            found = {note_id for note_id in found
+                     if (owner_id is None or self._docs[note_id][0] == owner_id)
+                     and (not public or self._docs[note_id][1])}
+        if len(found) > MAX_CANDIDATES:
+            return None
+        return found
+
+
+trigram_index = TrigramIndex(settings.NOTE_INDEX_SYNC_SECONDS,
+                             enabled=settings.NOTE_TRIGRAM_INDEX,
+                             max_notes=settings.NOTE_TRIGRAM_MAX_NOTES,
+                             prune_interval=settings.NOTE_INDEX_PRUNE_SECONDS)
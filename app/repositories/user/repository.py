@@ -6,9 +6,13 @@ from typing import Optional
 
 from fastapi import HTTPException
 from pydantic.v1 import EmailStr
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 
+from app.core.auth.passwords import password_hasher
+from app.core.auth.principal import Principal
+from app.core.auth.principal_cache import principal_cache
+from app.core.cache import invalidate_notes
 from app.core.exceptions.user import UserErrorHandler
 from app.core.security import generate_user_token_and_return_user, decode_access_token
 from app.db.models import Audit
@@ -20,6 +24,10 @@ from app.repositories.logger.repository import LoggerService
 
 logger = LoggerService().logger
 
+# Columns read into UserDTO by the user listings, without loading User models
+USER_COLUMNS = (User.id, User.username, User.email, User.role, User.picture_url,
+                User.created_at, User.updated_at)
+
 
 class UserManager:
     """
@@ -53,7 +61,7 @@ class UserManager:
             self.db.rollback()
             raise UserErrorHandler.raise_server_error(str(e))
 
-    def _reset_password_with_token(self, token: str, new_password: str) -> Optional[dict]:
+    async def _reset_password_with_token(self, token: str, new_password: str) -> Optional[dict]:
         """
         Reset password using Google token
         :param token: JWT token
@@ -73,8 +81,9 @@ class UserManager:
                 logger.error("User not found with payload: %s", payload)
                 UserErrorHandler.raise_user_not_found()
 
-            user.set_password(new_password)
+            user.hashed_password = await password_hasher.hash(new_password)
             self.db.commit()
+            principal_cache.invalidate(user.id)
 
             return {"message": "Password reset successful"}
 
@@ -83,7 +92,7 @@ class UserManager:
             UserErrorHandler.raise_server_error(e.args[0])
             return None
 
-    def _generate_user_token_and_return_user(self, current_user: User) -> dict:
+    def _generate_user_token_and_return_user(self, current_user: Principal) -> dict:
         """
         Generate user token and return user with refreshed token
         :param current_user: Current user object
@@ -115,7 +124,7 @@ class UserManager:
                 UserErrorHandler.raise_user_exists()
 
             new_user = User(username=user.username, email=user.email, role=user.role)
-            new_user.set_password(user.password)
+            new_user.hashed_password = await password_hasher.hash(user.password)
 
             email_schema = EmailSchema(
                 username=new_user.username,
@@ -159,6 +168,7 @@ class UserManager:
                 description="Reset password"
             )
             self.db.commit()
+            principal_cache.invalidate(user.id)
 
             return {"user": UserDTO.from_model(user),
                     "message": "Password reset successfully"}
@@ -166,7 +176,7 @@ class UserManager:
             self.db.rollback()
             raise UserErrorHandler.raise_server_error(e.args[0])
 
-    def get_user(self, current_user: User) -> dict:
+    def get_user(self, current_user: Principal) -> dict:
         """
         Get user info by id
         :param current_user:
@@ -184,28 +194,28 @@ class UserManager:
             self.db.rollback()
             raise UserErrorHandler.raise_server_error(e.args[0])
 
-    def get_users(self, current_user: User) -> list[dict]:
+    def get_users(self, current_user: Principal) -> list[UserDTO]:
         """
         Get users info by id
         :param current_user:
-        :return: User
+        :return: UserDTO list, serialised by the endpoint
         """
         try:
-            users = self.db.query(User).all()
             if current_user.role != "ADMIN":
                 UserErrorHandler.raise_unauthorized_user_action()
+            users = [UserDTO.from_row(row) for row in self.db.execute(select(*USER_COLUMNS))]
 
             CommonService(self.db).log_action(
                 user_id=current_user.id,
                 action="Get users",
                 description="Get users"
             )
-            return [UserDTO.from_model(user) for user in users]
+            return users
         except IndexError as e:
             self.db.rollback()
             return UserErrorHandler.raise_server_error(e.args[0])
 
-    def update_user(self, current_user: User, user_data) -> dict:
+    def update_user(self, current_user: Principal, user_data) -> dict:
         """
         Update user info
         :param current_user:
@@ -213,7 +223,7 @@ class UserManager:
         :return: User
         """
         try:
-            user = self._get_user(user_id=current_user.id)
+            user = CommonService(self.db).load_user(current_user)
 
             if user.id != current_user.id:
                 UserErrorHandler.raise_unauthorized_user_action()
@@ -231,6 +241,8 @@ class UserManager:
                 description="Update user"
             )
             self.db.commit()
+            principal_cache.invalidate(user.id)
+            invalidate_notes(user.id, public=True)
             self.db.refresh(user)
 
             return {'user': UserDTO.from_model(user),
@@ -239,14 +251,14 @@ class UserManager:
             self.db.rollback()
             return UserErrorHandler.raise_server_error(e.args[0])
 
-    def delete_user(self, current_user: User) -> Optional[dict]:
+    def delete_user(self, current_user: Principal) -> Optional[dict]:
         """
         Delete user
         :param current_user:
         :return: User
         """
         try:
-            user = self._get_user(user_id=current_user.id)
+            user = CommonService(self.db).load_user(current_user)
 
             if user.id != current_user.id:
                 UserErrorHandler.raise_unauthorized_user_action()
@@ -261,6 +273,8 @@ class UserManager:
                 self.db.query(Audit).filter(Audit.user_id == user.id).delete()
                 self.db.delete(user)
                 self.db.commit()
+                principal_cache.invalidate(current_user.id)
+                invalidate_notes(current_user.id, public=True)
                 return {"message": "User deleted successfully"}
 
         except IndexError as e:
@@ -291,7 +305,9 @@ class UserManager:
                 self._generate_user_token_and_return_user(current_user)
             }
 
-            return await actions[action]() if action == "register_user" else actions[action]()
+            if action in ("register_user", "reset_password"):
+                return await actions[action]()
+            return actions[action]()
         except IndexError as e:
             self.db.rollback()
             return UserErrorHandler.raise_server_error(str(e))
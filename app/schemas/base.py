@@ -27,6 +27,10 @@ class PaginatedResponse(BaseModel, Generic[T]):
         has_prev (bool): Indicates if there is a preceding page available.
         search_query (Optional[str]): An optional query string that was used to
                                       filter the dataset, if applicable.
+        next_cursor (Optional[str]): Opaque cursor to pass back for the next page
+                                     (keyset pagination), None on the last page.
+        total_is_estimate (bool): True when total comes from the count cache and may
+                                  lag writes not yet seen by this instance.
     """
     items: List[T]
     total: int
@@ -36,3 +40,5 @@ class PaginatedResponse(BaseModel, Generic[T]):
     has_next: bool
     has_prev: bool
     search_query: Optional[str] = None
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
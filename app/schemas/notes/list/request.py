@@ -1,8 +1,15 @@
 """
 Note listing request schema
 """
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
+from app.dto.note.note_dto import NOTE_FIELDS
+
+_FIELD = "|".join(NOTE_FIELDS)
+FIELDS_PATTERN = rf"^({_FIELD})(,({_FIELD}))*$"
+
 
 class NoteQueryParams(BaseModel):
     """Query parameters for note listing endpoints"""
@@ -10,4 +17,47 @@ class NoteQueryParams(BaseModel):
     page_size: int = Field(default=10)
     sort_order: str = Field(default="asc", pattern="^(asc|desc)$")
     sort_by: str = Field(default="created_at", pattern="^(created_at|updated_at)$")
-    query: str = Field(default="", max_length=100)
+    query: str = Field(default="", max_length=100,
+                       description="free text, optionally with tag:, title:, author:, "
+                                   "is:public|private, before: and after: (YYYY-MM-DD) "
+                                   "operators")
+    cursor: Optional[str] = Field(default=None, max_length=512,
+                                  description="next_cursor of the previous page; "
+                                              "overrides page")
+    include_total: bool = Field(default=False,
+                                description="count the total exactly instead of "
+                                            "reusing the cached count")
+    tag: Optional[str] = Field(default=None, min_length=1, max_length=50,
+                               description="only notes carrying this tag")
+    fields: Optional[str] = Field(default=None, max_length=200, pattern=FIELDS_PATTERN,
+                                  description="comma separated keys of each item (id is "
+                                              "always included), e.g. id,title,excerpt,"
+                                              "author; only their columns are read")
+    excerpt_length: Optional[int] = Field(default=None, ge=1, le=1000,
+                                          description="add an excerpt of the content of "
+                                                      "at most this many characters")
+    search_mode: str = Field(default="substring",
+                             pattern="^(substring|natural|boolean|bm25)$",
+                             description="substring matches anywhere in title, content, "
+                                         "tags and author; natural and boolean use the "
+                                         "MySQL FULLTEXT index on title and content, bm25 "
+                                         "the in-process index on title, content and tags. "
+                                         "Ranked modes order by relevance and page by "
+                                         "number only")
+
+
+class NoteSearchParams(BaseModel):
+    """Query parameters for the note search endpoint"""
+    query: str = Field(min_length=1, max_length=100,
+                       description="free text, optionally with tag:, title:, author:, "
+                                   "is:public|private, before: and after: operators")
+    search_mode: str = Field(default="substring",
+                             pattern="^(substring|natural|boolean|bm25)$")
+    page: int = Field(default=1, ge=1)
+    page_size: int = Field(default=10, ge=1, le=50)
+    cursor: Optional[str] = Field(default=None, max_length=512,
+                                  description="next_cursor of the previous page; "
+                                              "overrides page")
+    full_content: bool = Field(default=False,
+                               description="return the whole content instead of a "
+                                           "snippet around the match")
@@ -30,6 +30,33 @@ class NoteOut(NoteBase):
     user: UserBase
 
 
+class NoteSearchOut(NoteOut):
+    """
+    NoteSearchOut Model: a search hit, with a snippet instead of the content
+    unless the whole content was asked for
+    """
+    content: Optional[str] = None
+    snippet: Optional[str] = None
+
+
+class NoteListItem(BaseModel):
+    """
+    NoteListItem Model: a listed note, with only the fields that were asked
+    for (fields=), the excerpt and author included
+    """
+    id: int
+    title: Optional[str] = None
+    content: Optional[str] = None
+    excerpt: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    is_public: Optional[bool] = None
+    tags: Optional[List[str]] = None
+    image_url: Optional[str] = None
+    user: Optional[UserBase] = None
+    author: Optional[str] = None
+
+
 class NoteCreate(NoteBase):
     """
     NoteCreate Model
@@ -53,3 +80,19 @@ class NoteDelete(BaseModel):
     """
     id_note: int
     result: str
+
+
+class TagFacet(BaseModel):
+    """
+    TagFacet Model: how many of the user's notes carry a tag
+    """
+    tag: str
+    count: int
+
+
+class NoteSuggestion(BaseModel):
+    """
+    NoteSuggestion Model: a title or tag completing the typed prefix
+    """
+    text: str
+    kind: str = Field(description="title or tag")
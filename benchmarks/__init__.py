@@ -0,0 +1,4 @@
+"""
+Micro benchmarks. Run from the repository root, e.g.
+``uv run python -m benchmarks.rate_limit``.
+"""
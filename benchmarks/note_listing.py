@@ -0,0 +1,109 @@
+"""
+Note listing pages: Note models vs rows hydrated into NoteDTOs.
+
+Seeds a throwaway SQLite database with synthetic notes, then reads pages of
+one owner's listing the way NoteManager used to (Note models with the author
+joinedloaded, then NoteDTO.from_model) and the way it does now (selected
+columns into slotted NoteDTOs), plus a sparse fieldset with an excerpt. Each
+page runs on a fresh session, like a request; allocations are the peak
+traced by tracemalloc while building one page of items.
+
+    uv run python -m benchmarks.note_listing [notes] [pages]
+"""
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, joinedload
+
+from app.db.models import Base, Note, User
+from app.dto.note.note_dto import NoteDTO
+from app.repositories.note.repository import note_columns
+
+_OWNERS = 20
+_PAGE_SIZE = 50
+
+
+def _seed(db: Session, notes: int) -> str:
+    rng = random.Random(42)
+    words = [f"word{i}" for i in range(2000)]
+    owners = [User(username=f"user{i}", email=f"user{i}@example.com",
+                   hashed_password="x") for i in range(_OWNERS)]
+    db.add_all(owners)
+    db.flush()
+    start = datetime.now() - timedelta(days=30)
+    db.add_all(Note(user_id=rng.choice(owners).id,
+                    title=" ".join(rng.choices(words, k=4)),
+                    content=" ".join(rng.choices(words, k=rng.randint(100, 600))),
+                    tags=rng.sample(words, 3),
+                    created_at=start + timedelta(minutes=i),
+                    updated_at=start + timedelta(minutes=i))
+               for i in range(notes))
+    db.commit()
+    return owners[0].id
+
+
+def _orm_page(db: Session, owner: str, offset: int) -> list[dict]:
+    notes = (db.query(Note).join(User).options(joinedload(Note.user))
+             .filter(Note.user_id == owner)
+             .order_by(Note.created_at.desc(), Note.id.desc())
+             .offset(offset).limit(_PAGE_SIZE).all())
+    return [NoteDTO.from_model(note) for note in notes]
+
+
+def _row_page(fields, excerpt_length=200):
+    def page(db: Session, owner: str, offset: int) -> list[dict]:
+        rows = (db.query(Note).join(User)
+                .filter(Note.user_id == owner)
+                .order_by(Note.created_at.desc(), Note.id.desc())
+                .with_entities(*note_columns(fields, excerpt_length))
+                .offset(offset).limit(_PAGE_SIZE).all())
+        return [NoteDTO.from_model(NoteDTO.from_row(row), fields, excerpt_length)
+                for row in rows]
+    return page
+
+
+def _measure(engine, page, owner: str, offsets: list[int]) -> tuple[float, float]:
+    elapsed = peak = 0.0
+    for offset in offsets:
+        with Session(engine) as db:
+            start = time.perf_counter()
+            page(db, owner, offset)
+            elapsed += time.perf_counter() - start
+        with Session(engine) as db:
+            tracemalloc.start()
+            page(db, owner, offset)
+            peak += tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return elapsed / len(offsets) * 1000, peak / len(offsets) / 1024
+
+
+def main(notes: int = 20000, pages: int = 50) -> None:
+    """Print milliseconds and peak KiB per page for each variant."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'notes.db'}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            owner = _seed(db, notes)
+        owned = notes // _OWNERS
+        rng = random.Random(7)
+        offsets = [rng.randrange(0, max(1, owned - _PAGE_SIZE)) for _ in range(pages)]
+        variants = [
+            ("Note models + from_model", _orm_page),
+            ("rows into NoteDTO", _row_page(None)),
+            ("rows, fields=id,title,excerpt,author",
+             _row_page(("id", "title", "excerpt", "author"))),
+        ]
+        print(f"{notes} notes, {_OWNERS} owners, {pages} pages of {_PAGE_SIZE}")
+        for name, page in variants:
+            page_ms, peak_kib = _measure(engine, page, owner, offsets)
+            print(f"{name:<40} {page_ms:>8.2f} ms/page {peak_kib:>10.1f} KiB peak/page")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,102 @@
+"""
+Note search: ILIKE substring query vs the in-process BM25 index.
+
+Seeds a throwaway SQLite database with synthetic notes spread over a few
+owners, then times one owner's search both ways: the substring filter of
+NoteManager (which scans every row of the owner) and NoteSearchIndex.search
+followed by fetching the top page by id. Also reports how long the index
+takes to build from the table and to reopen from its mmap'd segment.
+
+    uv run python -m benchmarks.note_search [notes] [queries]
+"""
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, or_
+from sqlalchemy.orm import Session
+
+from app.db.models import Base, Note, User
+from app.repositories.note.search.bm25 import NoteSearchIndex
+
+_OWNERS = 20
+_PAGE_SIZE = 10
+
+
+def _seed(db: Session, notes: int, vocabulary: list[str]) -> list[str]:
+    rng = random.Random(42)
+    owners = [User(username=f"user{i}", email=f"user{i}@example.com",
+                   hashed_password="x") for i in range(_OWNERS)]
+    db.add_all(owners)
+    db.flush()
+    start = datetime.now() - timedelta(days=30)
+    db.add_all(Note(user_id=rng.choice(owners).id,
+                    title=" ".join(rng.choices(vocabulary, k=4)),
+                    content=" ".join(rng.choices(vocabulary, k=rng.randint(20, 120))),
+                    tags=rng.sample(vocabulary, 2),
+                    is_public=rng.random() < 0.3,
+                    created_at=start + timedelta(minutes=i),
+                    updated_at=start + timedelta(minutes=i))
+               for i in range(notes))
+    db.commit()
+    return [owner.id for owner in owners]
+
+
+def _timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(notes: int = 20000, queries: int = 50) -> None:
+    """Print milliseconds per search for each variant."""
+    rng = random.Random(7)
+    vocabulary = [f"{word}{i}" for i, word in
+                  enumerate(["alpha", "budget", "travel", "recipe", "draft"] * 400)]
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'notes.db'}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            owners = _seed(db, notes, vocabulary)
+            terms = rng.sample(vocabulary, queries)
+            owner = owners[0]
+
+            def ilike(term=None):
+                search = f"%{term or rng.choice(terms)}%"
+                db.query(Note).join(User).filter(Note.user_id == owner).filter(
+                    or_(Note.title.ilike(search), Note.content.ilike(search),
+                        Note.tags.contains(search), User.username.ilike(search),
+                        User.email.ilike(search))
+                ).order_by(Note.created_at.desc()).limit(_PAGE_SIZE).all()
+
+            in_memory = NoteSearchIndex()
+            build_ms = _timed(lambda: in_memory.rebuild(db), 1)
+            segment = str(Path(tmp) / "notes.seg")
+            NoteSearchIndex(segment).rebuild(db)
+            reopened = NoteSearchIndex(segment)
+            open_ms = _timed(lambda: reopened.ensure_ready(db), 1)
+
+            def bm25(search_index):
+                matches = search_index.search(rng.choice(terms), owner_id=owner)
+                ids = [note_id for note_id, _ in matches[:_PAGE_SIZE]]
+                db.query(Note).filter(Note.id.in_(ids)).all()
+
+            for warm_up in (ilike, lambda: bm25(in_memory), lambda: bm25(reopened)):
+                warm_up()
+            print(f"{notes} notes, {_OWNERS} owners, {queries} distinct queries")
+            print(f"{'ILIKE substring query':<40} {_timed(ilike, queries):>10.2f} ms/search")
+            print(f"{'BM25 index (delta in memory)':<40} "
+                  f"{_timed(lambda: bm25(in_memory), queries):>10.2f} ms/search")
+            print(f"{'BM25 index (mmap segment)':<40} "
+                  f"{_timed(lambda: bm25(reopened), queries):>10.2f} ms/search")
+            print(f"{'index build from table':<40} {build_ms:>10.2f} ms")
+            print(f"{'index open from segment':<40} {open_ms:>10.2f} ms")
+            reopened.clear()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
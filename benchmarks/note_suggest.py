@@ -0,0 +1,89 @@
+"""
+Prefix suggestions: the listing query run per keystroke vs the suggest index.
+
+Seeds a throwaway SQLite database with synthetic notes spread over a few
+owners, then completes random prefixes of one owner's words both ways: the
+substring listing query the frontend used to send (ILIKE plus COUNT) and
+SuggestIndex.suggest.
+
+    uv run python -m benchmarks.note_suggest [notes] [prefixes]
+"""
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, or_
+from sqlalchemy.orm import Session
+
+from app.db.models import Base, Note, User
+from app.repositories.note.search.suggest import SuggestIndex
+
+_OWNERS = 20
+_LIMIT = 10
+
+
+def _seed(db: Session, notes: int, vocabulary: list[str]) -> list[str]:
+    rng = random.Random(42)
+    owners = [User(username=f"user{i}", email=f"user{i}@example.com",
+                   hashed_password="x") for i in range(_OWNERS)]
+    db.add_all(owners)
+    db.flush()
+    start = datetime.now() - timedelta(days=30)
+    db.add_all(Note(user_id=rng.choice(owners).id,
+                    title=" ".join(rng.choices(vocabulary, k=4)),
+                    content=" ".join(rng.choices(vocabulary, k=rng.randint(20, 120))),
+                    tags=rng.sample(vocabulary, 2),
+                    created_at=start + timedelta(minutes=i),
+                    updated_at=start + timedelta(minutes=i))
+               for i in range(notes))
+    db.commit()
+    return [owner.id for owner in owners]
+
+
+def _timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(notes: int = 20000, prefixes: int = 200) -> None:
+    """Print milliseconds per completion for each variant."""
+    rng = random.Random(7)
+    vocabulary = [f"{word}{i}" for i, word in
+                  enumerate(["alpha", "budget", "travel", "recipe", "draft"] * 400)]
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'notes.db'}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            owner = _seed(db, notes, vocabulary)[0]
+            typed = [word[:rng.randint(2, len(word))] for word in rng.sample(vocabulary, prefixes)]
+
+            def listing():
+                search = f"%{rng.choice(typed)}%"
+                query = db.query(Note).join(User).filter(Note.user_id == owner).filter(
+                    or_(Note.title.ilike(search), Note.content.ilike(search),
+                        User.username.ilike(search), User.email.ilike(search)))
+                query.count()
+                query.order_by(Note.created_at.desc()).limit(_LIMIT).all()
+
+            index = SuggestIndex()
+            build_ms = _timed(lambda: index.ensure_ready(db), 1)
+
+            def suggest():
+                index.suggest(owner, rng.choice(typed), _LIMIT)
+
+            listing()
+            suggest()
+            print(f"{notes} notes, {_OWNERS} owners, {prefixes} distinct prefixes")
+            print(f"{'listing query (ILIKE + COUNT)':<40} "
+                  f"{_timed(listing, prefixes):>10.3f} ms/keystroke")
+            print(f"{'suggest index':<40} {_timed(suggest, prefixes):>10.3f} ms/keystroke")
+            print(f"{'index build from table':<40} {build_ms:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
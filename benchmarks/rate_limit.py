@@ -0,0 +1,77 @@
+"""
+Throughput of RateLimitMiddleware: BaseHTTPMiddleware vs plain ASGI.
+
+Both variants use the same in-memory backend, so the numbers isolate the
+middleware plumbing. Requests go through httpx's ASGI transport, no socket.
+
+    uv run python -m benchmarks.rate_limit [requests]
+"""
+import asyncio
+import sys
+import time
+
+import httpx
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core.middleware.limiter import MemoryRateLimitBackend
+from app.core.middleware.rate_limit import RateLimitMiddleware, _get_identifier
+
+
+class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware implementation, kept for comparison."""
+
+    def __init__(self, app, backend):
+        super().__init__(app)
+        self.backend = backend
+
+    async def dispatch(self, request, call_next):
+        identifier = _get_identifier(request.scope, request.client.host)
+        result = self.backend.hit(identifier)
+        if not result.allowed:
+            return JSONResponse(status_code=429, content={"detail": "Rate limit exceeded"})
+        response = await call_next(request)
+        response.headers["X-RateLimit-Limit"] = str(result.limit)
+        response.headers["X-RateLimit-Remaining"] = str(result.remaining)
+        response.headers["X-RateLimit-Reset"] = str(result.reset)
+        return response
+
+
+async def _endpoint(_request):
+    return JSONResponse({"items": list(range(50))})
+
+
+def _build(middleware, **kwargs):
+    app = Starlette(routes=[Route("/notes", _endpoint), Route("/healthcheck", _endpoint)])
+    backend = MemoryRateLimitBackend(limit=10**9, window_seconds=60)
+    return middleware(app, backend=backend, **kwargs)
+
+
+async def _run(app, path: str, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(200):
+            await client.get(path)
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get(path)
+        return requests / (time.perf_counter() - start)
+
+
+def main(requests: int = 5000) -> None:
+    """Print requests per second for each variant."""
+    cases = [
+        ("BaseHTTPMiddleware  /notes", _build(LegacyRateLimitMiddleware), "/notes"),
+        ("ASGI middleware     /notes", _build(RateLimitMiddleware, exempt_paths=()), "/notes"),
+        ("ASGI middleware     /healthcheck (exempt)",
+         _build(RateLimitMiddleware, exempt_paths=("/healthcheck",)), "/healthcheck"),
+    ]
+    for label, app, path in cases:
+        rps = asyncio.run(_run(app, path, requests))
+        print(f"{label:<45} {rps:>10.0f} req/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
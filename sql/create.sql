@@ -46,9 +46,29 @@ CREATE TABLE IF NOT EXISTS notes
     tags       JSON             NULL,
     image_url  VARCHAR(255)     NULL,
     INDEX ix_notes_id (id),
+    INDEX ix_notes_user_id_created_at   (user_id, created_at, id),
+    INDEX ix_notes_user_id_updated_at   (user_id, updated_at, id),
+    INDEX ix_notes_is_public_created_at (is_public, created_at, id),
+    INDEX ix_notes_is_public_updated_at (is_public, updated_at, id),
+    INDEX ix_notes_updated_at           (updated_at),
+    FULLTEXT INDEX ft_notes_title_content (title, content),
     CONSTRAINT fk_notes_user FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
 );
 
+-- -----------------------------------------------------------------------------
+-- note_tags (one row per tag of notes.tags, kept in sync by the API)
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS note_tags
+(
+    note_id INT         NOT NULL,
+    tag     VARCHAR(50) NOT NULL,
+    user_id VARCHAR(36) NOT NULL,
+    PRIMARY KEY (note_id, tag),
+    INDEX ix_note_tags_tag         (tag),
+    INDEX ix_note_tags_user_id_tag (user_id, tag),
+    CONSTRAINT fk_note_tags_note FOREIGN KEY (note_id) REFERENCES notes (id) ON DELETE CASCADE
+);
+
 -- -----------------------------------------------------------------------------
 -- audit
 -- -----------------------------------------------------------------------------
@@ -59,6 +79,8 @@ CREATE TABLE IF NOT EXISTS audit
     action      VARCHAR(255) NOT NULL,
     description VARCHAR(255)     NULL,
     timestamp   DATETIME     NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX ix_audit_timestamp         (timestamp),
+    INDEX ix_audit_user_id_timestamp (user_id, timestamp),
     CONSTRAINT fk_audit_user FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
 );
 
@@ -72,7 +94,8 @@ CREATE TABLE IF NOT EXISTS rate_limits
     requests   INT              NULL DEFAULT 0,
     timestamp  DATETIME         NULL,
     INDEX ix_rate_limits_id         (id),
-    INDEX ix_rate_limits_identifier (identifier)
+    INDEX ix_rate_limits_identifier (identifier),
+    UNIQUE KEY uq_rate_limits_identifier_timestamp (identifier, timestamp)
 );
 
 -- -----------------------------------------------------------------------------
@@ -84,5 +107,6 @@ CREATE TABLE IF NOT EXISTS revoked_tokens
     jti        VARCHAR(36)  NOT NULL UNIQUE,
     expires_at DATETIME     NOT NULL,
     revoked_at DATETIME     NOT NULL DEFAULT CURRENT_TIMESTAMP,
-    INDEX ix_revoked_tokens_jti (jti)
+    INDEX ix_revoked_tokens_jti (jti),
+    INDEX ix_revoked_tokens_revoked_at (revoked_at)
 );
@@ -13,6 +13,7 @@ USE notez_be;
 SET FOREIGN_KEY_CHECKS = 0;
 
 DROP TABLE IF EXISTS audit;
+DROP TABLE IF EXISTS note_tags;
 DROP TABLE IF EXISTS notes;
 DROP TABLE IF EXISTS rate_limits;
 DROP TABLE IF EXISTS users;
@@ -14,6 +14,7 @@ SET FOREIGN_KEY_CHECKS = 0;
 
 TRUNCATE TABLE audit;
 TRUNCATE TABLE notes;
+TRUNCATE TABLE note_tags;
 TRUNCATE TABLE rate_limits;
 TRUNCATE TABLE users;
 
@@ -174,6 +174,21 @@ INSERT INTO notes (user_id, title, content, is_public, tags, created_at, updated
     '2025-02-03 08:30:00'
 );
 
+-- =============================================================================
+-- NOTE TAGS  (normalized copy of notes.tags)
+-- =============================================================================
+INSERT IGNORE INTO note_tags (note_id, tag, user_id)
+SELECT t.note_id, t.tag, t.user_id
+FROM (
+    SELECT n.id AS note_id, n.user_id, LEFT(TRIM(j.tag), 50) AS tag,
+           ROW_NUMBER() OVER (PARTITION BY n.id, LOWER(LEFT(TRIM(j.tag), 50))
+                              ORDER BY j.position) AS nth
+    FROM notes n
+    JOIN JSON_TABLE(n.tags, '$[*]' COLUMNS (position FOR ORDINALITY,
+                                            tag VARCHAR(1024) PATH '$')) j
+) t
+WHERE t.nth = 1 AND t.tag IS NOT NULL AND t.tag <> '';
+
 -- =============================================================================
 -- AUDIT  (simulated login / note events for a realistic history)
 -- =============================================================================
@@ -212,6 +227,8 @@ SELECT 'users'       AS tbl, COUNT(*) AS rows FROM users
 UNION ALL
 SELECT 'notes',               COUNT(*)         FROM notes
 UNION ALL
+SELECT 'note_tags',           COUNT(*)         FROM note_tags
+UNION ALL
 SELECT 'audit',               COUNT(*)         FROM audit
 UNION ALL
 SELECT 'rate_limits',         COUNT(*)         FROM rate_limits;
@@ -8,8 +8,8 @@ would fail without a running MySQL instance.  We intercept ``create_engine``
 with a MagicMock before the first import of ``app.main`` so that the
 module-level connection check becomes a no-op.
 
-The RateLimitMiddleware is also patched to bypass its MySQL-backed session and
-just forward every request unchanged.
+The RateLimitMiddleware is also given its own in-memory backend with an
+effectively unlimited budget, so it never touches MySQL nor throttles tests.
 
 A real SQLite in-memory database is created for the actual test logic.
 """
@@ -32,18 +32,24 @@ with patch("sqlalchemy.create_engine", return_value=_mock_engine):
     from app.db.mysql import get_db, get_current_user  # noqa: E402
 
 # ---------------------------------------------------------------------------
-# 2. Replace the rate-limit middleware dispatch with a transparent passthrough.
-#    The middleware's __init__ already captured the mock SessionLocal; patching
-#    the class method means all existing instances use the new dispatch too.
+# 2. Swap the rate-limit backend for an unlimited in-memory one.  The
+#    middleware stack is built lazily on the first request, so editing the
+#    registered kwargs here is enough for every TestClient below.
 # ---------------------------------------------------------------------------
+from app.core.auth.passwords import password_hasher  # noqa: E402  # pylint: disable=wrong-import-position
+from app.core.auth.principal import Principal  # noqa: E402  # pylint: disable=wrong-import-position
+from app.core.auth.principal_cache import principal_cache  # noqa: E402  # pylint: disable=wrong-import-position
+from app.core.auth.revocation import revocation_set  # noqa: E402  # pylint: disable=wrong-import-position
+from app.core.auth.token_cache import token_cache  # noqa: E402  # pylint: disable=wrong-import-position
+from app.core.middleware.limiter import MemoryRateLimitBackend  # noqa: E402  # pylint: disable=wrong-import-position
 from app.core.middleware.rate_limit import RateLimitMiddleware  # noqa: E402  # pylint: disable=wrong-import-position
+from app.repositories.note.search.bm25 import note_index  # noqa: E402  # pylint: disable=wrong-import-position
+from app.repositories.note.search.suggest import suggest_index  # noqa: E402  # pylint: disable=wrong-import-position
+from app.repositories.note.search.trigram import trigram_index  # noqa: E402  # pylint: disable=wrong-import-position
 
-
-async def _noop_dispatch(self, request, call_next):  # pylint: disable=unused-argument
-    return await call_next(request)
-
-
-RateLimitMiddleware.dispatch = _noop_dispatch
+for _middleware in app.user_middleware:
+    if _middleware.cls is RateLimitMiddleware:
+        _middleware.kwargs["backend"] = MemoryRateLimitBackend(limit=10**9, window_seconds=60)
 
 # ---------------------------------------------------------------------------
 # 3. Real test database — SQLite in-memory, same schema as production.
@@ -90,6 +96,13 @@ def setup_test_db():
     Base.metadata.drop_all(_TEST_ENGINE)
 
 
+@pytest.fixture(scope="session", autouse=True)
+def password_hashing_pool():
+    """Stops the worker processes of the module-level password hasher after the session."""
+    yield
+    password_hasher.shutdown()
+
+
 @pytest.fixture
 def db_session(setup_test_db):  # pylint: disable=unused-argument
     """Opens a fresh SQLite session for each test and closes it afterwards."""
@@ -111,16 +124,21 @@ def test_user(db_session, setup_test_db):
 def client(db_session, test_user):
     """
     Yields a TestClient whose ``get_db`` and ``get_current_user`` dependencies
-    are overridden to use the test SQLite session and the seeded test user.
+    are overridden to use the test SQLite session and the seeded test user's
+    Principal. The search indexes are dropped so they rebuild from this
+    session's data.
     """
     def override_get_db():
         yield db_session
 
     def override_get_current_user():
-        return test_user
+        return Principal.from_user(test_user)
 
     app.dependency_overrides[get_db] = override_get_db
     app.dependency_overrides[get_current_user] = override_get_current_user
+    note_index.clear()
+    trigram_index.clear()
+    suggest_index.clear()
 
     with TestClient(app) as tc:
         yield tc
@@ -133,14 +151,22 @@ def client_real_auth(db_session):
     """
     Like ``client`` but does NOT override ``get_current_user``, so the real
     JWT decode and blacklist check in ``get_current_user`` run.
-    Use for tests that need to verify token revocation.
+    Use for tests that need to verify token revocation. The token cache,
+    revocation set and principal cache are cleared so state from an earlier
+    test never leaks in.
     """
     def override_get_db():
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    token_cache.clear()
+    revocation_set.clear()
+    principal_cache.clear()
 
     with TestClient(app) as tc:
         yield tc
 
     app.dependency_overrides.pop(get_db, None)
+    token_cache.clear()
+    revocation_set.clear()
+    principal_cache.clear()
@@ -0,0 +1,64 @@
+"""
+Shared fixtures for the in-memory note index unit tests.
+
+The synced indexes only read the notes table through a few Query calls, so
+they are tested against a stand-in session instead of a database.
+"""
+# pylint: disable=redefined-outer-name  # standard pytest fixture injection pattern
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+
+class FakeSession:
+    """Stands in for a session; the notes table holds the given notes, or
+    ids when given (the notes are then the rows updated since the last sync)."""
+
+    def __init__(self, notes=(), ids=None):
+        self.notes = list(notes)
+        self.ids = ids
+
+    def query(self, *_columns):
+        return self
+
+    def filter(self, *_clauses):
+        return self
+
+    def yield_per(self, _size):
+        return iter(self.notes)
+
+    def scalar(self):
+        return max(self._ids(), default=None)
+
+    def __iter__(self):
+        return iter([(note_id,) for note_id in self._ids()])
+
+    def _ids(self):
+        return self.ids if self.ids is not None else [note.id for note in self.notes]
+
+
+@pytest.fixture
+def fake_db():
+    """FakeSession factory: fake_db(notes, ids=None)."""
+    return FakeSession
+
+
+@pytest.fixture
+def make_note():
+    """Note row factory: make_note(id, title, content="", tags=None, owner, public)."""
+    def make(note_id, title, content="", tags=None, owner="alice", public=False):
+        return SimpleNamespace(id=note_id, title=title, content=content, tags=tags,
+                               user_id=owner, is_public=public, updated_at=datetime.now())
+    return make
+
+
+@pytest.fixture
+def loaded(fake_db):
+    """Build an index on an empty table, then add the given notes as local writes."""
+    def load(index, *notes):
+        index.ensure_ready(fake_db())
+        for note in notes:
+            index.add(note)
+        return index
+    return load
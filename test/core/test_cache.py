@@ -0,0 +1,165 @@
+"""
+Unit tests for the caches and cache backends in app.core.cache.
+"""
+import threading
+import time
+
+import pytest
+
+from app.core.cache import (GenerationalCache, MemoryCacheBackend,
+                            RedisCacheBackend, TieredCacheBackend, TTLCache)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expires_and_evicts_lru():
+    clock = _Clock()
+    cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1          # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert cache.get("c") is None
+    assert len(cache) == 0
+
+
+def test_generational_cache_invalidates_one_scope():
+    cache = GenerationalCache(MemoryCacheBackend(maxsize=16, ttl=60), "notes", ttl=60)
+    cache.set("alice", "page-1", ["a"])
+    cache.set("bob", "page-1", ["b"])
+
+    cache.invalidate("alice")
+    assert cache.get("alice", "page-1") is None
+    assert cache.get("bob", "page-1") == ["b"]
+
+
+def test_generational_cache_drops_value_computed_before_invalidation():
+    cache = GenerationalCache(MemoryCacheBackend(maxsize=16, ttl=60), "notes", ttl=60)
+    generation = cache.generation("alice")
+    cache.invalidate("alice")               # a write lands while computing
+    cache.set("alice", "page-1", ["stale"], generation)
+    assert cache.get("alice", "page-1") is None
+
+
+def test_memory_backend_bounds_generation_counters():
+    backend = MemoryCacheBackend(maxsize=2, ttl=60)
+    cache = GenerationalCache(backend, "notes", ttl=60)
+    cache.set("alice", "page-1", ["old"])
+    cache.invalidate("alice")
+    for user in ("bob", "carol", "dave"):
+        cache.invalidate(user)
+    assert len(backend._counters) == 2  # pylint: disable=protected-access
+
+    # alice's counter was evicted: it restarts past every earlier generation
+    assert cache.get("alice", "page-1") is None
+    cache.set("alice", "page-1", ["new"])
+    assert cache.get("alice", "page-1") == ["new"]
+
+
+def test_redis_backend_shares_generations_between_instances():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    node_a = GenerationalCache(RedisCacheBackend(fakeredis.FakeRedis(server=server), ttl=60),
+                               "notes", ttl=60)
+    node_b = GenerationalCache(RedisCacheBackend(fakeredis.FakeRedis(server=server), ttl=60),
+                               "notes", ttl=60)
+
+    node_a.set("user:1", [1, 10, ""], {"items": [1, 2]})
+    assert node_b.get("user:1", [1, 10, ""]) == {"items": [1, 2]}
+
+    node_b.invalidate("user:1")
+    assert node_a.get("user:1", [1, 10, ""]) is None
+
+
+def test_tiered_backend_reads_l1_and_honours_shared_invalidation():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    l2 = RedisCacheBackend(client, ttl=60)
+    node_a = GenerationalCache(TieredCacheBackend(MemoryCacheBackend(8, 5), l2), "notes", ttl=60)
+    node_b = GenerationalCache(TieredCacheBackend(MemoryCacheBackend(8, 5), l2), "notes", ttl=60)
+
+    node_a.set("public", "page-1", ["a"])
+    client.flushall()                       # L2 gone, L1 still answers...
+    assert node_a.get("public", "page-1") == ["a"]
+
+    node_b.invalidate("public")             # ...until any node invalidates
+    assert node_a.get("public", "page-1") is None
+
+
+def test_redis_backend_degrades_when_redis_is_down():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    backend = RedisCacheBackend(fakeredis.FakeRedis(server=server), ttl=60)
+    backend.set("key", [1])
+    server.connected = False
+
+    assert backend.get("key") is None
+    assert backend.incr("generation") == -1
+    backend.clear()
+    server.connected = True
+    assert backend.get("key") == [1]
+
+
+def test_get_or_compute_coalesces_concurrent_misses():
+    cache = GenerationalCache(MemoryCacheBackend(maxsize=16, ttl=60), "notes", ttl=60)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"items": [1]}
+
+    results = []
+    leader = threading.Thread(
+        target=lambda: results.append(cache.get_or_compute("public", "page-1", compute)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(
+        target=lambda: results.append(cache.get_or_compute("public", "page-1", compute)))
+        for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert [value for value, _ in results] == [{"items": [1]}] * 5
+    assert cache.get_or_compute("public", "page-1", compute) == ({"items": [1]}, True)
+
+
+def test_stale_entry_served_while_refreshing_in_background():
+    clock = _Clock()
+    cache = GenerationalCache(MemoryCacheBackend(maxsize=16, ttl=60), "notes",
+                              ttl=10, stale_ttl=30, clock=clock)
+    cache.set("public", "page-1", "v1")
+    refreshed = threading.Event()
+
+    def refresh():
+        refreshed.set()
+        return "v2"
+
+    clock.now = 15                           # past ttl, inside the stale window
+    assert cache.get_or_compute("public", "page-1", lambda: "sync", refresh) == ("v1", True)
+    assert refreshed.wait(5)
+    deadline = time.monotonic() + 5
+    while cache.get("public", "page-1") != "v2" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.get_or_compute("public", "page-1", lambda: "sync") == ("v2", True)
+
+    cache.invalidate("public")               # writes are never answered stale
+    assert cache.get_or_compute("public", "page-1", lambda: "v3") == ("v3", False)
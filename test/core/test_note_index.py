@@ -0,0 +1,166 @@
+"""
+Unit tests for the in-process BM25 note index and its on-disk segments.
+"""
+# pylint: disable=redefined-outer-name  # standard pytest fixture injection pattern
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.models import Base, Note
+from app.repositories.note.search.bm25 import NoteSearchIndex, tokenize
+from app.repositories.note.search.segment import Segment
+
+
+def _note(note_id, title, content="", owner="alice", public=False, tags=None):
+    return SimpleNamespace(id=note_id, title=title, content=content, tags=tags,
+                           user_id=owner, is_public=public, created_at=datetime.now(),
+                           updated_at=datetime.now())
+
+
+@pytest.fixture
+def empty_db():
+    """Session on an empty notes table."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def index(empty_db):
+    """A loaded, in-memory only index."""
+    search_index = NoteSearchIndex()
+    search_index.ensure_ready(empty_db)
+    return search_index
+
+
+def _ids(matches):
+    return [note_id for note_id, _ in matches]
+
+
+def test_tokenize_lowercases_words():
+    assert tokenize("Release-Notes: v2, SHIP it!") == ["release", "notes", "v2", "ship", "it"]
+
+
+def test_bm25_ranks_rarer_terms_and_higher_frequency_first(index):
+    index.add(_note(1, "groceries", "milk eggs milk"))
+    index.add(_note(2, "groceries", "milk bread"))
+    index.add(_note(3, "groceries", "eggs"))
+    index.add(_note(4, "work", "deadline"))
+
+    assert _ids(index.search("milk")) == [1, 2]
+    assert _ids(index.search("deadline groceries"))[0] == 4
+    assert index.search("") == []
+    assert index.search("absent") == []
+
+
+def test_search_is_scoped_by_owner_or_public(index):
+    index.add(_note(1, "plan", owner="alice"))
+    index.add(_note(2, "plan", owner="bob", public=True))
+    index.add(_note(3, "plan", owner="bob"))
+
+    assert _ids(index.search("plan", owner_id="alice")) == [1]
+    assert sorted(_ids(index.search("plan", owner_id="bob"))) == [2, 3]
+    assert _ids(index.search("plan", public=True)) == [2]
+
+
+def test_update_and_remove_are_incremental(index):
+    index.add(_note(1, "draft", tags=["ideas"]))
+    index.add(_note(1, "final", tags=["ideas"]))
+    assert index.search("draft") == []
+    assert _ids(index.search("final ideas")) == [1]
+
+    index.remove(1)
+    assert index.search("final") == []
+    assert len(index) == 0
+
+
+def test_segment_round_trip_and_compaction(tmp_path, empty_db):
+    path = str(tmp_path / "notes.seg")
+    writer = NoteSearchIndex(path)
+    writer.ensure_ready(empty_db)
+    writer.add(_note(1, "alpha", "shared words", tags=["x"]))
+    writer.add(_note(2, "beta", "shared", owner="bob", public=True))
+    writer.compact()
+    expected = writer.search("shared")
+
+    reader = NoteSearchIndex(path)
+    reader.ensure_ready(empty_db)
+    assert reader.search("shared") == expected
+    segment = Segment(path)
+    assert len(segment.docs) == 2
+    segment.close()
+
+    # Changes after the segment hide the old copy until the next compaction
+    reader.add(_note(1, "alpha", "other words"))
+    reader.remove(2)
+    assert reader.search("shared") == []
+    assert _ids(reader.search("other")) == [1]
+    reader.compact()
+    assert _ids(reader.search("other words")) == [1]
+    assert len(reader) == 1
+
+
+def test_sync_picks_up_notes_written_elsewhere(index, empty_db):
+    empty_db.add(Note(id=7, user_id="alice", title="from another worker", content="synced",
+                      created_at=datetime.now(), updated_at=datetime.now()))
+    empty_db.commit()
+    assert index.search("synced") == []
+
+    assert index.sync(empty_db) == 1
+    assert _ids(index.search("synced", owner_id="alice")) == [7]
+
+
+def test_unreadable_segment_is_rebuilt(tmp_path, empty_db):
+    path = tmp_path / "notes.seg"
+    path.write_bytes(b"not a segment at all, just bytes")
+    rebuilt = NoteSearchIndex(str(path))
+    rebuilt.ensure_ready(empty_db)
+    assert rebuilt.ready
+    segment = Segment(str(path))
+    assert len(segment.docs) == 0
+    segment.close()
+
+
+def _stored(session, *notes):
+    for note in notes:
+        session.add(Note(id=note.id, user_id=note.user_id, title=note.title,
+                         content=note.content, created_at=note.created_at,
+                         updated_at=note.updated_at))
+    session.commit()
+
+
+def test_notes_deleted_elsewhere_are_pruned_every_prune_interval(empty_db):
+    _stored(empty_db, _note(1, "ferry", "crossing"), _note(2, "ferry", "timetable"))
+    now = [0.0]
+    index = NoteSearchIndex(clock=lambda: now[0], prune_interval=600)
+    index.ensure_ready(empty_db)
+    empty_db.query(Note).filter(Note.id == 1).delete()
+    empty_db.commit()
+
+    index.sync(empty_db)
+    assert _ids(index.search("ferry")) == [2, 1]
+    now[0] = 600
+    index.sync(empty_db)
+    assert _ids(index.search("ferry")) == [2] and len(index) == 1
+
+
+def test_reopened_segment_drops_notes_deleted_since(tmp_path, empty_db):
+    path = str(tmp_path / "notes.seg")
+    _stored(empty_db, _note(1, "ferry", "crossing"), _note(2, "ferry", "timetable"))
+    writer = NoteSearchIndex(path)
+    writer.ensure_ready(empty_db)
+    writer.clear()
+    empty_db.query(Note).filter(Note.id == 1).delete()
+    empty_db.commit()
+
+    reopened = NoteSearchIndex(path)
+    reopened.ensure_ready(empty_db)
+    assert _ids(reopened.search("ferry")) == [2] and len(reopened) == 1
+    reopened.compact()
+    segment = Segment(path)
+    assert set(segment.docs) == {2}
+    segment.close()
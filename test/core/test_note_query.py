@@ -0,0 +1,35 @@
+"""
+Unit tests for the structured search query parser.
+"""
+from datetime import datetime
+
+import pytest
+
+from app.repositories.note.search.query import NoteQuery, parse_query
+
+
+def test_operators_and_free_text_are_split():
+    parsed = parse_query('tag:work title:"q3 plan" author:bob is:public '
+                         'before:2026-01-01 after:2025-06-30 budget Tag:home')
+
+    assert parsed == NoteQuery(text="budget", tags=("work", "home"), titles=("q3 plan",),
+                               authors=("bob",), is_public=True,
+                               before=datetime(2026, 1, 1), after=datetime(2025, 6, 30))
+
+
+def test_plain_text_is_kept_as_typed():
+    assert parse_query('  "release  notes" v2 ') == NoteQuery(text='"release  notes" v2')
+    assert parse_query("") == NoteQuery()
+
+
+def test_unknown_operators_stay_free_text():
+    parsed = parse_query("is:private see http://example.com at 12:30")
+
+    assert parsed.is_public is False
+    assert parsed.text == "see http://example.com at 12:30"
+
+
+@pytest.mark.parametrize("query", ["before:yesterday", "after:2026-13-01", "is:archived"])
+def test_invalid_operator_values_are_rejected(query):
+    with pytest.raises(ValueError):
+        parse_query(query)
@@ -0,0 +1,56 @@
+"""
+Password hashing pool: round trips through worker processes and the
+concurrency cap with its queue-depth counters.
+"""
+import asyncio
+import threading
+import time
+
+import bcrypt
+
+from app.core.auth import passwords
+from app.core.auth.passwords import PasswordHasher
+
+
+def test_hash_and_verify_on_process_pool():
+    """Hashes and checks round trip through a worker process."""
+    hasher = PasswordHasher(workers=1, max_concurrency=1, rounds=4)
+    try:
+        hashed = asyncio.run(hasher.hash("s3cret"))
+        assert bcrypt.checkpw(b"s3cret", hashed.encode())
+        assert asyncio.run(hasher.verify("s3cret", hashed))
+        assert not hasher.verify_sync("wrong", hashed)
+        assert hasher.stats()["completed"] == 3
+    finally:
+        hasher.shutdown()
+
+
+def test_concurrency_cap_queues_callers(monkeypatch):
+    """Callers past max_concurrency wait, and the queue depth is reported."""
+    hasher = PasswordHasher(workers=0, max_concurrency=1, rounds=4)
+    release = threading.Event()
+    real_hashpw = bcrypt.hashpw
+
+    def blocking_hashpw(password, salt):
+        release.wait(5)
+        return real_hashpw(password, salt)
+
+    monkeypatch.setattr(passwords.bcrypt, "hashpw", blocking_hashpw)
+    threads = [threading.Thread(target=hasher.hash_sync, args=("pw",)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+
+    deadline = time.monotonic() + 5
+    while hasher.stats()["waiting"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stats = hasher.stats()
+    assert stats["running"] == 1
+    assert stats["waiting"] == 2
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    stats = hasher.stats()
+    assert stats["completed"] == 3
+    assert stats["peak_waiting"] == 2
+    assert stats["running"] == stats["waiting"] == 0
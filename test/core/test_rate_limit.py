@@ -0,0 +1,286 @@
+"""
+Unit tests for the rate limiter backends.
+"""
+import asyncio
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.middleware.limiter import (MemoryRateLimitBackend,
+                                         SharedMemoryRateLimitBackend,
+                                         WriteBehindRateLimitBackend)
+from app.core.middleware.rate_limit import RateLimitMiddleware
+from app.db.models.auth.model import RateLimit
+
+
+class _Clock:
+    """Manually advanced clock."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestMemoryRateLimitBackend:
+    """Sliding window behaviour of the in-process backend."""
+
+    def test_rejects_after_limit(self):
+        """Requests beyond the limit are rejected and not counted."""
+        backend = MemoryRateLimitBackend(limit=3, window_seconds=60, clock=_Clock())
+
+        results = [backend.hit("ip:1") for _ in range(4)]
+
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert [r.remaining for r in results] == [2, 1, 0, 0]
+        assert backend.hit("ip:2").allowed
+
+    def test_window_slides(self):
+        """The previous window is weighted out as time passes."""
+        clock = _Clock(60_000.0)
+        backend = MemoryRateLimitBackend(limit=2, window_seconds=60, clock=clock)
+        backend.hit("ip:1")
+        backend.hit("ip:1")
+        assert not backend.hit("ip:1").allowed
+
+        clock.now += 90  # half of the previous window still overlaps
+        assert backend.hit("ip:1").allowed
+        assert not backend.hit("ip:1").allowed
+
+        clock.now += 60
+        assert backend.hit("ip:1").allowed
+
+    def test_memory_is_bounded(self):
+        """Idle identifiers expire and the table never exceeds its bound."""
+        clock = _Clock()
+        backend = MemoryRateLimitBackend(limit=10, window_seconds=60,
+                                         max_identifiers=5, clock=clock)
+        for i in range(20):
+            backend.hit(f"ip:{i}")
+        assert len(backend) == 5
+
+        clock.now += 180
+        backend.hit("ip:new")
+        backend.hit("ip:new")
+        backend.hit("ip:new")
+        assert len(backend) == 1
+
+
+class TestSharedMemoryRateLimitBackend:
+    """Budget shared by every backend mapping the same file."""
+
+    def test_workers_share_one_budget(self, tmp_path):
+        """Two backends on one file (as two workers would) enforce one limit."""
+        path = str(tmp_path / "rate_limit")
+        clock = _Clock()
+        worker_a = SharedMemoryRateLimitBackend(limit=3, window_seconds=60,
+                                                path=path, slots=64, clock=clock)
+        worker_b = SharedMemoryRateLimitBackend(limit=3, window_seconds=60,
+                                                path=path, slots=64, clock=clock)
+        try:
+            assert worker_a.hit("user:1").allowed
+            assert worker_b.hit("user:1").allowed
+            assert worker_a.hit("user:1").remaining == 0
+            assert not worker_b.hit("user:1").allowed
+            assert worker_b.hit("user:2").allowed
+
+            clock.now += 120
+            assert worker_b.hit("user:1").allowed
+        finally:
+            worker_a.close()
+            worker_b.close()
+
+    def test_full_table_recycles_slots(self, tmp_path):
+        """More identifiers than slots never grows the table or fails."""
+        backend = SharedMemoryRateLimitBackend(limit=5, window_seconds=60,
+                                               path=str(tmp_path / "rl"), slots=8,
+                                               clock=_Clock())
+        try:
+            assert all(backend.hit(f"ip:{i}").allowed for i in range(100))
+        finally:
+            backend.close()
+
+    def test_table_is_opened_per_process(self, tmp_path, monkeypatch):
+        """Nothing is opened until first use, and a new pid gets its own fd."""
+        path = tmp_path / "rl"
+        backend = SharedMemoryRateLimitBackend(limit=5, window_seconds=60,
+                                               path=str(path), slots=8, clock=_Clock())
+        assert not path.exists()
+
+        backend.hit("ip:1")
+        inherited = backend._fd  # pylint: disable=protected-access
+        monkeypatch.setattr("os.getpid", lambda: -1)
+        assert backend.hit("ip:1").remaining == 3
+        assert backend._pid == -1  # pylint: disable=protected-access
+
+        asyncio.run(backend.shutdown())
+        assert backend._fd is None  # pylint: disable=protected-access
+        backend.close()
+        assert inherited is not None
+
+
+class TestWriteBehindRateLimitBackend:
+    """Batched persistence of rate limit counters."""
+
+    @staticmethod
+    def _session_factory():
+        engine = create_engine("sqlite:///:memory:", poolclass=StaticPool,
+                               connect_args={"check_same_thread": False})
+        RateLimit.__table__.create(engine)
+        return sessionmaker(bind=engine)
+
+    def test_flush_aggregates_increments(self):
+        """Many hits become one row per identifier and window."""
+        session_factory = self._session_factory()
+        clock = _Clock(60_000.0)
+        backend = WriteBehindRateLimitBackend(limit=100, window_seconds=60,
+                                              db_session=session_factory, clock=clock)
+        for _ in range(5):
+            backend.hit("ip:1")
+        backend.hit("ip:2")
+        assert backend.pending == 6
+        assert backend.flush() == 6
+
+        for _ in range(3):
+            backend.hit("ip:1")
+        backend.flush()
+
+        db = session_factory()
+        rows = {r.identifier: r.requests for r in db.query(RateLimit)}
+        db.close()
+        assert rows == {"ip:1": 8, "ip:2": 1}
+        assert backend.pending == 0
+
+    def test_flushes_of_two_workers_add_up_in_one_row(self):
+        """Each flush upserts on (identifier, window start), no duplicate rows."""
+        session_factory = self._session_factory()
+        clock = _Clock(60_000.0)
+        workers = [WriteBehindRateLimitBackend(limit=100, window_seconds=60,
+                                               db_session=session_factory, clock=clock)
+                   for _ in range(2)]
+        for count, worker in zip((2, 3), workers):
+            for _ in range(count):
+                worker.hit("ip:1")
+            assert worker.flush() == count
+
+        db = session_factory()
+        assert [(r.identifier, r.requests) for r in db.query(RateLimit)] == [("ip:1", 5)]
+        db.close()
+
+    def test_flush_task_survives_errors(self):
+        """An unexpected flush error is logged and the task keeps flushing."""
+        session_factory = self._session_factory()
+        backend = WriteBehindRateLimitBackend(limit=100, window_seconds=60,
+                                              db_session=session_factory,
+                                              flush_interval=0.01)
+        calls = []
+        flush = backend.flush
+
+        def failing_once():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            return flush()
+
+        backend.flush = failing_once
+
+        async def scenario():
+            await backend.startup()
+            backend.hit("ip:1")
+            for _ in range(100):
+                if len(calls) > 1 and backend.pending == 0:
+                    break
+                await asyncio.sleep(0.01)
+            alive = not backend._task.done()  # pylint: disable=protected-access
+            await backend.shutdown()
+            return alive
+
+        assert asyncio.run(scenario())
+        assert backend.pending == 0
+
+    def test_retention_sweep(self):
+        """Rows older than the retention period are purged on flush."""
+        session_factory = self._session_factory()
+        clock = _Clock(60_000.0)
+        backend = WriteBehindRateLimitBackend(limit=100, window_seconds=60,
+                                              db_session=session_factory, clock=clock)
+        backend.hit("ip:old")
+        backend.flush()
+
+        clock.now += 2 * 24 * 3600
+        backend.hit("ip:new")
+        backend.flush()
+
+        db = session_factory()
+        assert [r.identifier for r in db.query(RateLimit)] == ["ip:new"]
+        db.close()
+
+    def test_drift_triggers_background_flush(self):
+        """Reaching max_drift wakes the flush task before the interval."""
+        session_factory = self._session_factory()
+        backend = WriteBehindRateLimitBackend(limit=100, window_seconds=60,
+                                              db_session=session_factory,
+                                              flush_interval=3600, max_drift=3)
+
+        async def scenario():
+            await backend.startup()
+            for _ in range(3):
+                backend.hit("ip:1")
+            for _ in range(100):
+                if backend.pending == 0:
+                    break
+                await asyncio.sleep(0.01)
+            pending = backend.pending
+            backend.hit("ip:1")
+            await backend.shutdown()
+            return pending
+
+        assert asyncio.run(scenario()) == 0
+        db = session_factory()
+        assert db.query(RateLimit).one().requests == 4
+        db.close()
+
+
+def _limited_app(limit: int) -> Starlette:
+    """Tiny app wrapped by the middleware with a fresh memory backend."""
+    async def ok(_request):
+        return PlainTextResponse("ok")
+
+    app = Starlette(routes=[Route("/ping", ok, methods=["GET", "OPTIONS"]),
+                            Route("/healthcheck", ok)])
+    return RateLimitMiddleware(app,
+                               backend=MemoryRateLimitBackend(limit=limit, window_seconds=60),
+                               exempt_paths=["/healthcheck"])
+
+
+class TestRateLimitMiddleware:
+    """Header injection, 429 and exemptions of the ASGI middleware."""
+
+    def test_headers_and_429(self):
+        """Allowed responses carry the headers; the limit returns 429."""
+        client = TestClient(_limited_app(limit=1))
+
+        first = client.get("/ping")
+        assert first.status_code == 200
+        assert first.headers["X-RateLimit-Limit"] == "1"
+        assert first.headers["X-RateLimit-Remaining"] == "0"
+
+        second = client.get("/ping")
+        assert second.status_code == 429
+        assert second.json() == {"detail": "Rate limit exceeded"}
+
+    def test_exempt_requests_skip_the_limiter(self):
+        """Preflights and exempt paths never consume the budget."""
+        client = TestClient(_limited_app(limit=1))
+
+        for _ in range(3):
+            assert client.get("/healthcheck").status_code == 200
+            assert client.options("/ping").status_code == 200
+        assert "X-RateLimit-Limit" not in client.get("/healthcheck").headers
+        assert client.get("/ping").status_code == 200
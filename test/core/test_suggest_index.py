@@ -0,0 +1,84 @@
+"""
+Unit tests for the prefix suggestion index over note titles and tags.
+"""
+from datetime import timedelta
+
+from app.repositories.note.search.suggest import SuggestIndex, suggestion_keys
+
+
+def _texts(suggestions):
+    return [suggestion["text"] for suggestion in suggestions]
+
+
+def test_keys_start_at_every_word():
+    assert suggestion_keys("Sprint Plan — Q3") == {"sprint plan — q3", "plan — q3", "q3"}
+
+
+def test_completes_titles_and_tags_from_any_word(loaded, make_note):
+    index = loaded(SuggestIndex(), make_note(1, "Sprint planning", tags=["planning", "work"]),
+                   make_note(2, "Café plans", tags=["food"]))
+
+    assert index.suggest("alice", "PLAN") == [
+        {"text": "Café plans", "kind": "title"},
+        {"text": "planning", "kind": "tag"},
+        {"text": "Sprint planning", "kind": "title"},
+    ]
+    assert _texts(index.suggest("alice", "cafe")) == ["Café plans"]
+    assert index.suggest("alice", "zzz") == []
+    assert index.suggest("alice", "  ") == []
+
+
+def test_most_used_first_and_limited(loaded, make_note):
+    index = loaded(SuggestIndex(), make_note(1, "a", tags=["work"]),
+                   make_note(2, "b", tags=["work"]), make_note(3, "c", tags=["workout"]))
+
+    assert _texts(index.suggest("alice", "wor")) == ["work", "workout"]
+    assert _texts(index.suggest("alice", "wor", limit=1)) == ["work"]
+
+
+def test_suggestions_are_per_user(loaded, make_note):
+    index = loaded(SuggestIndex(), make_note(1, "Roadmap", owner="alice"),
+                   make_note(2, "Roadtrip", owner="bob"))
+
+    assert _texts(index.suggest("alice", "road")) == ["Roadmap"]
+    assert _texts(index.suggest("bob", "road")) == ["Roadtrip"]
+    assert index.suggest("carol", "road") == []
+
+
+def test_updates_and_removes_follow_shared_counts(loaded, make_note):
+    index = loaded(SuggestIndex(), make_note(1, "Budget", tags=["money"]), make_note(2, "Budget"))
+
+    index.add(make_note(1, "Forecast", tags=["money"]))
+    assert _texts(index.suggest("alice", "bud")) == ["Budget"]
+    index.remove(2)
+    assert index.suggest("alice", "bud") == []
+    index.remove(1)
+    assert index.suggest("alice", "mon") == []
+    assert len(index) == 0
+
+
+def test_build_and_sync_read_the_table(make_note, fake_db):
+    first = make_note(1, "Zebra", tags=["zoo"])
+    db = fake_db([first])
+    index = SuggestIndex()
+    index.ensure_ready(db)
+    assert _texts(index.suggest("alice", "z")) == ["Zebra", "zoo"]
+
+    db.notes, db.ids = [make_note(2, "Zeppelin", owner="alice")], [1, 2]
+    db.notes[0].updated_at = first.updated_at + timedelta(seconds=1)
+    assert index.sync(db) == 1
+    assert _texts(index.suggest("alice", "ze")) == ["Zebra", "Zeppelin"]
+
+
+def test_sync_drops_notes_deleted_elsewhere_every_prune_interval(loaded, make_note, fake_db):
+    now = [0.0]
+    index = loaded(SuggestIndex(clock=lambda: now[0], prune_interval=600),
+                   make_note(1, "Zebra"), make_note(2, "Zeppelin"))
+    index.add(make_note(5, "Zest"))
+
+    # 1 was deleted by another worker; 5 is newer than the session's snapshot
+    index.sync(fake_db([], ids=[2, 3]))
+    assert _texts(index.suggest("alice", "ze")) == ["Zebra", "Zeppelin", "Zest"]
+    now[0] = 600
+    index.sync(fake_db([], ids=[2, 3]))
+    assert _texts(index.suggest("alice", "ze")) == ["Zeppelin", "Zest"]
@@ -0,0 +1,84 @@
+"""
+Unit tests for the trigram index narrowing substring searches.
+"""
+from datetime import datetime, timedelta
+
+from app.repositories.note.search.trigram import TrigramIndex, normalize, trigrams
+
+
+def test_normalize_folds_case_and_accents():
+    assert normalize("Café ÉTÉ Straße") == "cafe ete strasse"
+    assert trigrams("Abcd") == {"abc", "bcd"}
+
+
+def test_candidates_are_a_superset_of_substring_matches(loaded, make_note):
+    index = loaded(TrigramIndex(), make_note(1, "Quarterly report", "numbers"),
+                   make_note(2, "Report", "quarter figures"),
+                   make_note(3, "Groceries", "milk"))
+
+    assert index.candidates("ARTERL") == {1}
+    assert index.candidates("quarter") == {1, 2}
+    assert index.candidates("report quarter") == set()
+    assert index.candidates("café") == set()
+    assert index.candidates("milk") == {3}
+
+
+def test_candidates_are_scoped_and_follow_writes(loaded, make_note):
+    index = loaded(TrigramIndex(), make_note(1, "shared plan", owner="alice"),
+                   make_note(2, "shared plan", owner="bob", public=True))
+    assert index.candidates("plan", owner_id="alice") == {1}
+    assert index.candidates("plan", public=True) == {2}
+
+    index.add(make_note(1, "renamed", owner="alice"))
+    index.remove(2)
+    assert index.candidates("plan") == set()
+    assert index.candidates("renamed", owner_id="alice") == {1}
+
+
+def test_queries_that_cannot_be_narrowed(loaded, make_note):
+    index = loaded(TrigramIndex(), make_note(1, "abc"))
+    assert index.candidates("ab") is None
+    assert index.candidates("a%c") is None
+    assert index.candidates("a_c") is None
+    assert TrigramIndex().candidates("abc") is None        # not loaded yet
+
+
+def test_local_writes_do_not_move_the_sync_watermark(loaded, make_note, fake_db):
+    index = loaded(TrigramIndex())
+    assert index.unsynced_since() == datetime.min
+    index.add(make_note(1, "written here"))
+    assert index.unsynced_since() == datetime.min
+
+    index.sync(fake_db([make_note(2, "synced")]))
+    assert index.unsynced_since() <= datetime.now() - timedelta(seconds=29)
+
+
+def test_drop_rederives_grams_from_the_stored_text(loaded, make_note):
+    index = loaded(TrigramIndex(), make_note(1, "alpha", "beta"), make_note(2, "alphabet"))
+    index.remove(1)
+    assert index.candidates("alpha") == {2}
+    assert index.candidates("bet") == {2}
+    assert index.candidates("beta") == set()
+    index.remove(2)
+    assert index.candidates("alpha") == set()
+    assert not index._notes  # pylint: disable=protected-access
+
+
+def test_over_max_notes_the_index_frees_itself_and_turns_off(make_note, fake_db):
+    index = TrigramIndex(max_notes=2)
+    index.ensure_ready(fake_db([make_note(1, "one"), make_note(2, "two")]))
+    assert index.enabled and index.candidates("one") == {1}
+
+    index.add(make_note(3, "three"))
+    assert not index.enabled and len(index) == 0
+    assert index.candidates("one") is None
+    assert TrigramIndex(enabled=False).candidates("one") is None
+
+
+def test_searches_do_not_wait_for_a_build_in_progress(make_note, fake_db):
+    index = TrigramIndex()
+    with index._build_lock:  # pylint: disable=protected-access
+        index.ensure_ready(fake_db([make_note(1, "abc")]))
+        assert not index.ready and index.candidates("abc") is None
+    index.ensure_ready(fake_db([make_note(1, "abc")]))
+    assert index.candidates("abc") == {1}
@@ -0,0 +1,33 @@
+"""
+MySQL full-text search statements, compiled without a MySQL server.
+"""
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import mysql
+
+from app.db.models import Note
+from app.repositories.note.search.fulltext import fulltext_match
+from app.repositories.note.search.modes import (BOOLEAN, NATURAL, SUBSTRING,
+                                                resolve_search_mode)
+
+
+@pytest.mark.parametrize("mode, clause", [(NATURAL, "IN NATURAL LANGUAGE MODE"),
+                                          (BOOLEAN, "IN BOOLEAN MODE")])
+def test_fulltext_match_ranks_by_relevance(db_session, mode, clause):
+    """Matches use the FULLTEXT columns and order by the same MATCH score."""
+    relevance = fulltext_match("+release -draft", mode)
+    query = (db_session.query(Note).filter(relevance)
+             .order_by(relevance.desc(), Note.id.desc()))
+    sql = str(query.statement.compile(dialect=mysql.dialect()))
+    match = f"MATCH (notes.title, notes.content) AGAINST (%s {clause})"
+    assert f"WHERE {match}" in sql
+    assert f"ORDER BY {match} DESC, notes.id DESC" in sql
+
+
+def test_search_mode_falls_back_without_mysql(db_session):
+    """Only MySQL keeps a full-text mode; other databases search by substring."""
+    assert resolve_search_mode(db_session, NATURAL) == SUBSTRING
+    mysql_session = MagicMock()
+    mysql_session.get_bind.return_value.dialect.name = "mysql"
+    assert resolve_search_mode(mysql_session, BOOLEAN) == BOOLEAN
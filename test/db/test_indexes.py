@@ -0,0 +1,96 @@
+"""
+Query plan checks for the list queries of the repositories.
+
+Every listing filters and sorts on columns covered by a composite index
+(see the Index declarations on Note and Audit), so the database walks the
+index in order instead of sorting the matching rows. The statements issued
+by the managers are captured and run through SQLite's EXPLAIN QUERY PLAN;
+a "USE TEMP B-TREE FOR ORDER BY" step means a filesort.
+"""
+from contextlib import contextmanager
+from dataclasses import replace
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+
+from app.core.auth.principal import Principal
+from app.repositories.backoffice.repository import BackofficeManager
+from app.repositories.note.cursor import encode_cursor, keyset_after
+from app.repositories.note.repository import NoteManager
+
+
+@contextmanager
+def captured_selects(db_session):
+    """Collect the ORDER BY selects executed on the session's engine."""
+    statements = []
+
+    def record(_conn, _cursor, statement, parameters, _context, _executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "ORDER BY" in statement:
+            statements.append((statement, parameters))
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def query_plan(db_session, statement, parameters) -> str:
+    """EXPLAIN QUERY PLAN of a captured statement, one step per line."""
+    rows = db_session.connection().exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statement}", parameters
+    ).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def assert_index_ordered(db_session, statements):
+    """Fail on any captured statement that needs a sort step."""
+    assert statements
+    for statement, parameters in statements:
+        plan = query_plan(db_session, statement, parameters)
+        assert "USE TEMP B-TREE FOR ORDER BY" not in plan, f"{statement}\n{plan}"
+
+
+@pytest.mark.parametrize("sort_by", ["created_at", "updated_at"])
+@pytest.mark.parametrize("sort_order", ["desc", "asc"])
+@pytest.mark.parametrize("listing", ["get_note_paginated", "get_explore_notes"])
+def test_note_listings_use_index_order(db_session, test_user, listing, sort_by, sort_order):
+    """Own and public note listings read rows in index order, on both pagination modes."""
+    list_notes = getattr(NoteManager(db_session), listing)
+    principal = Principal.from_user(test_user)
+    last_seen = SimpleNamespace(id=1, created_at=datetime.now(), updated_at=datetime.now())
+    with captured_selects(db_session) as statements:
+        list_notes(principal, page=3, page_size=5,
+                   sort_by=sort_by, sort_order=sort_order)
+        list_notes(principal, page=2, page_size=5,
+                   sort_by=sort_by, sort_order=sort_order,
+                   cursor=encode_cursor(last_seen, sort_by, sort_order))
+    assert_index_ordered(db_session, statements)
+
+
+@pytest.mark.parametrize("sort_by, nullable", [("created_at", False), ("updated_at", True)])
+def test_descending_keyset_checks_nulls_only_on_nullable_columns(sort_by, nullable):
+    """The IS NULL branch, which widens the range scan, is only added for updated_at."""
+    condition = str(keyset_after(sort_by, "desc", datetime.now(), 10))
+    assert (f"notes.{sort_by} IS NULL" in condition) is nullable
+
+
+def test_audit_log_uses_index_order(db_session, test_user):
+    """The backoffice audit log reads newest first from ix_audit_timestamp."""
+    admin = replace(Principal.from_user(test_user), role="ADMIN")
+    with captured_selects(db_session) as statements:
+        BackofficeManager(db_session).get_audit_logs(admin, page=1, page_size=5)
+    assert_index_ordered(db_session, statements)
+    assert "ix_audit_timestamp" in query_plan(db_session, *statements[0])
+
+
+def test_tag_facets_read_only_the_tag_index(db_session, test_user):
+    """Tag facets are grouped from ix_note_tags_user_id_tag without reading notes."""
+    with captured_selects(db_session) as statements:
+        NoteManager(db_session).get_tag_facets(Principal.from_user(test_user))
+    plan = query_plan(db_session, *statements[0])
+    assert "COVERING INDEX ix_note_tags_user_id_tag" in plan, plan
+    assert " notes " not in f"{plan} "
@@ -68,3 +68,120 @@ class TestAuthEndpoints:
             headers={"Authorization": f"Bearer {token}"},
         )
         assert resp2.status_code == 401, resp2.text
+
+    # ------------------------------------------------------------------
+    # Token verified once per request
+    # ------------------------------------------------------------------
+
+    def test_token_decoded_once_per_request(self, client_real_auth, test_user, monkeypatch):
+        """
+        The rate limiter and get_current_user share the claims stored on
+        request.state, so the JWT is verified a single time.
+        """
+        from app.core.auth import context  # pylint: disable=import-outside-toplevel
+        from app.core.security import create_access_token  # pylint: disable=import-outside-toplevel
+
+        calls = []
+        original = context.decode_token_claims
+
+        def counting_decode(token):
+            calls.append(token)
+            return original(token)
+
+        monkeypatch.setattr(context, "decode_token_claims", counting_decode)
+        token = create_access_token(data={"sub": str(test_user.id)})
+
+        resp = client_real_auth.get(
+            "/api/v1/users/",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert resp.status_code == 200, resp.text
+        assert calls == [token]
+
+    def test_resolved_token_is_cached(self, client_real_auth, db_session, test_user, monkeypatch):
+        """
+        A token resolved once is served from the token cache: no second
+        decode and no blacklist lookup on the following requests.
+        """
+        from sqlalchemy import event  # pylint: disable=import-outside-toplevel
+        from app.core.auth import context  # pylint: disable=import-outside-toplevel
+        from app.core.security import create_access_token  # pylint: disable=import-outside-toplevel
+
+        decodes = []
+        original = context.decode_token_claims
+        monkeypatch.setattr(context, "decode_token_claims",
+                            lambda token: decodes.append(token) or original(token))
+        statements = []
+
+        def record(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        token = create_access_token(data={"sub": str(test_user.id)})
+        headers = {"Authorization": f"Bearer {token}"}
+        assert client_real_auth.get("/api/v1/users/", headers=headers).status_code == 200
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            resp = client_real_auth.get("/api/v1/users/", headers=headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert resp.status_code == 200, resp.text
+        assert resp.json()["id"] == test_user.id
+        assert decodes == [token]
+        assert not any("revoked_tokens" in s for s in statements)
+
+    # ------------------------------------------------------------------
+    # Revocations made by other nodes
+    # ------------------------------------------------------------------
+
+    def test_revocation_synced_from_table(self, client_real_auth, db_session, test_user):
+        """
+        A jti written to revoked_tokens by another node is picked up by the
+        watermark sync and rejected even though the token is cached here.
+        """
+        from datetime import datetime, timedelta  # pylint: disable=import-outside-toplevel
+        import jwt  # pylint: disable=import-outside-toplevel
+        from app.core.auth.revocation import revocation_set  # pylint: disable=import-outside-toplevel
+        from app.core.security import create_access_token  # pylint: disable=import-outside-toplevel
+        from app.db.models.auth.model import RevokedToken  # pylint: disable=import-outside-toplevel
+
+        token = create_access_token(data={"sub": str(test_user.id)})
+        headers = {"Authorization": f"Bearer {token}"}
+        assert client_real_auth.get("/api/v1/users/", headers=headers).status_code == 200
+
+        jti = jwt.decode(token, options={"verify_signature": False})["jti"]
+        db_session.add(RevokedToken(jti=jti, expires_at=datetime.now() + timedelta(hours=1)))
+        db_session.commit()
+        assert client_real_auth.get("/api/v1/users/", headers=headers).status_code == 200
+
+        revocation_set.sync(db_session)
+        resp = client_real_auth.get("/api/v1/users/", headers=headers)
+        assert resp.status_code == 401, resp.text
+        assert resp.json()["detail"] == "Token has been revoked"
+
+    # ------------------------------------------------------------------
+    # Principal cache invalidation
+    # ------------------------------------------------------------------
+
+    def test_principal_cache_invalidated_on_update(self, client_real_auth, test_user):
+        """
+        The user resolved by get_current_user is cached by id and dropped as
+        soon as UserManager.update_user commits a change.
+        """
+        from app.core.auth.principal_cache import principal_cache  # pylint: disable=import-outside-toplevel
+        from app.core.security import create_access_token  # pylint: disable=import-outside-toplevel
+
+        token = create_access_token(data={"sub": str(test_user.id)})
+        headers = {"Authorization": f"Bearer {token}"}
+        assert client_real_auth.get("/api/v1/users/", headers=headers).status_code == 200
+        assert principal_cache.get(test_user.id).username == test_user.username
+
+        resp = client_real_auth.put(
+            "/api/v1/users/",
+            headers=headers,
+            json={"username": test_user.username, "email": test_user.email},
+        )
+        assert resp.status_code == 200, resp.text
+        assert principal_cache.get(test_user.id) is None
@@ -0,0 +1,54 @@
+"""
+Integration tests for the /api/v1/backoffice endpoints and the admin user list.
+
+The seeded test user is a GUEST; each test acts as an ADMIN by overriding
+get_current_user with the same principal and the ADMIN role.
+"""
+import dataclasses
+
+import pytest
+
+from app.core.auth.principal import Principal
+from app.db.mysql import get_current_user
+from app.main import app
+
+_NOTE_URL = "/api/v1/notes"
+
+
+@pytest.fixture
+def admin_client(client, test_user):
+    """The test client, acting as an ADMIN."""
+    principal = dataclasses.replace(Principal.from_user(test_user), role="ADMIN")
+    app.dependency_overrides[get_current_user] = lambda: principal
+    return client
+
+
+class TestBackofficeEndpoints:
+    """Integration tests for the admin read paths."""
+
+    def test_user_lists(self, admin_client):
+        """User rows are serialised straight from their UserDTOs."""
+        users = admin_client.get("/api/v1/users/list")
+        assert users.status_code == 200, users.text
+        assert [user["username"] for user in users.json()] == ["testuser"]
+
+        page = admin_client.get("/api/v1/backoffice/users").json()
+        assert page["total"] == 1
+        assert set(page["items"][0]) == {"id", "username", "email", "role", "picture_url",
+                                         "created_at", "updated_at"}
+
+    def test_notes_sparse_fields(self, admin_client):
+        """The backoffice note list takes fields and excerpt_length."""
+        note_id = admin_client.post(f"{_NOTE_URL}/", json={"title": "Admin",
+                                                           "content": "abcdefgh"}).json()["id"]
+
+        resp = admin_client.get("/api/v1/backoffice/notes",
+                                params={"fields": "title,author", "excerpt_length": 3})
+        assert resp.status_code == 200, resp.text
+        assert {"id": note_id, "title": "Admin", "author": "testuser",
+                "excerpt": "abc…"} in resp.json()["items"]
+
+        audit = admin_client.get("/api/v1/backoffice/audit").json()
+        assert audit["items"][0]["user"]["username"] == "testuser"
+
+        admin_client.delete(f"{_NOTE_URL}/{note_id}")
@@ -5,7 +5,15 @@ Each test is self-contained: it creates any note it needs via the API and
 deletes it on teardown so that tests do not rely on execution order or shared
 state.
 """
+from datetime import datetime
 
+from sqlalchemy import event
+
+from app.core.cache import note_cache
+from app.core.settings import settings
+from app.db.models import Audit, Note, NoteTag
+from app.dto.note.note_dto import DEFAULT_FIELDS
+from app.repositories.note.search.bm25 import note_index
 
 _NOTE_URL = "/api/v1/notes"
 
@@ -116,6 +124,396 @@ class TestNoteEndpoints:
         # Cleanup
         client.delete(f"{_NOTE_URL}/{note_id}")
 
+    def test_list_private_cache_invalidated_on_write(self, client):
+        """A cached private listing is dropped when the user adds a note."""
+        first = client.get(f"{_NOTE_URL}/list/private").json()
+        create_resp = client.post(
+            f"{_NOTE_URL}/", json={"title": "Fresh", "content": "Just added"}
+        )
+        note_id = create_resp.json()["id"]
+
+        second = client.get(f"{_NOTE_URL}/list/private").json()
+        assert second["total"] == first["total"] + 1
+        assert note_id in [item["id"] for item in second["items"]] or second["has_next"]
+
+        client.delete(f"{_NOTE_URL}/{note_id}")
+        third = client.get(f"{_NOTE_URL}/list/private").json()
+        assert third["total"] == first["total"]
+
+    def test_list_private_cursor_pagination(self, client):
+        """Following next_cursor walks the same notes, in the same order, as page numbers."""
+        note_ids = [
+            client.post(f"{_NOTE_URL}/", json={"title": f"Cursor {i}", "content": "x"}).json()["id"]
+            for i in range(5)
+        ]
+        params = {"page_size": 2, "sort_by": "created_at", "sort_order": "desc"}
+
+        by_page, page = [], 1
+        while True:
+            data = client.get(f"{_NOTE_URL}/list/private", params={**params, "page": page}).json()
+            by_page += [item["id"] for item in data["items"]]
+            if not data["has_next"]:
+                break
+            page += 1
+
+        by_cursor, cursor = [], None
+        while True:
+            query = {**params, "cursor": cursor} if cursor else params
+            resp = client.get(f"{_NOTE_URL}/list/private", params=query)
+            assert resp.status_code == 200, resp.text
+            data = resp.json()
+            by_cursor += [item["id"] for item in data["items"]]
+            cursor = data["next_cursor"]
+            if cursor is None:
+                assert not data["has_next"]
+                break
+
+        assert by_cursor == by_page
+        assert set(note_ids) <= set(by_cursor)
+        assert len(by_cursor) == len(set(by_cursor))
+
+        for note_id in note_ids:
+            client.delete(f"{_NOTE_URL}/{note_id}")
+
+    def test_list_private_rejects_foreign_cursor(self, client):
+        """A malformed cursor, or one issued for another sort, is a 400."""
+        for i in range(2):
+            client.post(f"{_NOTE_URL}/", json={"title": f"Sort {i}", "content": "x"})
+        data = client.get(f"{_NOTE_URL}/list/private",
+                          params={"page_size": 1, "sort_by": "created_at"}).json()
+        assert data["next_cursor"]
+
+        resp = client.get(f"{_NOTE_URL}/list/private",
+                          params={"sort_by": "updated_at", "cursor": data["next_cursor"]})
+        assert resp.status_code == 400, resp.text
+        resp = client.get(f"{_NOTE_URL}/list/private", params={"cursor": "not-a-cursor"})
+        assert resp.status_code == 400, resp.text
+
+    def test_list_private_reuses_cached_count(self, client, db_session):
+        """Later pages take the total from the count cache; include_total forces a COUNT."""
+
+        note_ids = [
+            client.post(f"{_NOTE_URL}/", json={"title": f"Count {i}", "content": "x"}).json()["id"]
+            for i in range(2)
+        ]
+        first = client.get(f"{_NOTE_URL}/list/private", params={"page_size": 1}).json()
+        assert first["total_is_estimate"] is False
+
+        statements = []
+
+        def record(_conn, _cursor, statement, *_args):
+            statements.append(statement.lower())
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            second = client.get(f"{_NOTE_URL}/list/private",
+                                params={"page_size": 1, "page": 2}).json()
+            assert not any("count(" in s for s in statements)
+            exact = client.get(f"{_NOTE_URL}/list/private",
+                               params={"page_size": 1, "page": 2, "include_total": True}).json()
+            assert any("count(" in s for s in statements)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert second["total"] == first["total"]
+        assert second["total_is_estimate"] is True
+        assert exact["total"] == first["total"]
+        assert exact["total_is_estimate"] is False
+
+        for note_id in note_ids:
+            client.delete(f"{_NOTE_URL}/{note_id}")
+
+    def test_list_private_background_refresh_is_not_audited(self, client, db_session,
+                                                            monkeypatch):
+        """The stale-while-revalidate refresh re-reads the page without an audit row."""
+        refreshes = []
+        get_or_compute = note_cache.get_or_compute
+
+        def capture(scope, key, compute, refresh=None):
+            refreshes.append(refresh)
+            return get_or_compute(scope, key, compute, refresh)
+
+        monkeypatch.setattr(note_cache, "get_or_compute", capture)
+        note_id = client.post(f"{_NOTE_URL}/",
+                              json={"title": "Refresh", "content": "x"}).json()["id"]
+        assert client.get(f"{_NOTE_URL}/list/private").status_code == 200
+
+        audited = db_session.query(Audit).count()
+        assert refreshes[-1]()["items"]
+        db_session.expire_all()
+        assert db_session.query(Audit).count() == audited
+
+        client.delete(f"{_NOTE_URL}/{note_id}")
+
+    def test_list_private_fulltext_falls_back_to_substring(self, client):
+        """Without MATCH support (SQLite) the full-text modes search by substring."""
+        note_id = client.post(f"{_NOTE_URL}/",
+                              json={"title": "Quarterly", "content": "figures"}).json()["id"]
+
+        for mode in ("natural", "boolean"):
+            resp = client.get(f"{_NOTE_URL}/list/private",
+                              params={"query": "arterl", "search_mode": mode})
+            assert resp.status_code == 200, resp.text
+            assert [item["id"] for item in resp.json()["items"]] == [note_id]
+
+        resp = client.get(f"{_NOTE_URL}/list/private", params={"search_mode": "regex"})
+        assert resp.status_code == 422
+
+        client.delete(f"{_NOTE_URL}/{note_id}")
+
+    def test_list_private_substring_search_narrowed_by_trigrams(self, client, db_session,
+                                                                 test_user):
+        """Trigram narrowing keeps the exact substring results, including notes
+        written by another worker since the index last synced."""
+        ids = [client.post(f"{_NOTE_URL}/", json=payload).json()["id"] for payload in (
+            {"title": "Quarterly plan", "content": "numbers"},
+            {"title": "Misc", "content": "the QUARTER ends"},
+            {"title": "Other", "content": "quart"},
+        )]
+        client.get(f"{_NOTE_URL}/list/private", params={"query": "warm-up"})
+        elsewhere = Note(user_id=test_user.id, title="from another worker", content="quarterback",
+                         created_at=datetime.now(), updated_at=datetime.now())
+        db_session.add(elsewhere)
+        db_session.commit()
+
+        resp = client.get(f"{_NOTE_URL}/list/private", params={"query": "quarte"})
+        found = sorted(item["id"] for item in resp.json()["items"])
+        assert found == sorted([ids[0], ids[1], elsewhere.id])
+
+        for note_id in ids + [elsewhere.id]:
+            client.delete(f"{_NOTE_URL}/{note_id}")
+
+    def test_list_private_bm25_ranks_and_follows_writes(self, client, db_session):
+        """bm25 search ranks from the note index, which tracks this worker's writes."""
+        note_index.clear()
+        weak = client.post(f"{_NOTE_URL}/",
+                           json={"title": "Budget", "content": "travel plans"}).json()["id"]
+        note_index.ensure_ready(db_session)
+        strong = client.post(f"{_NOTE_URL}/",
+                             json={"title": "Travel", "content": "travel travel",
+                                   "tags": ["trip"]}).json()["id"]
+
+        params = {"query": "travel", "search_mode": "bm25", "page_size": 1}
+        first = client.get(f"{_NOTE_URL}/list/private", params=params).json()
+        assert [item["id"] for item in first["items"]] == [strong]
+        assert first["total"] == 2 and first["has_next"] and first["next_cursor"] is None
+        second = client.get(f"{_NOTE_URL}/list/private", params={**params, "page": 2}).json()
+        assert [item["id"] for item in second["items"]] == [weak]
+
+        client.delete(f"{_NOTE_URL}/{strong}")
+        resp = client.get(f"{_NOTE_URL}/list/private", params={**params, "query": "trip"})
+        assert resp.json()["items"] == []
+
+        client.delete(f"{_NOTE_URL}/{weak}")
+        note_index.clear()
+
+    def test_list_private_bm25_skips_notes_deleted_elsewhere(self, client, db_session):
+        """Ranked ids are re-checked against the table, so pages and total skip
+        notes another worker deleted."""
+        ids = [client.post(f"{_NOTE_URL}/", json={"title": f"Ferry {i}",
+                                                  "content": "ferry crossing"}).json()["id"]
+               for i in range(5)]
+        note_index.ensure_ready(db_session)
+        for note in db_session.query(Note).filter(Note.id.in_(ids[:3])):
+            db_session.delete(note)
+        db_session.commit()
+
+        resp = client.get(f"{_NOTE_URL}/list/private",
+                          params={"query": "ferry", "search_mode": "bm25", "page_size": 2})
+        data = resp.json()
+        assert sorted(item["id"] for item in data["items"]) == ids[3:]
+        assert data["total"] == 2 and data["total_pages"] == 1 and not data["has_next"]
+
+        for note_id in ids[3:]:
+            client.delete(f"{_NOTE_URL}/{note_id}")
+        note_index.clear()
+
+    def test_list_private_bm25_rechecks_ranked_ids_in_batches(self, client, db_session,
+                                                              monkeypatch):
+        """Only the ranked ids a page needs are re-checked, a bounded batch at a time;
+        the total then counts the unchecked ones and is an estimate."""
+        monkeypatch.setattr("app.repositories.note.repository._RANKED_BATCH", 2)
+        ids = [client.post(f"{_NOTE_URL}/", json={"title": "Canal",
+                                                  "content": " ".join(["barge"] * (i + 1))}
+                           ).json()["id"]
+               for i in range(6)]
+        note_index.ensure_ready(db_session)
+        for note in db_session.query(Note).filter(Note.id.in_(ids[4:])):
+            db_session.delete(note)
+        db_session.commit()
+
+        resp = client.get(f"{_NOTE_URL}/list/private",
+                          params={"query": "barge", "search_mode": "bm25", "page_size": 1})
+        data = resp.json()
+        assert [item["id"] for item in data["items"]] == [ids[3]]
+        assert data["total"] == 4 and data["total_is_estimate"] and data["has_next"]
+
+        for note_id in ids[:4]:
+            client.delete(f"{_NOTE_URL}/{note_id}")
+        note_index.clear()
+
+    def test_list_private_tag_filter_follows_writes(self, client, db_session):
+        """The tag filter reads note_tags, which follows creates, updates and deletes."""
+        first = client.post(f"{_NOTE_URL}/", json={"title": "One", "content": "a",
+                                                   "tags": ["work", "Work", " urgent "]}).json()
+        second = client.post(f"{_NOTE_URL}/", json={"title": "Two", "content": "b",
+                                                    "tags": ["home"]}).json()
+        rows = db_session.query(NoteTag).filter(NoteTag.note_id == first["id"]).all()
+        assert sorted(row.tag for row in rows) == ["urgent", "work"]
+
+        def tagged(tag, **params):
+            resp = client.get(f"{_NOTE_URL}/list/private", params={"tag": tag, **params})
+            assert resp.status_code == 200, resp.text
+            return sorted(item["id"] for item in resp.json()["items"])
+
+        assert tagged("work") == [first["id"]]
+        assert tagged("urgent", query="urg") == [first["id"]]
+        assert tagged("home", query="Two") == [second["id"]]
+
+        client.put(f"{_NOTE_URL}/{first['id']}", json={"tags": ["home"]})
+        assert tagged("work") == []
+        assert tagged("home") == sorted([first["id"], second["id"]])
+
+        for note_id in (first["id"], second["id"]):
+            client.delete(f"{_NOTE_URL}/{note_id}")
+        assert db_session.query(NoteTag).filter(
+            NoteTag.note_id.in_([first["id"], second["id"]])).count() == 0
+
+    def test_list_private_sparse_fields(self, client, db_session):
+        """fields= returns only those keys and the SELECT leaves content out."""
+        content = "x" * 300
+        note_id = client.post(f"{_NOTE_URL}/", json={"title": "Sparse", "content": content,
+                                                     "tags": ["sparse"]}).json()["id"]
+        statements = []
+
+        def record(conn, cursor, statement, *args):  # pylint: disable=unused-argument
+            statements.append(statement)
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            resp = client.get(f"{_NOTE_URL}/list/private",
+                              params={"tag": "sparse", "fields": "title,author",
+                                      "excerpt_length": 10})
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        assert resp.status_code == 200, resp.text
+        item = resp.json()["items"][0]
+        assert item == {"id": note_id, "title": "Sparse", "author": "testuser",
+                        "excerpt": "x" * 10 + "…"}
+        listing = [sql for sql in statements if "FROM notes" in sql and "LIMIT" in sql]
+        assert listing and all("notes.content AS" not in sql for sql in listing)
+
+        item = client.get(f"{_NOTE_URL}/list/private",
+                          params={"tag": "sparse"}).json()["items"][0]
+        assert set(item) == set(DEFAULT_FIELDS)
+
+        item = client.get(f"{_NOTE_URL}/list/private",
+                          params={"tag": "sparse", "excerpt_length": 500}).json()["items"][0]
+        assert item["content"] == content and item["excerpt"] == content
+        assert item["user"]["username"] == "testuser"
+        assert client.get(f"{_NOTE_URL}/list/private",
+                          params={"fields": "title,password"}).status_code == 422
+
+        client.delete(f"{_NOTE_URL}/{note_id}")
+
+    def test_tag_facets(self, client):
+        """Tag facets count the user's notes per tag, most used first."""
+        ids = [client.post(f"{_NOTE_URL}/", json={"title": "t", "content": "c",
+                                                  "tags": tags}).json()["id"]
+               for tags in (["alpha", "beta"], ["beta"], [])]
+
+        resp = client.get(f"{_NOTE_URL}/tags")
+        assert resp.status_code == 200, resp.text
+        assert resp.json() == [{"tag": "beta", "count": 2}, {"tag": "alpha", "count": 1}]
+
+        client.delete(f"{_NOTE_URL}/{ids[1]}")
+        assert client.get(f"{_NOTE_URL}/tags").json() == [{"tag": "alpha", "count": 1},
+                                                           {"tag": "beta", "count": 1}]
+        for note_id in (ids[0], ids[2]):
+            client.delete(f"{_NOTE_URL}/{note_id}")
+
+    def test_list_private_structured_query(self, client, db_session):
+        """Operators in the query filter on their own column; the rest is free text."""
+        ids = [client.post(f"{_NOTE_URL}/", json=payload).json()["id"] for payload in (
+            {"title": "Q3 plan", "content": "budget", "tags": ["work"], "is_public": True},
+            {"title": "Q3 plan", "content": "budget", "tags": ["home"]},
+            {"title": "Groceries", "content": "q3 plan budget", "tags": ["work"]},
+        )]
+        db_session.query(Note).filter(Note.id == ids[2]).update(
+            {Note.created_at: datetime(2024, 5, 1)})
+        db_session.commit()
+
+        def found(query, **params):
+            resp = client.get(f"{_NOTE_URL}/list/private", params={"query": query, **params})
+            assert resp.status_code == 200, resp.text
+            return sorted(item["id"] for item in resp.json()["items"])
+
+        assert found('title:"q3 plan"') == sorted(ids[:2])
+        assert found('title:"q3 plan" tag:work budget') == [ids[0]]
+        assert found("tag:work is:private") == [ids[2]]
+        assert found("tag:work before:2025-01-01") == [ids[2]]
+        assert found("tag:work after:2025-01-01 budget", search_mode="bm25") == [ids[0]]
+        assert found("author:testuser tag:home") == [ids[1]]
+        assert found("author:nobody") == []
+
+        resp = client.get(f"{_NOTE_URL}/list/private", params={"query": "before:soon"})
+        assert resp.status_code == 400
+
+        for note_id in ids:
+            client.delete(f"{_NOTE_URL}/{note_id}")
+
+    def test_search_is_paginated_capped_and_snipped(self, client, monkeypatch):
+        """Search pages by cursor up to NOTE_SEARCH_MAX_RESULTS and returns snippets."""
+        monkeypatch.setattr(settings, "NOTE_SEARCH_MAX_RESULTS", 3)
+        body = "filler " * 40 + "the needle is here " + "filler " * 40
+        ids = [client.post(f"{_NOTE_URL}/",
+                           json={"title": f"Hay {i}", "content": body}).json()["id"]
+               for i in range(4)]
+
+        params = {"query": "needle", "page_size": 2}
+        first = client.get(f"{_NOTE_URL}/search", params=params).json()
+        assert first["total"] == 3 and first["has_next"]
+        assert [item["id"] for item in first["items"]] == ids[:-3:-1]
+        item = first["items"][0]
+        assert item["content"] is None
+        assert "needle" in item["snippet"] and len(item["snippet"]) < len(body)
+        assert item["snippet"].startswith("…") and item["snippet"].endswith("…")
+
+        second = client.get(f"{_NOTE_URL}/search",
+                            params={**params, "cursor": first["next_cursor"]}).json()
+        assert [item["id"] for item in second["items"]] == [ids[1]]
+        assert not second["has_next"] and second["next_cursor"] is None
+
+        full = client.get(f"{_NOTE_URL}/search",
+                          params={**params, "full_content": True, "page": 2}).json()
+        assert [item["content"] for item in full["items"]] == [body]
+        assert full["items"][0]["snippet"] is None
+        assert client.get(f"{_NOTE_URL}/search", params={**params, "page": 3}).json()["items"] == []
+        assert client.get(f"{_NOTE_URL}/search", params={"query": ""}).status_code == 422
+
+        for note_id in ids:
+            client.delete(f"{_NOTE_URL}/{note_id}")
+
+    def test_suggest_titles_and_tags(self, client):
+        """Suggestions complete the user's titles and tags and follow writes."""
+        note_id = client.post(f"{_NOTE_URL}/", json={"title": "Weekly review", "content": "c",
+                                                     "tags": ["weekend"]}).json()["id"]
+
+        resp = client.get(f"{_NOTE_URL}/suggest", params={"prefix": "wee"})
+        assert resp.status_code == 200, resp.text
+        assert resp.json() == [{"text": "weekend", "kind": "tag"},
+                               {"text": "Weekly review", "kind": "title"}]
+
+        client.put(f"{_NOTE_URL}/{note_id}", json={"title": "Monthly review", "tags": []})
+        resp = client.get(f"{_NOTE_URL}/suggest", params={"prefix": "rev"})
+        assert resp.json() == [{"text": "Monthly review", "kind": "title"}]
+
+        client.delete(f"{_NOTE_URL}/{note_id}")
+        assert client.get(f"{_NOTE_URL}/suggest", params={"prefix": "rev"}).json() == []
+        assert client.get(f"{_NOTE_URL}/suggest", params={"prefix": ""}).status_code == 422
+
     # ------------------------------------------------------------------
     # GET /api/v1/notes/list/public
     # ------------------------------------------------------------------